@@ -0,0 +1,138 @@
+"""
+학랭 벤치마크 실행기.
+
+benchmarks/ 의 .lhb 작업량을 실행해 작업량마다 실행한 구문 수, 초당 구문 수, 실행 시간, 최대 메모리를 보여 주고
+저장해 둔 기준 결과(baseline.json)와 비교합니다.
+
+    python benchmarks/run.py                  # 모든 작업량을 재고 기준 결과와 비교
+    python benchmarks/run.py --vm loops       # 바이트코드 VM 으로 loops.lhb 만
+    python benchmarks/run.py --save           # 이번 결과를 기준 결과로 저장
+"""
+import os
+import sys
+import gc
+import json
+import time
+import argparse
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from interpreter import HaklangInterpreterGPT, HaklangVM, OutputBuffer, clear_compile_caches  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+
+
+def find_workloads(names=None):
+    """benchmarks/ 의 .lhb 파일을 이름 순으로 찾습니다. names 를 주면 그 작업량만 고릅니다."""
+    found = {os.path.splitext(f)[0]: os.path.join(BENCH_DIR, f)
+             for f in sorted(os.listdir(BENCH_DIR)) if f.endswith('.lhb')}
+    if not names:
+        return found
+    missing = [name for name in names if name not in found]
+    if missing:
+        raise SystemExit(f"알 수 없는 작업량: {', '.join(missing)} (있는 것: {', '.join(found)})")
+    return {name: found[name] for name in names}
+
+
+def run_once(path, vm=False, count_statements=False):
+    """
+    새 인터프리터로 작업량을 한 번 실행하고 (걸린 시간, 실행한 구문 수) 를 돌려줍니다.
+    컴파일 캐시를 비우고 시작하므로 매번 파일을 처음 실행할 때와 같은 일을 합니다. 출력은 os.devnull 로 버립니다.
+    """
+    clear_compile_caches()
+    interp = (HaklangVM if vm else HaklangInterpreterGPT)()
+    sink = open(os.devnull, 'w', encoding='utf-8')
+    interp.output = OutputBuffer(stream=sink, flush_policy='size')
+    statements = 0
+    if count_statements:
+        def count(interp, lineno, item):
+            nonlocal statements
+            statements += 1
+        interp.add_hook('line', count)
+    try:
+        start = time.perf_counter()
+        interp.execute_file(path)
+        return time.perf_counter() - start, statements
+    finally:
+        sink.close()
+
+
+def measure(path, vm=False, repeat=3):
+    """작업량 하나를 잽니다. 시간은 repeat 번 중 가장 빠른 값, 메모리는 tracemalloc 으로 잰 최댓값입니다."""
+    _, statements = run_once(path, vm, count_statements=True)
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        times.append(run_once(path, vm)[0])
+    wall = min(times)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run_once(path, vm)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        'statements': statements,
+        'wall': wall,
+        'statements_per_sec': statements / wall if wall > 0 else 0.0,
+        'peak_kb': peak // 1024,
+    }
+
+
+def load_baseline(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def compare(result, base):
+    """기준 결과 대비 시간 비율을 '1.25x 빠름' 처럼 보여 줍니다."""
+    if not base or not base.get('wall') or not result['wall']:
+        return '-'
+    ratio = base['wall'] / result['wall']
+    if ratio >= 1:
+        return f"{ratio:.2f}x 빠름"
+    return f"{1 / ratio:.2f}x 느림"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="학랭 인터프리터 벤치마크")
+    parser.add_argument('workloads', nargs='*', help="실행할 작업량 이름 (생략하면 전부)")
+    parser.add_argument('--vm', action='store_true', help="바이트코드 VM 으로 실행")
+    parser.add_argument('--repeat', type=int, default=3, help="시간을 잴 반복 횟수 (가장 빠른 값을 씀)")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="기준 결과 JSON 파일")
+    parser.add_argument('--save', action='store_true', help="이번 결과를 기준 결과 파일에 저장")
+    parser.add_argument('--json', metavar='PATH', help="이번 결과를 JSON 파일로도 저장")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat 는 1 이상이어야 합니다.")
+
+    engine = 'vm' if args.vm else 'tree'
+    baseline = load_baseline(args.baseline)
+    base_results = baseline.get(engine, {})
+    results = {}
+
+    print(f"{'작업량':<12} {'구문 수':>12} {'구문/초':>12} {'시간(초)':>10} {'최대 메모리(KB)':>16}  기준 대비")
+    for name, path in find_workloads(args.workloads).items():
+        result = results[name] = measure(path, args.vm, args.repeat)
+        print(f"{name:<12} {result['statements']:>12} {result['statements_per_sec']:>12.0f} "
+              f"{result['wall']:>10.4f} {result['peak_kb']:>16}  {compare(result, base_results.get(name))}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({engine: results}, f, ensure_ascii=False, indent=2)
+    if args.save:
+        baseline.setdefault(engine, {}).update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2)
+        print(f"기준 결과를 저장했습니다: {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
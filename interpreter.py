@@ -1,7 +1,3098 @@
+import os
+import io
+import gc
 import sys
 import re
 import random
 import time
+import argparse
+import asyncio
+import operator
+import itertools
+import copy
+import json
+import pickle
+import codecs
+import csv
+import hashlib
+import contextlib
+import contextvars
+import multiprocessing
+import signal
+from array import array
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import numpy
+except ImportError:
+    # NumPy 는 선택 사항입니다. 없으면 리스트 원소별 연산을 파이썬으로 계산합니다.
+    numpy = None
+
+
+# 반복문 하나가 멈추지 않고 돌 수 있는 기본 최대 횟수 (무한 루프 방지)
+MAX_LOOP_ITERATIONS = 100000
+
+# 실행 시간 한도가 있을 때 몇 단계마다 시계를 확인할지
+GOVERNOR_CHECK_INTERVAL = 10000
+
+# 출력 버퍼에 모아 둘 최대 글자 수와 비우기 정책
+OUTPUT_BUFFER_SIZE = 65536
+FLUSH_POLICIES = ('size', 'line', 'always')
+
+# 입력을 한 번에 읽어 올 바이트 수와 입력 방식
+INPUT_CHUNK_SIZE = 65536
+INPUT_MODES = ('line', 'bulk')
+
+# 줄/표현식/조건식 캐시의 최대 항목 수. 넘으면 비우고 다시 채운다 (아주 큰 프로그램에서도 메모리가 늘지 않도록)
+COMPILE_CACHE_LIMIT = 10000
+
+# run_source 가 해석해 둔 프로그램을 몇 개까지 기억할지 (가장 오래 안 쓴 것부터 버린다)
+PROGRAM_CACHE_SIZE = 128
+
+# 프로그램이 학범 으로 시작하지 않을 때의 메시지
+HEADER_ERROR = "오류: 프로그램은 '학범'으로 시작해야 합니다."
+
+# 구문 해석에 쓰는 정규식 (한 번만 컴파일)
+RE_DECL_INT = re.compile(r'\{BMI30\}\[(?:\((.+?)\)|(.+?))\](포자맨)?')
+RE_DECL_FLOAT7 = re.compile(r'\{BMI30\.7\}\[(?:\((.+?)\)|(.+?))\](포자맨)?')
+RE_DECL_FLOAT15 = re.compile(r'\{BMI30\.7ㅋㅋ\}\[(?:\((.+?)\)|(.+?))\](포자맨)?')
+RE_DECL_STR = re.compile(r'\{BMI\}\[(?:\((.+?)\)|(.+?))\](포자맨)?')
+RE_DECL_LIST = re.compile(r'\{BMI\[(.+?)\]\}\[(?:\((.+?)\)|(.+?))\](포자맨)?')
+RE_STR_ASSIGN = re.compile(r'\[(?:\((.+?)\)|(.+?))\]꿀꺽<\'(.+)\'')
+RE_INCREMENT = re.compile(r'\[(?:\((.+?)\)|(.+?))\]꿀꺽<(.+)')
+RE_LIST_ASSIGN = re.compile(r'\[(?:\((.+?)\)|(.+?))\]쿰척<"\[(.*)\]"')
+RE_SORT_ASC = re.compile(r'미추홀구\[(.+?)\]')
+RE_SORT_DESC = re.compile(r'용현동\[(.+?)\]')
+RE_INPUT_VAR = re.compile(r'쿰척<\((.+?)\)')
+RE_FOR = re.compile(r'그챼\((.+?)그챼(.+?)그챼(.+?)\)그챼')
+RE_IF = re.compile(r'비만인가\[(.+?)\]알아보자')
+RE_ELSEIF = re.compile(r'학범이는비만일수도있음\[(.+?)\]')
+RE_WHILE = re.compile(r'나살뺄거야\((.+?)\)')
+RE_FUNC_DEF = re.compile(r'\[(.+?)\]미쉥물 ?연료\[(.*)\]전줴')
+RE_DEFERRED = re.compile(r'\[(.+?)\]미쉥물 ?연료 ?젼줴\((.*)\)')
+RE_RESET = re.compile(r'간장먹고\[(.+?)\]치기')
+RE_RANDOM_VAR = re.compile(r'포자\[(.+?)\]')
+RE_FUNC_CALL = re.compile(r'\[(.+?)\]\((.*)\)')
+RE_LIST_PRINT = re.compile(r'\[(?:\((.+?)\)|(.+?))\]쿰척\[(\d+)\]')
+RE_PUSH = re.compile(r'아빠와나\[(.+?)\]')
+RE_POP = re.compile(r'아빠와 나\[(.+?)\]')
+RE_DEBUG = re.compile(r'데이비드\((.+)\)')
+RE_SLEEP = re.compile(r'시간먹기\((.+)\)')
+
+
+# ---- 변수 슬롯 ----
+# 변수 이름은 해석할 때 한 번 정수 슬롯 번호로 바꿉니다. 번호는 프로그램마다 따로 두는 슬롯 표(SlotTable)에서 받으므로
+# 프로그램을 많이 실행해도 한 프로그램의 자리 수는 그 프로그램에 나오는 이름 수를 넘지 않습니다.
+# 인터프리터는 값을 slot_values, 타입을 slot_types 의 같은 자리에 둡니다. 정의되지 않은 자리는 값 0, 타입 None 이라
+# 정의되지 않은 변수를 읽으면 0 이 되는 규칙을 목록 색인 한 번으로 지킵니다.
+
+class SlotTable:
+    """
+    한 프로그램의 변수 이름 -> 슬롯 번호 표입니다. 번호가 들어간 해석 결과(구문, 표현식, 조건식)도 표마다 따로 캐시합니다.
+    해석하는 동안 active() 로 표를 켜 두면 slot_of 와 compile_* 함수가 그 표를 씁니다.
+    """
+    __slots__ = ('names', 'index', 'statements', 'expressions', 'conditions')
+
+    def __init__(self):
+        self.names = []
+        self.index = {}
+        self.statements = {}
+        self.expressions = {}
+        self.conditions = {}
+
+    def slot_of(self, name):
+        slot = self.index.get(name)
+        if slot is None:
+            slot = self.index[name] = len(self.names)
+            self.names.append(name)
+        return slot
+
+    @contextlib.contextmanager
+    def active(self):
+        token = _ACTIVE_SLOTS.set(self)
+        try:
+            yield self
+        finally:
+            _ACTIVE_SLOTS.reset(token)
+
+
+# 켜진 표가 없을 때(인터프리터 밖에서 구문이나 표현식을 바로 해석할 때) 쓰는 표
+_ACTIVE_SLOTS = contextvars.ContextVar('haklang_slots', default=SlotTable())
+
+
+def slot_of(name):
+    """지금 켜진 슬롯 표에서 변수 이름의 슬롯 번호. 처음 보는 이름이면 새 번호를 붙입니다."""
+    return _ACTIVE_SLOTS.get().slot_of(name)
+
+
+# ---- 표현식 컴파일러 ----
+# 기존 evaluate_expression 은 연산자를 낮은 우선순위부터 찾아 첫 위치에서 나누고 양쪽을 다시 평가했습니다.
+# 같은 결과를 내도록 우선순위(낮은 것 -> 높은 것)와 오른쪽 결합을 그대로 따르는 파서로 한 번만 해석합니다.
+
+BINARY_LEVELS = ['concat', 'max', '^', '*', '/', '+', '-']
+BINARY_LEVEL_OF = {op: level for level, op in enumerate(BINARY_LEVELS)}
+
+EXPRESSION_OPERATORS = {
+    '루피 함 안아보자': 'concat',
+    '남자 중의 남자': 'max',
+    '비이만하악범': '^',
+    '학범비만': '*',
+    '비만학범': '/',
+    '하악버엄': '-',
+    '하악범': '+',
+    '이학범': 'neg',
+}
+
+# 따옴표로 감싼 부분은 연산자로 나누지 않습니다
+RE_EXPR_TOKEN = re.compile(
+    r"""('[^']*'|"[^"]*")|(""" + '|'.join(re.escape(k) for k in EXPRESSION_OPERATORS) + ')')
+
+def tokenize_expression(expr):
+    """표현식을 ('atom', 텍스트) 와 ('op', 연산 이름) 토큰 목록으로 나눕니다."""
+    tokens = []
+    atom = []
+    pos = 0
+    for m in RE_EXPR_TOKEN.finditer(expr):
+        if m.group(1) is not None:
+            continue
+        atom.append(expr[pos:m.start()])
+        text = ''.join(atom).strip()
+        if text:
+            tokens.append(('atom', text))
+        tokens.append(('op', EXPRESSION_OPERATORS[m.group(2)]))
+        atom = []
+        pos = m.end()
+    text = expr[pos:].strip()
+    if text:
+        tokens.append(('atom', text))
+    return tokens
+
+
+class _ExpressionParser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos]
+        return None
+
+    def parse(self, level=0):
+        token = self.peek()
+        # 이학범 은 자신이 시작하는 (부분) 표현식 전체에 적용된다
+        if token == ('op', 'neg'):
+            self.pos += 1
+            return ('neg', self.parse(level))
+        if level == len(BINARY_LEVELS):
+            return self.parse_atom()
+        left = self.parse(level + 1)
+        token = self.peek()
+        if token is not None and token[0] == 'op' and BINARY_LEVEL_OF.get(token[1]) == level:
+            self.pos += 1
+            return (token[1], left, self.parse(level))
+        return left
+
+    def parse_atom(self):
+        token = self.peek()
+        if token is None or token[0] != 'atom':
+            # 피연산자가 비어 있으면 기존처럼 빈 문자열을 평가하다 오류가 나도록 둔다
+            return atom_node('')
+        self.pos += 1
+        return atom_node(token[1])
+
+
+def atom_node(text):
+    # 변수 참조: 'varname'
+    if text.startswith("'") and text.endswith("'"):
+        return ('var', text[1:-1])
+    # 숫자
+    try:
+        if '.' in text:
+            return ('const', float(text))
+        else:
+            return ('const', int(text))
+    except ValueError:
+        pass
+    # 문자열 리터럴
+    if text.startswith('"') and text.endswith('"'):
+        return ('const', text[1:-1])
+    return ('error', text)
+
+
+def parse_expression(expr):
+    """표현식 문자열을 튜플로 된 트리로 해석합니다. 해석할 수 없는 부분은 ('error', 텍스트) 노드가 됩니다."""
+    expr = expr.strip()
+    parser = _ExpressionParser(tokenize_expression(expr))
+    tree = parser.parse()
+    if parser.peek() is not None:
+        return ('error', expr)
+    return tree
+
+
+# 숫자 리스트는 원소 타입이 정해져 있으므로 상자에 담긴 객체 대신 배열에 그대로 저장합니다
+LIST_TYPECODES = {
+    'list_int': 'q',
+    'list_float7': 'd',
+    'list_float15': 'd',
+}
+
+
+class TypedArray(array):
+    """
+    list_int / list_float7 / list_float15 값을 담는 배열입니다.
+    출력과 연결 결과는 기존 리스트와 똑같이 보이고, 타입이 섞이면 일반 리스트로 바뀝니다.
+    """
+    __slots__ = ()
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+    __str__ = __repr__
+
+    def __add__(self, other):
+        if not isinstance(other, LIST_VALUE_TYPES):
+            # 오류 메시지도 기존 리스트와 같게 한다
+            raise TypeError(f'can only concatenate list (not "{display_type_name(other)}") to list')
+        try:
+            result = TypedArray(self.typecode, self)
+            result.extend(other)
+            return result
+        except (TypeError, OverflowError):
+            return self.tolist() + list(other)
+
+    def __radd__(self, other):
+        if not isinstance(other, list):
+            return NotImplemented
+        return other + self.tolist()
+
+    def __mul__(self, count):
+        if not isinstance(count, int):
+            raise TypeError(f"can't multiply sequence by non-int of type '{display_type_name(count)}'")
+        return TypedArray(self.typecode, array.__mul__(self, count))
+
+    __rmul__ = __mul__
+
+
+LIST_VALUE_TYPES = (list, TypedArray)
+
+# 값을 담는 내부 클래스 -> 오류 메시지에 보여 줄 파이썬 타입 이름 (기존 프로그램의 오류 메시지가 바뀌지 않도록)
+DISPLAY_TYPE_NAMES = {TypedArray: 'list'}
+
+
+def display_type_name(value):
+    """오류 메시지에 보여 줄 값의 타입 이름"""
+    return DISPLAY_TYPE_NAMES.get(type(value), type(value).__name__)
+
+
+def error_message(error):
+    """예외를 사용자에게 보여 줄 문장으로 바꿉니다. 파이썬이 만든 메시지의 내부 클래스 이름은 DISPLAY_TYPE_NAMES 로 바꿉니다."""
+    message = str(error)
+    for cls, name in DISPLAY_TYPE_NAMES.items():
+        if cls.__name__ in message:
+            message = message.replace(f"'{cls.__name__}'", f"'{name}'").replace(f'"{cls.__name__}"', f'"{name}"')
+    return message
+
+
+def value_type(value):
+    """스택에서 꺼낸 값이나 함수 인자처럼 타입 없이 들어온 값의 변수 타입. 알 수 없으면 None"""
+    if isinstance(value, int):
+        return 'int'
+    if isinstance(value, float):
+        return 'float7'
+    if isinstance(value, str):
+        return 'str'
+    if isinstance(value, LIST_VALUE_TYPES):
+        # 리스트 타입 추론은 간단히 list_int 로 지정
+        return 'list_int'
+    return None
+
+
+# 출력할 때 변수 값을 문자열로 바꾸는 함수 (변수 타입별, 리스트 변수는 출력하지 않음)
+VALUE_FORMATTERS = {
+    'int': str,
+    'float7': '{:.7f}'.format,
+    'float15': '{:.15f}'.format,
+    'str': str,
+}
+
+# 리스트 원소를 출력할 문자열로 바꾸는 함수 (리스트 타입별, 없는 타입은 str)
+ELEMENT_FORMATTERS = {
+    'list_int': str,
+    'list_float7': '{:.7f}'.format,
+    'list_float15': '{:.15f}'.format,
+}
+
+# 타입을 아는 변수를 출력 템플릿에 넣을 때의 형식 (str.format 필드)
+FORMAT_FIELDS = {
+    'int': '{}',
+    'float7': '{:.7f}',
+    'float15': '{:.15f}',
+    'str': '{}',
+}
+
+
+def make_list(var_type, values=()):
+    """리스트 타입에 맞는 저장소를 만듭니다. 64비트 정수를 넘는 값이 있으면 일반 리스트를 씁니다."""
+    typecode = LIST_TYPECODES.get(var_type)
+    if typecode is not None:
+        try:
+            return TypedArray(typecode, values)
+        except OverflowError:
+            pass
+    return list(values)
+
+
+def _negate(val):
+    if isinstance(val, (int, float)):
+        return -val
+    elif isinstance(val, str):
+        return val[::-1]
+    elif isinstance(val, TypedArray):
+        result = TypedArray(val.typecode, val)
+        result.reverse()
+        return result
+    elif isinstance(val, list):
+        return list(reversed(val))
+    elif isinstance(val, bool):
+        return not val
+    else:
+        return val
+
+
+def _concat(left, right):
+    # 문자열 또는 리스트 연결
+    if isinstance(left, LIST_VALUE_TYPES) and isinstance(right, LIST_VALUE_TYPES):
+        return left + right
+    return str(left) + str(right)
+
+
+def _max(left, right):
+    try:
+        return left if left >= right else right
+    except Exception:
+        return left
+
+
+def _divide(left, right):
+    return left / right if right != 0 else 0
+
+
+BINARY_FUNCTIONS = {
+    'concat': _concat,
+    'max': _max,
+    '^': lambda left, right: left ** right,
+    '*': lambda left, right: left * right,
+    '/': _divide,
+    '+': lambda left, right: left + right,
+    '-': lambda left, right: left - right,
+}
+
+
+def build_evaluator(tree):
+    """트리를 interp 하나만 받는 클로저로 바꿉니다. 평가할 때 문자열은 전혀 다루지 않습니다."""
+    kind = tree[0]
+    if kind == 'const':
+        value = tree[1]
+        return lambda interp: value
+    if kind == 'var':
+        slot = slot_of(tree[1])
+        return lambda interp: interp.slot_values[slot]
+    if kind == 'error':
+        message = f"오류: 표현식을 평가할 수 없습니다: {tree[1]}"
+
+        def error(interp):
+            interp.fail(message)
+        return error
+    if kind == 'neg':
+        inner = build_evaluator(tree[1])
+        return lambda interp: _negate(inner(interp))
+    left = build_evaluator(tree[1])
+    right = build_evaluator(tree[2])
+    if kind == '+':
+        return lambda interp: left(interp) + right(interp)
+    if kind == '-':
+        return lambda interp: left(interp) - right(interp)
+    if kind == '*':
+        return lambda interp: left(interp) * right(interp)
+    func = BINARY_FUNCTIONS[kind]
+    return lambda interp: func(left(interp), right(interp))
+
+
+class CompiledExpression:
+    """한 번 해석된 표현식. evaluate(interp) 로 값을 구합니다."""
+    __slots__ = ('source', 'tree', 'evaluate')
+
+    def __init__(self, source, tree):
+        self.source = source
+        self.tree = tree
+        self.evaluate = build_evaluator(tree)
+
+    def __reduce__(self):
+        # 클로저는 저장할 수 없으므로 해석 트리만 저장하고 불러올 때 다시 만든다
+        return (CompiledExpression, (self.source, self.tree))
+
+
+def compile_expression(expr):
+    """표현식을 컴파일합니다. 같은 소스 문자열은 켜진 슬롯 표에 캐시된 결과를 돌려줍니다."""
+    cache = _ACTIVE_SLOTS.get().expressions
+    compiled = cache.get(expr)
+    if compiled is None:
+        if len(cache) >= COMPILE_CACHE_LIMIT:
+            cache.clear()
+        compiled = cache[expr] = CompiledExpression(expr, parse_expression(expr))
+    return compiled
+
+
+# ---- 조건식 컴파일러 ----
+# 기존 evaluate_condition 과 같은 순서(야 오루페 -> 야 조깜베 -> 비교 연산자)로 한 번만 나누고,
+# 실제로 단락 평가하는 술어(predicate) 클로저로 바꿉니다.
+
+LOGICAL_OPERATORS = {'야 오루페': 'or', '야 조깜베': 'and'}
+
+# 기존 판별 순서 그대로 (긴 것 먼저)
+COMPARISON_OPERATORS = [
+    ('비만정상', '<='),
+    ('홀쭉정상', '>='),
+    ('정상정상', '=='),
+    ('정상', '=='),
+    ('비만', '<'),
+    ('홀쭉', '>'),
+]
+
+COMPARE_FUNCTIONS = {
+    '<': operator.lt,
+    '>': operator.gt,
+    '<=': operator.le,
+    '>=': operator.ge,
+    '==': operator.eq,
+}
+
+# 학범비만, 비만학범 처럼 비교 연산자를 품은 산술 연산자는 통째로 건너뛴다
+_CONDITION_WORDS = sorted(list(LOGICAL_OPERATORS) + [k for k, _ in COMPARISON_OPERATORS] + list(EXPRESSION_OPERATORS),
+                          key=len, reverse=True)
+RE_CONDITION_TOKEN = re.compile(
+    r"""('[^']*'|"[^"]*")|(""" + '|'.join(re.escape(w) for w in _CONDITION_WORDS) + ')')
+
+def _condition_operators(expr):
+    """따옴표 밖에 있는 논리/비교 연산자들의 (단어, 시작, 끝) 목록"""
+    found = []
+    for m in RE_CONDITION_TOKEN.finditer(expr):
+        word = m.group(2)
+        if word is not None and word not in EXPRESSION_OPERATORS:
+            found.append((word, m.start(), m.end()))
+    return found
+
+
+def parse_condition(expr):
+    """조건식을 ('or'|'and'|'cmp'|'truth'|'const', ...) 튜플 트리로 해석합니다."""
+    expr = expr.strip()
+    # 참/거짓 리터럴
+    if expr == '야오루폐':
+        return ('const', True)
+    if expr == '야조깜베':
+        return ('const', False)
+    operators = _condition_operators(expr)
+    # 논리 OR, AND : 첫 위치에서 나눈다
+    for word, kind in LOGICAL_OPERATORS.items():
+        for found, start, end in operators:
+            if found == word:
+                return (kind, parse_condition(expr[:start]), parse_condition(expr[end:]))
+    # 비교 연산자
+    for word, symbol in COMPARISON_OPERATORS:
+        for found, start, end in operators:
+            if found == word:
+                left = compile_expression(expr[:start].strip())
+                right = compile_expression(expr[end:].strip())
+                return ('cmp', symbol, left.tree, right.tree)
+    # 나머지는 표현식 평가 후 진리값
+    return ('truth', compile_expression(expr).tree)
+
+
+def build_predicate(tree):
+    """조건 트리를 interp 하나만 받아 bool 을 돌려주는 클로저로 바꿉니다."""
+    kind = tree[0]
+    if kind == 'const':
+        value = tree[1]
+        return lambda interp: value
+    if kind == 'or':
+        left = build_predicate(tree[1])
+        right = build_predicate(tree[2])
+        return lambda interp: left(interp) or right(interp)
+    if kind == 'and':
+        left = build_predicate(tree[1])
+        right = build_predicate(tree[2])
+        return lambda interp: left(interp) and right(interp)
+    if kind == 'cmp':
+        symbol = tree[1]
+        left = build_evaluator(tree[2])
+        right = build_evaluator(tree[3])
+        if symbol == '<':
+            return lambda interp: left(interp) < right(interp)
+        if symbol == '>':
+            return lambda interp: left(interp) > right(interp)
+        if symbol == '<=':
+            return lambda interp: left(interp) <= right(interp)
+        if symbol == '>=':
+            return lambda interp: left(interp) >= right(interp)
+        return lambda interp: left(interp) == right(interp)
+    value = build_evaluator(tree[1])
+    return lambda interp: bool(value(interp))
+
+
+class CompiledCondition:
+    """한 번 해석된 조건식. evaluate(interp) 는 bool 을 돌려줍니다."""
+    __slots__ = ('source', 'tree', 'evaluate')
+
+    def __init__(self, source, tree):
+        self.source = source
+        self.tree = tree
+        self.evaluate = build_predicate(tree)
+
+    def __reduce__(self):
+        # 클로저는 저장할 수 없으므로 해석 트리만 저장하고 불러올 때 다시 만든다
+        return (CompiledCondition, (self.source, self.tree))
+
+
+def compile_condition(expr):
+    """조건식을 컴파일합니다. 같은 소스 문자열은 켜진 슬롯 표에 캐시된 결과를 돌려줍니다."""
+    cache = _ACTIVE_SLOTS.get().conditions
+    compiled = cache.get(expr)
+    if compiled is None:
+        if len(cache) >= COMPILE_CACHE_LIMIT:
+            cache.clear()
+        compiled = cache[expr] = CompiledCondition(expr, parse_condition(expr))
+    return compiled
+
+
+def clear_compile_caches():
+    """켜진 슬롯 표의 표현식 / 조건식 컴파일 캐시를 비웁니다. 처음 실행할 때와 같은 조건으로 시간을 잴 때 씁니다."""
+    slots = _ACTIVE_SLOTS.get()
+    slots.expressions.clear()
+    slots.conditions.clear()
+
+
+class Statement:
+    """
+    한 줄을 미리 해석해 둔 구문 객체입니다.
+    execute(interp) 는 process_line 과 같은 규약으로, 처리했으면 True 를 돌려줍니다.
+    """
+    __slots__ = ('source',)
+
+    def __init__(self, source):
+        self.source = source
+
+    def execute(self, interp):
+        raise NotImplementedError
+
+    def resolve_slots(self):
+        """변수 이름을 슬롯 번호로 바꿔 둡니다. 만들 때와 디스크 캐시에서 불러올 때 부릅니다."""
+
+    def __setstate__(self, state):
+        # 슬롯 번호는 슬롯 표마다 다르므로 불러올 때 켜진 표에서 이름으로 다시 구한다
+        for name, value in state[1].items():
+            setattr(self, name, value)
+        self.resolve_slots()
+
+
+class VariableStatement(Statement):
+    """변수 하나를 다루는 구문. var_name 의 슬롯 번호를 slot 에 둡니다."""
+    __slots__ = ('var_name', 'slot')
+
+    def __init__(self, source, var_name):
+        super().__init__(source)
+        self.var_name = var_name
+        self.resolve_slots()
+
+    def resolve_slots(self):
+        self.slot = slot_of(self.var_name)
+
+
+class UnknownStatement(Statement):
+    """해석할 수 없는 줄. 실행하면 False 를 돌려줍니다."""
+    __slots__ = ()
+
+    def execute(self, interp):
+        return False
+
+
+class NoOpStatement(Statement):
+    """불린 리터럴, 학범이는비만임, 5분 처럼 아무 일도 하지 않는 줄"""
+    __slots__ = ()
+
+    def execute(self, interp):
+        return True
+
+
+class BreakStatement(Statement):
+    __slots__ = ()
+
+    def execute(self, interp):
+        interp.break_flag = True
+        return True
+
+
+class ReturnStatement(Statement):
+    __slots__ = ('expr',)
+
+    def __init__(self, source, expr):
+        super().__init__(source)
+        self.expr = compile_expression(expr) if expr else None
+
+    def execute(self, interp):
+        interp.return_flag = True
+        if self.expr is not None:
+            interp.return_value = self.expr.evaluate(interp)
+        return True
+
+
+class DeclareStatement(VariableStatement):
+    __slots__ = ('var_type', 'initial', 'protected')
+
+    def __init__(self, source, var_name, var_type, initial, protected):
+        super().__init__(source, var_name)
+        self.var_type = var_type
+        self.initial = initial
+        self.protected = protected
+
+    def execute(self, interp):
+        slot = self.slot
+        interp.slot_types[slot] = self.var_type
+        # 리스트는 선언할 때마다 새 객체를 만든다
+        interp.slot_values[slot] = make_list(self.var_type) if self.initial is None else self.initial
+        if self.protected:
+            interp.protected_vars.add(self.var_name)
+        return True
+
+
+class StringAssignStatement(VariableStatement):
+    __slots__ = ('value',)
+
+    def __init__(self, source, var_name, value):
+        super().__init__(source, var_name)
+        self.value = value
+
+    def execute(self, interp):
+        var_name = self.var_name
+        var_type = interp.slot_types[self.slot]
+        if var_type is None:
+            interp.fail(f"오류: 정의되지 않은 변수 '{var_name}'")
+        if var_type == 'str':
+            interp.slot_values[self.slot] = self.value
+        else:
+            interp.fail(f"오류: '{var_name}'은(는) 문자열 변수가 아닙니다.")
+        return True
+
+
+class IncrementStatement(VariableStatement):
+    """꿀꺽< 증감 연산. 증감량은 해석할 때 한 번만 계산합니다 (알 수 없는 연산이면 None)."""
+    __slots__ = ('operation', 'delta')
+
+    def __init__(self, source, var_name, operation, delta):
+        super().__init__(source, var_name)
+        self.operation = operation
+        self.delta = delta
+
+    def execute(self, interp):
+        slot = self.slot
+        var_type = interp.slot_types[slot]
+        if var_type is None:
+            interp.fail(f"오류: 정의되지 않은 변수 '{self.var_name}'")
+        if self.delta is None:
+            interp.fail(f"오류: 알 수 없는 연산 '{self.operation}'")
+        values = interp.slot_values
+        if var_type == 'int':
+            values[slot] = int(values[slot] + self.delta)
+        elif var_type == 'float7' or var_type == 'float15':
+            values[slot] += self.delta
+        else:
+            interp.fail(f"오류: '{self.var_name}' 변수에 대한 꿀꺽 연산은 지원되지 않습니다.")
+        return True
+
+
+class FusedIncrementStatement(VariableStatement):
+    """
+    최적화로 합친 같은 변수의 연속된 꿀꺽< 증감. 정수 변수에 정수 증감량만 있으면 합을 한 번에 더하고,
+    그 밖에는 따로 실행했을 때와 값이 같도록 증감량을 차례로 더합니다.
+    """
+    __slots__ = ('deltas', 'total')
+
+    def __init__(self, source, var_name, deltas):
+        super().__init__(source, var_name)
+        self.deltas = deltas
+        self.total = sum(deltas) if all(type(delta) is int for delta in deltas) else None
+
+    def execute(self, interp):
+        var_name = self.var_name
+        slot = self.slot
+        var_type = interp.slot_types[slot]
+        if var_type is None:
+            interp.fail(f"오류: 정의되지 않은 변수 '{var_name}'")
+        value = interp.slot_values[slot]
+        if var_type == 'int':
+            if self.total is not None and type(value) is int:
+                value += self.total
+            else:
+                for delta in self.deltas:
+                    value = int(value + delta)
+        elif var_type == 'float7' or var_type == 'float15':
+            for delta in self.deltas:
+                value += delta
+        else:
+            interp.fail(f"오류: '{var_name}' 변수에 대한 꿀꺽 연산은 지원되지 않습니다.")
+        interp.slot_values[slot] = value
+        return True
+
+
+class ListAssignStatement(VariableStatement):
+    """쿰척<"[...]" 리스트 할당. 숫자 리스트는 한 번 변환한 배열을 보관해 두고 복사해서 씁니다."""
+    __slots__ = ('parts', 'converted')
+
+    def __init__(self, source, var_name, parts):
+        super().__init__(source, var_name)
+        self.parts = parts
+        self.converted = {}
+
+    def execute(self, interp):
+        var_name = self.var_name
+        t = interp.slot_types[self.slot]
+        if t is None or not t.startswith('list'):
+            interp.fail(f"오류: 정의되지 않은 리스트 변수 '{var_name}'")
+        template = self.converted.get(t)
+        if template is not None:
+            interp.slot_values[self.slot] = TypedArray(template.typecode, template)
+            return True
+        parsed = []
+        for p in self.parts:
+            try:
+                if t == 'list_int':
+                    parsed.append(int(p))
+                elif t in ('list_float7', 'list_float15'):
+                    parsed.append(float(p))
+                else:
+                    parsed.append(p)
+            except ValueError:
+                interp.fail(f"오류: '{p}'은(는) 리스트 '{var_name}'의 형식에 맞지 않습니다.")
+        values = make_list(t, parsed)
+        if isinstance(values, TypedArray):
+            self.converted[t] = TypedArray(values.typecode, values)
+        interp.slot_values[self.slot] = values
+        return True
+
+
+class SortStatement(VariableStatement):
+    __slots__ = ('reverse',)
+
+    def __init__(self, source, list_name, reverse):
+        super().__init__(source, list_name)
+        self.reverse = reverse
+
+    def execute(self, interp):
+        list_name = self.var_name
+        slot = self.slot
+        list_type = interp.slot_types[slot]
+        if list_type is None or not list_type.startswith('list'):
+            interp.fail(f"오류: 정의되지 않은 리스트 변수 '{list_name}'")
+        try:
+            values = interp.slot_values[slot]
+            if numpy is not None and isinstance(values, TypedArray) and values.typecode == 'q':
+                # 정수는 같은 값끼리 구별되지 않으므로 NumPy 로 정렬해도 결과가 같다
+                ordered = numpy.sort(numpy.frombuffer(values, dtype=numpy.int64))
+                if self.reverse:
+                    ordered = ordered[::-1]
+                interp.slot_values[slot] = TypedArray('q', ordered.tobytes())
+            elif isinstance(values, TypedArray):
+                # 배열을 한 번에 꺼내 정렬한 뒤 같은 타입의 배열로 되돌린다
+                ordered = values.tolist()
+                ordered.sort(reverse=self.reverse)
+                interp.slot_values[slot] = TypedArray(values.typecode, ordered)
+            else:
+                interp.slot_values[slot] = sorted(values, reverse=self.reverse)
+        except Exception as e:
+            interp.fail(f"오류: 리스트 정렬 실패: {error_message(e)}")
+        return True
+
+
+RE_PRINT_TOKEN = re.compile(r'("[^"]*"|\'[^\']*\'|\[[^\]]+\]\[\d+\])')
+RE_PRINT_ELEMENT = re.compile(r'\[([^\]]+)\]\[(\d+)\]')
+
+
+def parse_print_content(content):
+    """
+    출력 구문의 괄호 안을 ('text', 문자열) / ('var', 이름) / ('elem', 이름, 0부터 센 인덱스) 목록으로 나눕니다.
+    따옴표 문자열, '변수', [리스트][n] 이 아닌 부분은 버립니다.
+    """
+    if content.startswith('(') and content.endswith(')'):
+        content = content[1:-1]
+    pieces = []
+    for token in RE_PRINT_TOKEN.findall(content):
+        if token.startswith('"'):
+            pieces.append(('text', token[1:-1]))
+        elif token.startswith("'"):
+            pieces.append(('var', token[1:-1]))
+        else:
+            m = RE_PRINT_ELEMENT.match(token)
+            pieces.append(('elem', m.group(1), int(m.group(2)) - 1))
+    return pieces
+
+
+def _value_renderer(slot):
+    """타입을 모르는 '변수' 를 실행할 때 타입을 보고 문자열로 바꾸는 함수"""
+    def render(interp):
+        var_type = interp.slot_types[slot]
+        if var_type is None:
+            return 'undefined'
+        formatter = VALUE_FORMATTERS.get(var_type)
+        return '' if formatter is None else formatter(interp.slot_values[slot])
+    return render
+
+
+def _typed_value_renderer(slot, formatter):
+    def render(interp):
+        return formatter(interp.slot_values[slot])
+    return render
+
+
+def _element_renderer(slot, idx, formatter=None):
+    """[리스트][n] 을 문자열로 바꾸는 함수. formatter 가 없으면 실행할 때 정의 여부와 리스트 타입을 봅니다."""
+    def render(interp):
+        if formatter is None:
+            var_type = interp.slot_types[slot]
+            if var_type is None:
+                return 'undefined'
+            element_formatter = ELEMENT_FORMATTERS.get(var_type, str)
+        else:
+            element_formatter = formatter
+        lst = interp.slot_values[slot]
+        if 0 <= idx < len(lst):
+            return element_formatter(lst[idx])
+        return 'undefined'
+    return render
+
+
+class PrintTemplate:
+    """
+    해석할 때 한 번 만들어 두는 출력 구문의 템플릿. 문자열 조각은 str.format 템플릿에 넣어 두고 변수 참조만 실행할 때 채웁니다.
+    var_types 는 타입 분석으로 반드시 정의되어 있다고 아는 변수의 타입입니다. 그런 변수는 형식을 템플릿에 정해 두고,
+    참조가 모두 그런 변수이면 slots 의 값을 그대로 format 에 넘깁니다. 아니면 refs 의 함수로 참조마다 문자열을 만듭니다.
+    """
+    __slots__ = ('names', 'template', 'slots', 'refs')
+
+    def __init__(self, content, newline, var_types=None):
+        var_types = var_types or {}
+        # 조각마다 (문자열, None) 또는 (타입을 알면 형식 필드 아니면 None, 슬롯, 문자열로 바꾸는 함수)
+        parts = []
+        self.names = []
+        for piece in parse_print_content(content):
+            if piece[0] == 'text':
+                parts.append((piece[1].replace('{', '{{').replace('}', '}}'), None))
+                continue
+            name = piece[1]
+            self.names.append(name)
+            slot = slot_of(name)
+            var_type = var_types.get(name)
+            if piece[0] == 'elem':
+                formatter = None if var_type is None else ELEMENT_FORMATTERS.get(var_type, str)
+                parts.append((None, slot, _element_renderer(slot, piece[2], formatter)))
+            elif var_type is None:
+                parts.append((None, slot, _value_renderer(slot)))
+            elif var_type in FORMAT_FIELDS:
+                parts.append((FORMAT_FIELDS[var_type], slot, _typed_value_renderer(slot, VALUE_FORMATTERS[var_type])))
+            # 타입을 아는 리스트 변수는 아무것도 출력하지 않는다
+        if newline:
+            parts.append(('\n', None))
+        refs = [part for part in parts if len(part) == 3]
+        if all(part[0] is not None for part in refs):
+            self.template = ''.join(part[0] for part in parts)
+            self.slots = [part[1] for part in refs]
+            self.refs = None
+        else:
+            self.template = ''.join(part[0] if len(part) == 2 else '{}' for part in parts)
+            self.slots = None
+            self.refs = [part[2] for part in refs]
+
+    def render(self, interp):
+        if self.slots is not None:
+            values = interp.slot_values
+            return self.template.format(*[values[slot] for slot in self.slots])
+        return self.template.format(*[ref(interp) for ref in self.refs])
+
+
+class PrintStatement(Statement):
+    """
+    (...)쿰척 / (...)쿰척<쿰척. template 이 있으면 PrintTemplate 으로, 없으면 handle_print 로 바로 출력합니다.
+    템플릿은 타입 분석(TypeSpecializer)이 여러 번 실행될 수 있는 자리(반복문, 함수 본문)의 출력에만 templated=True 로
+    새 구문을 만들어 붙입니다. 해석한 뒤에는 구문을 고치지 않으므로 캐시된 프로그램을 여러 인터프리터가 함께 써도 됩니다.
+    """
+    __slots__ = ('content', 'newline', 'var_types', 'template')
+
+    def __init__(self, source, content, newline, var_types=None, templated=False):
+        super().__init__(source)
+        self.content = content
+        self.newline = newline
+        self.var_types = var_types
+        # 템플릿에는 슬롯 번호가 들어 있으므로 켜진 슬롯 표로 만든다
+        self.template = PrintTemplate(content, newline, var_types) if templated else None
+
+    def names(self):
+        """출력하는 변수 이름 목록 (나온 순서대로)"""
+        return [piece[1] for piece in parse_print_content(self.content) if piece[0] != 'text']
+
+    def execute(self, interp):
+        template = self.template
+        if template is None:
+            interp.handle_print(self.content, self.newline)
+        else:
+            interp.output.write(template.render(interp))
+        return True
+
+    def __reduce__(self):
+        # 템플릿에는 슬롯 번호가 들어 있으므로 저장하지 않고 불러올 때 켜진 표로 다시 만든다
+        return (PrintStatement, (self.source, self.content, self.newline, self.var_types, self.template is not None))
+
+
+class InputStatement(Statement):
+    """쿰척<() / 쿰척<쿰척() : 입력을 읽고 버립니다."""
+    __slots__ = ('newline',)
+
+    def __init__(self, source, newline):
+        super().__init__(source)
+        self.newline = newline
+
+    def execute(self, interp):
+        return self.store(interp, interp.read_line())
+
+    def prepare(self, interp):
+        pass
+
+    def store(self, interp, line):
+        if self.newline:
+            interp.output.write('\n')
+        return True
+
+
+class InputVarStatement(VariableStatement):
+    __slots__ = ()
+
+    def execute(self, interp):
+        self.prepare(interp)
+        return self.store(interp, interp.read_line())
+
+    def prepare(self, interp):
+        # 입력을 읽기 전에 변수부터 확인한다
+        if interp.slot_types[self.slot] is None:
+            interp.fail(f"오류: 정의되지 않은 변수 '{self.var_name}'")
+
+    def store(self, interp, val_str):
+        var_name = self.var_name
+        slot = self.slot
+        var_type = interp.slot_types[slot]
+        try:
+            if var_type == 'int':
+                interp.slot_values[slot] = int(val_str)
+            elif var_type in ('float7', 'float15'):
+                interp.slot_values[slot] = float(val_str)
+            elif var_type == 'str':
+                interp.slot_values[slot] = val_str
+            else:
+                interp.fail(f"오류: '{var_name}' 변수 타입은 입력을 지원하지 않습니다.")
+        except ValueError:
+            interp.fail(f"오류: '{val_str}'은(는) 변수 '{var_name}'에 적합한 값이 아닙니다.")
+        return True
+
+
+class BlockHeaderStatement(Statement):
+    """
+    for / if / elseif / else / while / 함수 정의 머리줄. ProgramParser 가 본문과 묶어 블록 노드로 바꿉니다.
+    본문 없이 구문 하나로 실행될 수는 없으므로 execute 는 알 수 없는 구문처럼 False 를 돌려줍니다.
+    """
+    __slots__ = ('block_type', 'context')
+
+    def __init__(self, source, block_type, context):
+        super().__init__(source)
+        self.block_type = block_type
+        self.context = context
+
+    def execute(self, interp):
+        return False
+
+
+class DeferredCallStatement(Statement):
+    __slots__ = ('func_name', 'args')
+
+    def __init__(self, source, func_name, args):
+        super().__init__(source)
+        self.func_name = func_name
+        self.args = [compile_expression(arg) for arg in args]
+
+    def execute(self, interp):
+        args = [arg.evaluate(interp) for arg in self.args]
+        # 지연 호출 목록에 추가
+        interp.deferred_calls.append((self.func_name, args))
+        return True
+
+
+class ResetStatement(VariableStatement):
+    __slots__ = ()
+
+    def execute(self, interp):
+        slot = self.slot
+        var_type = interp.slot_types[slot]
+        if var_type is None:
+            interp.fail(f"오류: 정의되지 않은 변수 '{self.var_name}'")
+        if var_type == 'int':
+            interp.slot_values[slot] = 30
+        elif var_type == 'float7' or var_type == 'float15':
+            interp.slot_values[slot] = 30.7
+        elif var_type.startswith('list'):
+            interp.slot_values[slot] = make_list(var_type)
+        elif var_type == 'str':
+            interp.slot_values[slot] = ""
+        return True
+
+
+class RandomVarStatement(VariableStatement):
+    __slots__ = ()
+
+    def execute(self, interp):
+        var_name = self.var_name
+        if interp.slot_types[self.slot] is None:
+            interp.fail(f"오류: 정의되지 않은 변수 '{var_name}'")
+        if var_name not in interp.protected_vars:
+            interp.assign_random_value(self.slot)
+        return True
+
+
+class RandomAllStatement(Statement):
+    __slots__ = ()
+
+    def execute(self, interp):
+        for slot, var_type in enumerate(interp.slot_types):
+            if var_type is not None and interp.slot_table.names[slot] not in interp.protected_vars:
+                interp.assign_random_value(slot)
+        return True
+
+
+class CallStatement(Statement):
+    """[함수명](인자들). 정의되지 않은 함수라면 기존처럼 알 수 없는 구문(False)으로 취급합니다."""
+    __slots__ = ('func_name', 'args')
+
+    def __init__(self, source, func_name, args):
+        super().__init__(source)
+        self.func_name = func_name
+        self.args = [compile_expression(arg) for arg in args]
+
+    def execute(self, interp):
+        if self.func_name not in interp.functions:
+            return False
+        args = [arg.evaluate(interp) for arg in self.args]
+        interp.call_function(self.func_name, args)
+        return True
+
+
+class ListPrintStatement(VariableStatement):
+    __slots__ = ('index',)
+
+    def __init__(self, source, var_name, index):
+        super().__init__(source, var_name)
+        self.index = index
+
+    def execute(self, interp):
+        var_name = self.var_name
+        idx = self.index
+        t = interp.slot_types[self.slot]
+        if t is None:
+            interp.fail(f"오류: 정의되지 않은 리스트 변수 '{var_name}'")
+        if not t.startswith('list'):
+            interp.fail(f"오류: '{var_name}'은(는) 리스트가 아닙니다.")
+        lst = interp.slot_values[self.slot]
+        if idx < 0 or idx >= len(lst):
+            interp.fail(f"오류: 인덱스 {idx+1} 는 리스트 범위를 벗어납니다.")
+        elem = lst[idx]
+        write_line = interp.output.write_line
+        if t == 'list_int':
+            write_line(elem)
+        elif t == 'list_float7':
+            write_line(f"{elem:.7f}")
+        elif t == 'list_float15':
+            write_line(f"{elem:.15f}")
+        else:
+            write_line(elem)
+        return True
+
+
+class PushStatement(VariableStatement):
+    __slots__ = ()
+
+    def execute(self, interp):
+        if interp.slot_types[self.slot] is None:
+            interp.fail(f"오류: 정의되지 않은 변수 '{self.var_name}'")
+        interp.stack.append(interp.slot_values[self.slot])
+        return True
+
+
+class PopStatement(VariableStatement):
+    __slots__ = ()
+
+    def execute(self, interp):
+        if not interp.stack:
+            interp.fail("오류: 스택이 비어있어 pop 할 수 없습니다.")
+        value = interp.stack.pop()
+        # 타입 추론하여 변수에 설정
+        var_type = value_type(value)
+        if var_type is not None:
+            interp.slot_types[self.slot] = var_type
+            interp.slot_values[self.slot] = value
+        return True
+
+
+class DebugStatement(Statement):
+    __slots__ = ('expr',)
+
+    def __init__(self, source, expr):
+        super().__init__(source)
+        self.expr = compile_expression(expr)
+
+    def execute(self, interp):
+        val = self.expr.evaluate(interp)
+        # 디버그 출력은 표준 출력에 타입과 함께 출력한다
+        interp.output.write_line(f"[디버그] {self.expr.source} = {val}")
+        return True
+
+
+class SleepStatement(Statement):
+    __slots__ = ('expr',)
+
+    def __init__(self, source, expr):
+        super().__init__(source)
+        self.expr = compile_expression(expr)
+
+    def execute(self, interp):
+        t, expires = interp.governor.sleep_time(self.seconds(interp))
+        # 기다리는 동안 앞선 출력이 보이도록 먼저 비운다
+        interp.output.flush()
+        time.sleep(t)
+        if expires:
+            interp.governor.check()
+        return True
+
+    def seconds(self, interp):
+        """기다릴 시간(초). 숫자로 바꿀 수 없거나 음수면 오류로 멈춥니다."""
+        duration = self.expr.evaluate(interp)
+        try:
+            t = float(duration)
+        except ValueError:
+            interp.fail(f"오류: 시간 '{duration}'을(를) 숫자로 변환할 수 없습니다.")
+        if t < 0:
+            interp.fail("오류: 시간은 음수일 수 없습니다.")
+        return t
+
+
+def split_args(args_str):
+    """함수 호출 인자 문자열을 쉼표로 나눕니다."""
+    return [a.strip() for a in args_str.split(',')] if args_str else []
+
+
+def increment_delta(operation):
+    """꿀꺽< 뒤의 연산 이름을 증감량으로 바꿉니다. 알 수 없는 연산이면 None."""
+    if operation == '밥':
+        return 1
+    elif operation == '빵':
+        return 0.1
+    elif operation.startswith('고기'):
+        count = operation.count('고기')
+        return 0.01 * (0.1 ** (count - 1))
+    elif operation == '야채':
+        return -1
+    elif operation == '설사약':
+        return -0.1
+    elif operation.startswith('포자빵'):
+        count = operation.count('포자빵')
+        return -0.01 * (0.1 ** (count - 1))
+    return None
+
+
+class StatementRule:
+    """
+    구문 판별 규칙 하나. 줄이 prefix 로 시작하면 pattern 으로 확인한 뒤 build(line, match) 로 구문 객체를 만듭니다.
+    pattern 이 None 이면 줄 전체가 prefix 와 같을 때만 적용됩니다. prefix 가 빈 문자열이면 모든 줄이 후보입니다.
+    """
+    __slots__ = ('prefix', 'pattern', 'build', 'order')
+
+    def __init__(self, prefix, pattern, build, order):
+        self.prefix = prefix
+        self.pattern = pattern
+        self.build = build
+        self.order = order
+
+
+# 등록된 규칙 (order 순) 과 첫 글자 -> 후보 규칙 목록 색인
+STATEMENT_RULES = []
+_rule_index = {}
+_wildcard_rules = []
+
+
+def _rebuild_rule_index():
+    global _wildcard_rules
+    _rule_index.clear()
+    _wildcard_rules = [rule for rule in STATEMENT_RULES if not rule.prefix]
+    for rule in STATEMENT_RULES:
+        if rule.prefix:
+            _rule_index.setdefault(rule.prefix[0], [])
+    for first_char, rules in _rule_index.items():
+        rules.extend(rule for rule in STATEMENT_RULES
+                     if not rule.prefix or rule.prefix[0] == first_char)
+
+
+def register_statement(prefix, pattern, build, order=None):
+    """
+    새 구문을 등록합니다. order 를 주지 않으면 기존 규칙들보다 뒤(가장 낮은 우선순위)에 놓입니다.
+    이미 해석해 둔 줄의 캐시(SlotTable.statements)에는 영향을 주지 않으므로 실행 전에 등록하세요.
+    """
+    if isinstance(pattern, str):
+        pattern = re.compile(pattern)
+    if order is None:
+        order = STATEMENT_RULES[-1].order + 1 if STATEMENT_RULES else 0
+    rule = StatementRule(prefix, pattern, build, order)
+    STATEMENT_RULES.append(rule)
+    STATEMENT_RULES.sort(key=lambda r: r.order)
+    _rebuild_rule_index()
+    return rule
+
+
+def statement_rule(prefix, pattern=None, order=None):
+    """register_statement 의 데코레이터 형태"""
+    def decorator(build):
+        register_statement(prefix, pattern, build, order)
+        return build
+    return decorator
+
+
+def decode_line(line):
+    """
+    한 줄의 코드를 구문 객체로 해석합니다. 실행은 하지 않습니다.
+    줄의 첫 글자로 후보 규칙만 골라 등록 순서대로 확인하며, 해석할 수 없으면 UnknownStatement 를 돌려줍니다.
+    """
+    for rule in _rule_index.get(line[:1], _wildcard_rules):
+        if not line.startswith(rule.prefix):
+            continue
+        if rule.pattern is None:
+            if line == rule.prefix:
+                return rule.build(line, None)
+        else:
+            m = rule.pattern.match(line)
+            if m:
+                return rule.build(line, m)
+    return UnknownStatement(line)
+
+
+# ---- 기본 문법 규칙 (등록 순서가 곧 기존 process_line 의 판별 순서) ----
+
+# 0. break
+@statement_rule('몸무게0.1톤')
+def _break_rule(line, m):
+    return BreakStatement(line)
+
+
+# 0b. return
+@statement_rule('꺼억', r'꺼억(.*)')
+def _return_rule(line, m):
+    return ReturnStatement(line, m.group(1).strip())
+
+
+# 0c. Boolean literals (preserve 기존 동작)
+@statement_rule('야조깜베')
+@statement_rule('야오루폐')
+def _noop_rule(line, m):
+    return NoOpStatement(line)
+
+
+# 1. 변수 선언
+@statement_rule('{BMI30}[', RE_DECL_INT)
+def _decl_int_rule(line, m):
+    return DeclareStatement(line, m.group(1) or m.group(2), 'int', 30, m.group(3) is not None)
+
+
+@statement_rule('{BMI30.7}[', RE_DECL_FLOAT7)
+def _decl_float7_rule(line, m):
+    return DeclareStatement(line, m.group(1) or m.group(2), 'float7', 30.7, m.group(3) is not None)
+
+
+@statement_rule('{BMI30.7ㅋㅋ}[', RE_DECL_FLOAT15)
+def _decl_float15_rule(line, m):
+    return DeclareStatement(line, m.group(1) or m.group(2), 'float15', 30.7, m.group(3) is not None)
+
+
+@statement_rule('{BMI}[', RE_DECL_STR)
+def _decl_str_rule(line, m):
+    return DeclareStatement(line, m.group(1) or m.group(2), 'str', "", m.group(3) is not None)
+
+
+@statement_rule('{BMI[', RE_DECL_LIST)
+def _decl_list_rule(line, m):
+    list_type = m.group(1)
+    if list_type == '30':
+        var_type = 'list_int'
+    elif list_type == '30.7':
+        var_type = 'list_float7'
+    elif list_type == '30.7ㅋㅋ':
+        var_type = 'list_float15'
+    else:
+        var_type = 'list_str'
+    return DeclareStatement(line, m.group(2) or m.group(3), var_type, None, m.group(4) is not None)
+
+
+# 2. 문자열 할당
+@statement_rule('[', RE_STR_ASSIGN)
+def _str_assign_rule(line, m):
+    return StringAssignStatement(line, m.group(1) or m.group(2), m.group(3))
+
+
+# 2b. 변수 증감 연산
+@statement_rule('[', RE_INCREMENT)
+def _increment_rule(line, m):
+    operation = m.group(3).strip()
+    return IncrementStatement(line, m.group(1) or m.group(2), operation, increment_delta(operation))
+
+
+# 2c. 리스트 할당
+@statement_rule('[', RE_LIST_ASSIGN)
+def _list_assign_rule(line, m):
+    values_str = m.group(3)
+    parts = [p.strip() for p in values_str.split(',')] if values_str.strip() != '' else []
+    return ListAssignStatement(line, m.group(1) or m.group(2), parts)
+
+
+# 2d. 리스트 정렬
+@statement_rule('미추홀구[', RE_SORT_ASC)
+def _sort_asc_rule(line, m):
+    return SortStatement(line, m.group(1).strip(), False)
+
+
+@statement_rule('용현동[', RE_SORT_DESC)
+def _sort_desc_rule(line, m):
+    return SortStatement(line, m.group(1).strip(), True)
+
+
+# 3. 출력 (어떤 글자로 시작하든 후보)
+@statement_rule('', r'(.*)쿰척<쿰척\Z')
+def _println_rule(line, m):
+    return PrintStatement(line, m.group(1), True)
+
+
+@statement_rule('', r'(.*)<쿰척\Z')
+def _print_rule(line, m):
+    return PrintStatement(line, m.group(1), False)
+
+
+# 4. 단독 입력
+@statement_rule('쿰척<()')
+def _input_rule(line, m):
+    return InputStatement(line, False)
+
+
+@statement_rule('쿰척<쿰척()')
+def _input_newline_rule(line, m):
+    return InputStatement(line, True)
+
+
+# 5. 변수 입력
+@statement_rule('쿰척<(', RE_INPUT_VAR)
+def _input_var_rule(line, m):
+    return InputVarStatement(line, m.group(1))
+
+
+# 6. for 문
+@statement_rule('그챼(', RE_FOR)
+def _for_rule(line, m):
+    return BlockHeaderStatement(line, 'for', {'init': m.group(1).strip(),
+                                              'cond': compile_condition(m.group(2).strip()),
+                                              'step': m.group(3).strip()})
+
+
+# 7. if, elseif, else
+@statement_rule('비만인가[', RE_IF)
+def _if_rule(line, m):
+    return BlockHeaderStatement(line, 'if', {'cond': compile_condition(m.group(1).strip())})
+
+
+@statement_rule('학범이는비만일수도있음[', RE_ELSEIF)
+def _elseif_rule(line, m):
+    return BlockHeaderStatement(line, 'elseif', {'cond': compile_condition(m.group(1).strip())})
+
+
+@statement_rule('학범이는비만이아님')
+def _else_rule(line, m):
+    return BlockHeaderStatement(line, 'else', {})
+
+
+statement_rule('학범이는비만임')(_noop_rule)
+
+
+# 8. while
+@statement_rule('나살뺄거야(', RE_WHILE)
+def _while_rule(line, m):
+    return BlockHeaderStatement(line, 'while', {'cond': compile_condition(m.group(1).strip())})
+
+
+statement_rule('5분')(_noop_rule)
+
+
+# 9. 함수 정의
+@statement_rule('[', RE_FUNC_DEF)
+def _func_def_rule(line, m):
+    params_str = m.group(2).strip()
+    params = [p.strip() for p in params_str.split(',')] if params_str else []
+    return BlockHeaderStatement(line, 'function', {'name': m.group(1).strip(), 'params': params})
+
+
+# 9b. 지연 함수 호출
+@statement_rule('[', RE_DEFERRED)
+def _deferred_rule(line, m):
+    return DeferredCallStatement(line, m.group(1).strip(), split_args(m.group(2).strip()))
+
+
+# 10. 변수/리스트 초기화
+@statement_rule('간장먹고[', RE_RESET)
+def _reset_rule(line, m):
+    return ResetStatement(line, m.group(1).strip())
+
+
+# 10b. 랜덤 값 할당
+@statement_rule('포자[', RE_RANDOM_VAR)
+def _random_var_rule(line, m):
+    return RandomVarStatement(line, m.group(1).strip())
+
+
+@statement_rule('포자빵')
+def _random_all_rule(line, m):
+    return RandomAllStatement(line)
+
+
+# 11. 함수 호출 (함수가 정의되어 있는지는 실행할 때 확인)
+@statement_rule('[', RE_FUNC_CALL)
+def _call_rule(line, m):
+    return CallStatement(line, m.group(1).strip(), split_args(m.group(2).strip()))
+
+
+# 12. 리스트 요소 출력
+@statement_rule('[', RE_LIST_PRINT)
+def _list_print_rule(line, m):
+    return ListPrintStatement(line, m.group(1) or m.group(2), int(m.group(3)) - 1)
+
+
+# 13. 스택 연산
+@statement_rule('아빠와나[', RE_PUSH)
+def _push_rule(line, m):
+    return PushStatement(line, m.group(1).strip())
+
+
+@statement_rule('아빠와 나[', RE_POP)
+def _pop_rule(line, m):
+    return PopStatement(line, m.group(1).strip())
+
+
+# 14. 디버그 출력
+@statement_rule('데이비드(', RE_DEBUG)
+def _debug_rule(line, m):
+    return DebugStatement(line, m.group(1).strip())
+
+
+# 15. 시간먹기
+@statement_rule('시간먹기(', RE_SLEEP)
+def _sleep_rule(line, m):
+    return SleepStatement(line, m.group(1).strip())
+
+
+# ---- 리스트 원소별 연산 ----
+# [결과]골고루<식 : 식에 나오는 리스트 변수를 원소별로 계산해 결과 리스트 변수에 넣습니다.
+#   스칼라(숫자, 일반 변수)는 모든 원소에 똑같이 쓰이고, 이학범 은 원소마다 적용됩니다.
+#   비교 연산자(비만, 홀쭉, 정상 …)와 야 오루페 / 야 조깜베 도 원소별로 계산되어 참이면 1, 거짓이면 0 이 됩니다.
+# [결과]다먹기<합계[리스트] / 최소[리스트] / 최대[리스트] : 리스트를 값 하나로 줄입니다.
+# 숫자 리스트끼리의 계산은 NumPy 가 설치되어 있으면 NumPy 로 한 번에 처리하고, 없으면 파이썬으로 계산합니다.
+
+RE_ELEMENTWISE = re.compile(r'\[(?:\((.+?)\)|(.+?))\]골고루<(.+)')
+RE_REDUCE = re.compile(r'\[(?:\((.+?)\)|(.+?))\]다먹기<(합계|최소|최대)\[(.+?)\]')
+
+# NumPy 의 64비트 정수/실수 계산이 파이썬 결과와 정확히 같다고 볼 수 있는 정수 크기 상한
+NUMPY_EXACT_LIMIT = 2 ** 53
+
+
+class _NotVectorizable(Exception):
+    """NumPy 로는 파이썬과 같은 결과를 보장할 수 없는 식. 파이썬 계산으로 넘어갑니다."""
+
+
+def _logical_or(left, right):
+    return bool(left or right)
+
+
+def _logical_and(left, right):
+    return bool(left and right)
+
+
+ELEMENTWISE_FUNCTIONS = dict(BINARY_FUNCTIONS, **COMPARE_FUNCTIONS, **{
+    'or': _logical_or,
+    'and': _logical_and,
+})
+
+
+def _check_lengths(left, right, interp):
+    if len(left) != len(right):
+        interp.fail(f"오류: 원소별 연산의 리스트 길이가 다릅니다 ({len(left)}, {len(right)})")
+
+
+def _slot_tree(tree):
+    """조건/표현식 트리의 ('var', 이름) 을 켜진 슬롯 표의 ('slot', 슬롯 번호) 로 바꾼 트리를 만듭니다."""
+    kind = tree[0]
+    if kind == 'var':
+        return ('slot', slot_of(tree[1]))
+    if kind == 'const' or kind == 'error':
+        return tree
+    return tuple(_slot_tree(part) if type(part) is tuple else part for part in tree)
+
+
+def _elementwise_python(tree, interp):
+    """슬롯을 정해 둔 트리(_slot_tree)를 원소별로 계산합니다. 리스트가 섞이면 리스트를, 아니면 스칼라를 돌려줍니다."""
+    kind = tree[0]
+    if kind == 'const':
+        return tree[1]
+    if kind == 'slot':
+        return interp.slot_values[tree[1]]
+    if kind == 'error':
+        interp.fail(f"오류: 표현식을 평가할 수 없습니다: {tree[1]}")
+    if kind == 'truth':
+        return _elementwise_python(tree[1], interp)
+    if kind == 'neg':
+        value = _elementwise_python(tree[1], interp)
+        if isinstance(value, LIST_VALUE_TYPES):
+            return [_negate(v) for v in value]
+        return _negate(value)
+    if kind == 'cmp':
+        func = COMPARE_FUNCTIONS[tree[1]]
+        left = _elementwise_python(tree[2], interp)
+        right = _elementwise_python(tree[3], interp)
+    else:
+        func = ELEMENTWISE_FUNCTIONS[kind]
+        left = _elementwise_python(tree[1], interp)
+        right = _elementwise_python(tree[2], interp)
+    left_is_list = isinstance(left, LIST_VALUE_TYPES)
+    right_is_list = isinstance(right, LIST_VALUE_TYPES)
+    if left_is_list and right_is_list:
+        _check_lengths(left, right, interp)
+        return [func(a, b) for a, b in zip(left, right)]
+    if left_is_list:
+        return [func(a, right) for a in left]
+    if right_is_list:
+        return [func(left, b) for b in right]
+    return func(left, right)
+
+
+def _numpy_operand(value):
+    """값을 (NumPy 배열 또는 스칼라, 정수 크기 상한) 으로 바꿉니다. 실수면 상한은 None 입니다."""
+    if isinstance(value, TypedArray):
+        if value.typecode == 'q':
+            data = numpy.frombuffer(value, dtype=numpy.int64)
+            bound = max(-int(data.min()), int(data.max())) if len(data) else 0
+            return data, bound
+        return numpy.frombuffer(value, dtype=numpy.float64), None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise _NotVectorizable()
+    if isinstance(value, int):
+        return value, abs(value)
+    return value, None
+
+
+def _as_numbers(value):
+    """
+    NumPy 참/거짓 값을 1 / 0 정수로 바꿉니다. bool 배열은 단항 - 를 못 하고 + 가 논리합이 되므로,
+    파이썬 계산(True + True == 2)과 같은 결과를 내려면 정수로 다뤄야 합니다.
+    """
+    if getattr(value, 'dtype', None) == numpy.bool_:
+        return value.astype(numpy.int64)
+    return value
+
+
+def _elementwise_numpy(tree, interp):
+    """
+    _elementwise_python 과 같은 계산을 NumPy 로 합니다. (값, 정수 크기 상한) 을 돌려줍니다.
+    정수가 NUMPY_EXACT_LIMIT 를 넘을 수 있거나 지원하지 않는 연산이면 _NotVectorizable 을 냅니다.
+    """
+    kind = tree[0]
+    if kind == 'const':
+        result = _numpy_operand(tree[1])
+    elif kind == 'slot':
+        result = _numpy_operand(interp.slot_values[tree[1]])
+    elif kind == 'truth':
+        result = _elementwise_numpy(tree[1], interp)
+    elif kind == 'neg':
+        value, bound = _elementwise_numpy(tree[1], interp)
+        result = (-value, bound)
+    elif kind in ('cmp', 'and', 'or', '+', '-', '*', '/', 'max'):
+        if kind == 'cmp':
+            left, left_bound = _elementwise_numpy(tree[2], interp)
+            right, right_bound = _elementwise_numpy(tree[3], interp)
+        else:
+            left, left_bound = _elementwise_numpy(tree[1], interp)
+            right, right_bound = _elementwise_numpy(tree[2], interp)
+        if isinstance(left, numpy.ndarray) and isinstance(right, numpy.ndarray):
+            _check_lengths(left, right, interp)
+        both_int = left_bound is not None and right_bound is not None
+        if kind == 'cmp':
+            result = (_as_numbers(COMPARE_FUNCTIONS[tree[1]](left, right)), 1)
+        elif kind == 'and':
+            result = (_as_numbers(numpy.logical_and(left, right)), 1)
+        elif kind == 'or':
+            result = (_as_numbers(numpy.logical_or(left, right)), 1)
+        elif kind == '+':
+            result = (left + right, left_bound + right_bound if both_int else None)
+        elif kind == '-':
+            result = (left - right, left_bound + right_bound if both_int else None)
+        elif kind == '*':
+            result = (left * right, left_bound * right_bound if both_int else None)
+        elif kind == '/':
+            # 0 으로 나누면 0 (_divide 와 같음)
+            shape = numpy.broadcast(left, right).shape
+            result = (numpy.divide(left, right, out=numpy.zeros(shape), where=numpy.not_equal(right, 0)), None)
+        else:
+            result = (numpy.where(numpy.greater_equal(left, right), left, right),
+                      max(left_bound, right_bound) if both_int else None)
+    else:
+        raise _NotVectorizable()
+    if result[1] is not None and result[1] >= NUMPY_EXACT_LIMIT:
+        raise _NotVectorizable()
+    return result
+
+
+def _store_elements(interp, slot, var_type, values):
+    """원소별 계산 결과를 결과 리스트 변수의 타입에 맞춰 저장합니다."""
+    typecode = LIST_TYPECODES.get(var_type)
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        if typecode == 'd':
+            interp.slot_values[slot] = TypedArray('d', values.astype(numpy.float64, copy=False).tobytes())
+            return
+        if typecode == 'q' and values.dtype != numpy.float64:
+            interp.slot_values[slot] = TypedArray('q', values.astype(numpy.int64, copy=False).tobytes())
+            return
+        values = values.tolist()
+    if var_type == 'list_int':
+        convert = int
+    elif typecode == 'd':
+        convert = float
+    else:
+        convert = str
+    converted = []
+    for v in values:
+        try:
+            converted.append(convert(v))
+        except (ValueError, OverflowError):
+            interp.fail(f"오류: '{v}'은(는) 리스트 '{interp.slot_table.names[slot]}'의 형식에 맞지 않습니다.")
+    interp.slot_values[slot] = make_list(var_type, converted)
+
+
+class ElementwiseStatement(VariableStatement):
+    """[결과]골고루<식 : 리스트 원소별 계산. 식의 변수는 해석할 때 슬롯 번호로 바꿔 둡니다 (slot_tree)."""
+    __slots__ = ('tree', 'slot_tree')
+
+    def __init__(self, source, var_name, expr):
+        self.tree = compile_condition(expr.strip()).tree
+        super().__init__(source, var_name)
+
+    def resolve_slots(self):
+        super().resolve_slots()
+        self.slot_tree = _slot_tree(self.tree)
+
+    def execute(self, interp):
+        var_name = self.var_name
+        var_type = interp.slot_types[self.slot]
+        if var_type is None or not var_type.startswith('list'):
+            interp.fail(f"오류: 정의되지 않은 리스트 변수 '{var_name}'")
+        values = None
+        if numpy is not None and var_type in LIST_TYPECODES:
+            try:
+                values = _elementwise_numpy(self.slot_tree, interp)[0]
+            except _NotVectorizable:
+                values = None
+            # 스칼라끼리의 계산이면 아래의 파이썬 계산에서 오류를 낸다
+            if not isinstance(values, numpy.ndarray) or values.ndim != 1:
+                values = None
+        if values is None:
+            values = _elementwise_python(self.slot_tree, interp)
+            if not isinstance(values, LIST_VALUE_TYPES):
+                interp.fail(f"오류: 골고루 연산에는 리스트가 하나 이상 필요합니다: {self.source}")
+        _store_elements(interp, self.slot, var_type, values)
+        return True
+
+
+class ReduceStatement(VariableStatement):
+    """[결과]다먹기<합계|최소|최대[리스트] : 리스트를 값 하나로 줄입니다."""
+    __slots__ = ('reduction', 'list_name', 'list_slot')
+
+    REDUCTIONS = {'합계': sum, '최소': min, '최대': max}
+
+    def __init__(self, source, var_name, reduction, list_name):
+        self.reduction = reduction
+        self.list_name = list_name
+        super().__init__(source, var_name)
+
+    def resolve_slots(self):
+        super().resolve_slots()
+        self.list_slot = slot_of(self.list_name)
+
+    def execute(self, interp):
+        var_name = self.var_name
+        list_name = self.list_name
+        slot = self.slot
+        var_type = interp.slot_types[slot]
+        if var_type is None:
+            interp.fail(f"오류: 정의되지 않은 변수 '{var_name}'")
+        list_type = interp.slot_types[self.list_slot]
+        if list_type is None or not list_type.startswith('list'):
+            interp.fail(f"오류: 정의되지 않은 리스트 변수 '{list_name}'")
+        values = interp.slot_values[self.list_slot]
+        if self.reduction == '합계' and list_type == 'list_str':
+            interp.fail(f"오류: 문자열 리스트 '{list_name}'의 합계는 구할 수 없습니다.")
+        if self.reduction != '합계' and not values:
+            interp.fail(f"오류: 빈 리스트 '{list_name}'의 {self.reduction}값은 구할 수 없습니다.")
+        # sum/min/max 는 배열을 C 루프 한 번으로 훑는다
+        result = self.REDUCTIONS[self.reduction](values)
+        try:
+            if var_type == 'int':
+                interp.slot_values[slot] = int(result)
+            elif var_type in ('float7', 'float15'):
+                interp.slot_values[slot] = float(result)
+            elif var_type == 'str':
+                interp.slot_values[slot] = str(result)
+            else:
+                interp.fail(f"오류: '{var_name}' 변수에는 {self.reduction} 결과를 넣을 수 없습니다.")
+        except ValueError:
+            interp.fail(f"오류: '{result}'은(는) '{var_name}' 변수의 형식에 맞지 않습니다.")
+        return True
+
+
+@statement_rule('[', RE_ELEMENTWISE)
+def _elementwise_rule(line, m):
+    return ElementwiseStatement(line, m.group(1) or m.group(2), m.group(3))
+
+
+@statement_rule('[', RE_REDUCE)
+def _reduce_rule(line, m):
+    return ReduceStatement(line, m.group(1) or m.group(2), m.group(3), m.group(4))
+
+
+# ---- 블록 트리 ----
+# 프로그램 전체를 한 번 읽어 if 체인, 반복문, 함수 본문을 중첩된 노드로 만듭니다.
+
+BLOCK_CLOSERS = ('학', '}귤한봉지', '}그챼')
+WHILE_CLOSERS = ('귤한봉지', '}귤한봉지', '}그챼')
+
+
+class Block:
+    """구문/노드 목록과 각 항목의 소스 줄 번호"""
+    __slots__ = ('items', 'lines')
+
+    def __init__(self):
+        self.items = []
+        self.lines = []
+
+    def append(self, item, lineno):
+        self.items.append(item)
+        self.lines.append(lineno)
+
+
+class IfChainNode:
+    """비만인가 / 학범이는비만일수도있음 / 학범이는비만이아님 묶음. branches 는 (조건, Block) 목록"""
+    __slots__ = ('branches', 'else_body', 'line', 'end_line')
+
+    def __init__(self, line):
+        self.branches = []
+        self.else_body = None
+        self.line = line
+        self.end_line = line
+
+
+class ForNode:
+    __slots__ = ('init', 'cond', 'step', 'body', 'line', 'end_line')
+
+    def __init__(self, init, cond, step, body, line, end_line):
+        self.init = init
+        self.cond = cond
+        self.step = step
+        self.body = body
+        self.line = line
+        self.end_line = end_line
+
+
+class WhileNode:
+    __slots__ = ('cond', 'body', 'line', 'end_line')
+
+    def __init__(self, cond, body, line, end_line):
+        self.cond = cond
+        self.body = body
+        self.line = line
+        self.end_line = end_line
+
+
+class FunctionNode:
+    """
+    함수 정의. param_slots 는 매개변수 이름의 슬롯 번호입니다.
+    frame_slots 는 본문이 값을 쓸 수 있는 슬롯(매개변수 포함)으로, 호출할 때 이 자리만 저장했다가 되돌립니다.
+    본문에 무엇을 쓸지 모르는 구문이 있으면 None 입니다.
+    """
+    __slots__ = ('name', 'params', 'param_slots', 'frame_slots', 'body', 'line', 'end_line')
+
+    def __init__(self, name, params, body, line, end_line):
+        self.name = name
+        self.params = params
+        self.param_slots = [slot_of(param) for param in params]
+        slots = set(self.param_slots)
+        self.frame_slots = tuple(sorted(slots)) if _collect_stored_slots(body.items, slots) else None
+        self.body = body
+        self.line = line
+        self.end_line = end_line
+
+    def __reduce__(self):
+        # 슬롯 번호는 슬롯 표마다 다르므로 저장하지 않고 불러올 때 다시 구한다
+        return (FunctionNode, (self.name, self.params, self.body, self.line, self.end_line))
+
+
+# 실행해도 변수에 값을 쓰지 않는 구문 (새 규칙의 하위 클래스는 알 수 없으므로 정확한 타입으로만 본다)
+READ_ONLY_STATEMENT_TYPES = frozenset((
+    UnknownStatement, NoOpStatement, BreakStatement, ReturnStatement, PrintStatement, InputStatement,
+    BlockHeaderStatement, DeferredCallStatement, CallStatement, DebugStatement, SleepStatement,
+))
+
+
+def _collect_stored_slots(items, slots):
+    """
+    블록 항목들이 값을 쓸 수 있는 슬롯을 slots 에 모읍니다. VariableStatement 는 자기 변수에만 씁니다.
+    호출한 함수는 자기 프레임을 스스로 되돌리므로 넣지 않습니다. 무엇을 쓸지 모르는 구문이 있으면 False
+    """
+    for item in items:
+        kind = type(item)
+        if kind in READ_ONLY_STATEMENT_TYPES or kind is FunctionNode:
+            continue
+        if kind is IfChainNode:
+            bodies = [body for _, body in item.branches]
+            if item.else_body is not None:
+                bodies.append(item.else_body)
+            if not all(_collect_stored_slots(body.items, slots) for body in bodies):
+                return False
+        elif kind is ForNode:
+            if not _collect_stored_slots((item.init, item.step), slots) or not _collect_stored_slots(item.body.items, slots):
+                return False
+        elif kind is WhileNode:
+            if not _collect_stored_slots(item.body.items, slots):
+                return False
+        elif isinstance(item, VariableStatement):
+            slots.add(item.slot)
+        else:
+            return False
+    return True
+
+
+class ProgramParser:
+    """
+    (줄 번호, 줄) 목록을 블록 트리로 해석합니다.
+    빈 줄, '학범', 주석은 건너뛰고, 쿰쳑쿰쳑 은 해당 구문을 두 번 넣는 것으로 풀어 둡니다.
+    끝나지 않은 블록은 기존 인터프리터처럼 실행하지 않고 버립니다.
+    """
+
+    def __init__(self, lines, compile_line):
+        self._lines = iter(lines)
+        self._compile = compile_line
+        self._pending = None
+
+    def _peek(self):
+        while self._pending is None:
+            try:
+                lineno, raw = next(self._lines)
+            except StopIteration:
+                return None
+            line = raw.strip()
+            if not line or line == '학범' or line.startswith('저 쿰쳑 안먹었는데요'):
+                continue
+            self._pending = (lineno, line)
+        return self._pending
+
+    def _next(self):
+        entry = self._peek()
+        self._pending = None
+        return entry
+
+    def parse_program(self):
+        block = Block()
+        for part in self.iter_program():
+            block.items.extend(part.items)
+            block.lines.extend(part.lines)
+        return block
+
+    def iter_program(self):
+        """최상위 항목을 하나씩 (Block 으로 감싸서) 만들어 냅니다. 다음 항목은 앞의 것을 다 쓴 뒤에 읽습니다."""
+        entry = self._next()
+        while entry is not None:
+            block = Block()
+            self._parse_into(block, entry)
+            if block.items:
+                yield block
+            entry = self._next()
+
+    def _parse_into(self, block, entry):
+        """한 항목을 block 에 덧붙입니다. 블록이 끝나기 전에 파일이 끝나면 False"""
+        lineno, line = entry
+        if line.startswith('쿰쳑쿰쳑'):
+            inner = line[len('쿰쳑쿰쳑'):].strip()
+            if inner:
+                stmt = self._compile(inner)
+                block.append(stmt, lineno)
+                block.append(stmt, lineno)
+                return True
+            # 다음 실제 구문을 두 번 실행 (블록 머리줄이면 기존처럼 한 번)
+            entry = self._next()
+            if entry is None:
+                return True
+            count = len(block.items)
+            ok = self._parse_into(block, entry)
+            if len(block.items) == count + 1 and isinstance(block.items[-1], Statement):
+                block.append(block.items[-1], block.lines[-1])
+            return ok
+        stmt = self._compile(line)
+        if isinstance(stmt, BlockHeaderStatement):
+            node = self._parse_header(stmt, lineno)
+            if node is None:
+                return False
+            block.append(node, lineno)
+            return True
+        block.append(stmt, lineno)
+        return True
+
+    def _parse_body(self, block_type):
+        # 여는 줄(학 / 학범이는비만임 / 5분)은 있으면 건너뛴다
+        if block_type == 'if':
+            openers = ('학범이는비만임', '학')
+        elif block_type == 'while':
+            openers = ('학', '5분')
+        else:
+            openers = ('학',)
+        entry = self._peek()
+        if entry is not None and entry[1] in openers:
+            self._next()
+        closers = WHILE_CLOSERS if block_type == 'while' else BLOCK_CLOSERS
+        body = Block()
+        while True:
+            entry = self._next()
+            if entry is None:
+                return body, None
+            if entry[1] in closers:
+                return body, entry[0]
+            if not self._parse_into(body, entry):
+                return body, None
+
+    def _parse_header(self, stmt, lineno):
+        block_type = stmt.block_type
+        if block_type in ('if', 'elseif', 'else'):
+            return self._parse_if_chain(stmt, lineno)
+        body, end_line = self._parse_body(block_type)
+        if end_line is None:
+            return None
+        context = stmt.context
+        if block_type == 'for':
+            return ForNode(self._compile(context['init']), context['cond'], self._compile(context['step']),
+                           body, lineno, end_line)
+        if block_type == 'while':
+            return WhileNode(context['cond'], body, lineno, end_line)
+        return FunctionNode(context['name'], context['params'], body, lineno, end_line)
+
+    def _parse_if_chain(self, stmt, lineno):
+        node = IfChainNode(lineno)
+        while True:
+            body, end_line = self._parse_body(stmt.block_type)
+            if end_line is None:
+                return None
+            node.end_line = end_line
+            if stmt.block_type == 'else':
+                node.else_body = body
+                return node
+            node.branches.append((stmt.context['cond'], body))
+            entry = self._peek()
+            if entry is None:
+                return node
+            stmt = self._compile(entry[1])
+            if not (isinstance(stmt, BlockHeaderStatement) and stmt.block_type in ('elseif', 'else')):
+                return node
+            self._next()
+
+
+def source_lines(code):
+    """기존 run() 과 같은 방식으로 나눈 (줄 번호, 줄) 목록"""
+    return [(i + 1, line) for i, line in enumerate(code.strip().split('\n'))]
+
+
+def iter_source_lines(lines):
+    """
+    source_lines 와 같은 (줄 번호, 줄) 을 하나씩 만들어 냅니다. 파일 객체처럼 줄을 하나씩 주는 것이면 됩니다.
+    code.strip() 처럼 앞쪽의 빈 줄은 건너뛰고 그 다음 줄을 1번 줄로 셉니다.
+    """
+    lineno = 0
+    for line in lines:
+        if lineno == 0 and not line.strip():
+            continue
+        lineno += 1
+        yield lineno, line.rstrip('\n')
+
+
+# ---- 타입 분석 ----
+# 해석한 블록 트리를 실행 순서대로 훑으며 자리마다 '반드시 정의되어 있고 타입이 이것인' 변수를 추적하고,
+# 타입이 정해진 자리의 꿀꺽< 와 리스트 출력은 타입별로 특수화한 구문으로, 출력 구문은 형식을 정해 둔 템플릿으로 바꿉니다.
+# 변수의 타입을 바꾸는 것은 선언과 아빠와 나(pop), 함수 인자뿐입니다. pop 한 변수와 함수 본문에서 처음 보는 변수는
+# 타입을 모르는 것으로 보고 기존 구문(실행할 때 타입을 검사)을 그대로 씁니다.
+# 함수 호출은 프레임을 복사해 실행하고 돌아오므로 호출한 쪽의 변수 타입을 바꾸지 않습니다.
+# 최적화(--optimize)는 이 분석을 거친 블록에 적용합니다.
+
+
+class TypedIncrementStatement(VariableStatement):
+    """
+    타입 분석으로 변수가 반드시 정의된 int / float 변수임을 안 자리의 꿀꺽< (최적화로 합친 것 포함).
+    실행할 때 정의 여부와 타입을 검사하지 않습니다. amount 가 있으면 그 값을 한 번 더하고, 없으면 증감량을 차례로 적용합니다.
+    """
+    __slots__ = ('var_type', 'deltas', 'amount')
+
+    def __init__(self, source, var_name, var_type, deltas):
+        super().__init__(source, var_name)
+        self.var_type = var_type
+        self.deltas = deltas
+        if var_type == 'int':
+            self.amount = sum(deltas) if all(type(delta) is int for delta in deltas) else None
+        else:
+            self.amount = deltas[0] if len(deltas) == 1 else None
+
+    def execute(self, interp):
+        values = interp.slot_values
+        if self.amount is not None:
+            values[self.slot] += self.amount
+            return True
+        value = values[self.slot]
+        if self.var_type == 'int':
+            for delta in self.deltas:
+                value = int(value + delta)
+        else:
+            for delta in self.deltas:
+                value += delta
+        values[self.slot] = value
+        return True
+
+
+class TypedListPrintStatement(VariableStatement):
+    """타입 분석으로 반드시 정의된 리스트임을 안 자리의 [리스트]쿰척[n]. 원소 형식은 해석할 때 정해 둡니다."""
+    __slots__ = ('index', 'var_type', 'format')
+
+    def __init__(self, source, var_name, index, var_type):
+        super().__init__(source, var_name)
+        self.index = index
+        self.var_type = var_type
+        self.format = ELEMENT_FORMATTERS.get(var_type, str)
+
+    def execute(self, interp):
+        lst = interp.slot_values[self.slot]
+        idx = self.index
+        if idx < 0 or idx >= len(lst):
+            interp.fail(f"오류: 인덱스 {idx+1} 는 리스트 범위를 벗어납니다.")
+        interp.output.write_line(self.format(lst[idx]))
+        return True
+
+
+NUMERIC_TYPES = ('int', 'float7', 'float15')
+
+
+def _merge_types(states):
+    """여러 경로가 만나는 자리의 상태: 모든 경로에서 정의된 변수만, 타입이 다르면 None (정의되어 있지만 모름)"""
+    merged = dict(states[0])
+    for state in states[1:]:
+        for name in list(merged):
+            if name not in state:
+                del merged[name]
+            elif state[name] != merged[name]:
+                merged[name] = None
+    return merged
+
+
+def specialize_statement(stmt, state):
+    """state 에서 타입을 아는 변수를 다루는 구문이면 타입별 구문으로, 아니면 stmt 그대로 돌려줍니다."""
+    kind = type(stmt)
+    if kind is IncrementStatement:
+        var_type = state.get(stmt.var_name)
+        if var_type in NUMERIC_TYPES and stmt.delta is not None:
+            return TypedIncrementStatement(stmt.source, stmt.var_name, var_type, [stmt.delta])
+    elif kind is ListPrintStatement:
+        var_type = state.get(stmt.var_name)
+        if var_type is not None and var_type.startswith('list'):
+            return TypedListPrintStatement(stmt.source, stmt.var_name, stmt.index, var_type)
+    elif kind is PrintStatement:
+        # 여러 번 실행될 자리의 출력이므로 타입을 아는 변수가 없어도 템플릿은 만들어 둔다
+        var_types = {name: state[name] for name in stmt.names() if state.get(name) is not None}
+        if var_types or stmt.template is None:
+            return PrintStatement(stmt.source, stmt.content, stmt.newline, var_types or None, templated=True)
+    return stmt
+
+
+# specialize_statement 가 바꿀 수 있는 구문 종류
+SPECIALIZED_TYPES = frozenset((IncrementStatement, ListPrintStatement, PrintStatement))
+
+
+def statement_types(stmt, state):
+    """구문을 실행한 뒤의 상태. 바뀌는 것이 없으면 state 그대로입니다 (상태 사전은 고치지 않고 새로 만든다)."""
+    kind = type(stmt)
+    if kind is DeclareStatement:
+        if state.get(stmt.var_name) != stmt.var_type:
+            state = dict(state)
+            state[stmt.var_name] = stmt.var_type
+    elif kind is PopStatement:
+        # 꺼낸 값의 타입을 알 수 없으면 변수를 바꾸지 않으므로 정의 여부는 그대로 둔다
+        if state.get(stmt.var_name) is not None:
+            state = dict(state)
+            state[stmt.var_name] = None
+    return state
+
+
+class TypeSpecializer:
+    """
+    최상위 블록을 실행 순서대로 받아 타입별 구문을 넣은 새 블록을 돌려줍니다.
+    상태(state)는 변수 이름 -> 타입 사전으로, 들어 있는 변수는 그 자리에서 반드시 정의되어 있습니다 (타입을 모르면 None).
+    """
+
+    def __init__(self):
+        self.state = {}
+        # 반복문마다 몸무게0.1톤 으로 빠져나가는 자리의 상태 목록
+        self.breaks = []
+        # 반복문 본문이나 함수 본문 안이면 0 보다 크다. 출력은 여러 번 실행될 수 있는 이 안에서만 템플릿으로 바꾼다
+        self.repeated = 0
+        # (구문, 변수 타입) -> 특수화한 구문. 같은 줄은 같은 구문 객체이므로 한 번만 만든다
+        # (줄 캐시처럼 COMPILE_CACHE_LIMIT 를 넘으면 비우므로 큰 프로그램에서도 메모리가 늘지 않는다)
+        self.typed = {}
+
+    def specialize(self, block):
+        block, self.state = self.walk(block, self.state, True)
+        return block
+
+    def specialize_statement(self, stmt, state):
+        if type(stmt) not in SPECIALIZED_TYPES:
+            return stmt
+        names = stmt.names() if type(stmt) is PrintStatement else (stmt.var_name,)
+        key = (stmt, tuple([state.get(name) for name in names]))
+        typed = self.typed.get(key)
+        if typed is None:
+            if len(self.typed) >= COMPILE_CACHE_LIMIT:
+                self.typed.clear()
+            typed = self.typed[key] = specialize_statement(stmt, state)
+        return typed
+
+    def walk(self, block, state, emit):
+        """
+        블록을 훑어 (특수화한 Block, 블록이 끝난 뒤의 상태) 를 돌려줍니다.
+        바뀐 항목이 없으면 block 을 그대로, emit 이 아니면 None 을 돌려줍니다.
+        """
+        items = []
+        changed = False
+        for item in block.items:
+            kind = type(item)
+            if kind in CONTROL_ITEM_TYPES:
+                walked, state = self.walk_item(item, state, emit)
+            elif kind is DeclareStatement or kind is PopStatement:
+                state = statement_types(item, state)
+                walked = item
+            elif emit and kind in SPECIALIZED_TYPES and (self.repeated or kind is not PrintStatement):
+                # 한 번만 실행되는 최상위 출력은 특수화한 템플릿을 만들어 둘 이득이 없다
+                walked = self.specialize_statement(item, state)
+            else:
+                walked = item
+            if walked is not item:
+                changed = True
+            items.append(walked)
+        if not emit:
+            return None, state
+        if not changed:
+            return block, state
+        walked = Block()
+        walked.items = items
+        walked.lines = block.lines
+        return walked, state
+
+    def walk_item(self, item, state, emit):
+        """제어 항목(분기, 반복, 함수 정의, 몸무게0.1톤, 꺼억) 하나를 훑습니다."""
+        kind = type(item)
+        if kind is IfChainNode:
+            # 조건식은 변수를 바꾸지 않으므로 모든 분기가 같은 상태에서 시작한다
+            node = IfChainNode(item.line)
+            node.end_line = item.end_line
+            ends = []
+            for cond, body in item.branches:
+                body, end = self.walk(body, state, emit)
+                node.branches.append((cond, body))
+                ends.append(end)
+            if item.else_body is not None:
+                node.else_body, end = self.walk(item.else_body, state, emit)
+                ends.append(end)
+            else:
+                ends.append(state)
+            return (node if emit else item), _merge_types(ends)
+        if kind is ForNode or kind is WhileNode:
+            return self.walk_loop(item, state, emit)
+        if kind is FunctionNode:
+            if not emit:
+                return item, state
+            # 함수 본문은 언제 어디서 불릴지 모르므로 아무것도 모르는 상태에서 시작한다
+            saved, self.breaks = self.breaks, []
+            self.repeated += 1
+            try:
+                body, _ = self.walk(item.body, {}, True)
+            finally:
+                self.breaks = saved
+                self.repeated -= 1
+            return FunctionNode(item.name, item.params, body, item.line, item.end_line), state
+        if kind is BreakStatement and self.breaks:
+            self.breaks[-1].append(state)
+        return item, state
+
+    def walk_loop(self, node, state, emit):
+        """반복문 머리의 상태가 더 바뀌지 않을 때까지 본문을 훑은 뒤, 그 상태로 본문을 특수화합니다."""
+        is_for = type(node) is ForNode
+        init = node.init if is_for else None
+        if is_for:
+            if emit:
+                init = self.specialize_statement(init, state)
+            state = statement_types(init, state)
+        head = state
+        while True:
+            _, end, _ = self.walk_body(node, head, False)
+            if is_for:
+                end = statement_types(node.step, end)
+            merged = _merge_types([head, end])
+            if merged == head:
+                break
+            head = merged
+        body, end, breaks = self.walk_body(node, head, emit)
+        # 조건이 거짓이 되었거나 몸무게0.1톤 으로 빠져나온 자리
+        exit_state = _merge_types([head] + breaks)
+        if not emit:
+            return node, exit_state
+        if is_for:
+            step = self.specialize_statement(node.step, end)
+            return ForNode(init, node.cond, step, body, node.line, node.end_line), exit_state
+        return WhileNode(node.cond, body, node.line, node.end_line), exit_state
+
+    def walk_body(self, node, head, emit):
+        """본문 한 바퀴를 훑어 (본문, 본문이 끝난 뒤의 상태, 몸무게0.1톤 으로 빠져나간 자리의 상태 목록) 을 돌려줍니다."""
+        self.breaks.append([])
+        self.repeated += 1
+        try:
+            body, end = self.walk(node.body, head, emit)
+        finally:
+            breaks = self.breaks.pop()
+            self.repeated -= 1
+        return body, end, breaks
+
+
+def specialize_blocks(blocks):
+    """최상위 블록들을 차례로 타입 분석해 타입별 구문을 넣은 블록으로 내보냅니다."""
+    specializer = TypeSpecializer()
+    for block in blocks:
+        yield specializer.specialize(block)
+
+
+# ---- 최적화 ----
+# --optimize 로 켜는 블록 트리 변환입니다. 출력과 변수 값은 그대로 두고 실행할 항목만 줄입니다.
+# 같은 변수의 연속된 꿀꺽< 는 하나로 합치고, 상수만으로 된 표현식/조건식은 미리 계산하며, 실행될 수 없는 분기는 버립니다.
+# 구문 객체는 줄 캐시에서 함께 쓰므로 고치지 않고 바뀐 것만 새로 만듭니다.
+
+# 미리 계산하는 상수의 타입 (리스트는 평가할 때마다 새 객체여야 하므로 제외)
+FOLD_VALUE_TYPES = (int, float, str)
+# 미리 계산할 거듭제곱의 최대 지수 / 밑의 최대 비트 수 (해석할 때 큰 수를 만들지 않도록)
+FOLD_POWER_LIMIT = 64
+
+_NOT_FOLDED = object()
+
+
+def _fold_binary(kind, left, right):
+    """상수 두 개에 이항 연산을 미리 적용한 값. 안전하게 계산할 수 없으면 _NOT_FOLDED (실행할 때 그대로 오류가 나도록)."""
+    if type(left) not in FOLD_VALUE_TYPES or type(right) not in FOLD_VALUE_TYPES:
+        return _NOT_FOLDED
+    if kind == '*' or kind == '^':
+        if type(left) is str or type(right) is str:
+            return _NOT_FOLDED
+        if kind == '^' and (abs(right) > FOLD_POWER_LIMIT
+                            or type(left) is int and left.bit_length() > FOLD_POWER_LIMIT):
+            return _NOT_FOLDED
+    try:
+        value = BINARY_FUNCTIONS[kind](left, right)
+    except Exception:
+        return _NOT_FOLDED
+    return value if type(value) in FOLD_VALUE_TYPES else _NOT_FOLDED
+
+
+def fold_expression(tree):
+    """표현식 트리에서 상수만으로 된 부분을 계산해 둔 트리. 바뀐 것이 없으면 tree 그대로입니다."""
+    kind = tree[0]
+    if kind == 'const' or kind == 'var' or kind == 'error':
+        return tree
+    if kind == 'neg':
+        inner = fold_expression(tree[1])
+        if inner[0] == 'const' and type(inner[1]) in FOLD_VALUE_TYPES:
+            return ('const', _negate(inner[1]))
+        return tree if inner is tree[1] else ('neg', inner)
+    left = fold_expression(tree[1])
+    right = fold_expression(tree[2])
+    if left[0] == 'const' and right[0] == 'const':
+        value = _fold_binary(kind, left[1], right[1])
+        if value is not _NOT_FOLDED:
+            return ('const', value)
+    if left is tree[1] and right is tree[2]:
+        return tree
+    return (kind, left, right)
+
+
+def fold_condition(tree):
+    """
+    조건 트리에서 상수만으로 된 부분을 계산해 둔 트리.
+    야 오루페 / 야 조깜베 는 단락 평가로 건너뛰는 쪽만 버리므로, 원래 평가되던 식은 그대로 평가됩니다.
+    """
+    kind = tree[0]
+    if kind == 'const':
+        return tree
+    if kind == 'or' or kind == 'and':
+        left = fold_condition(tree[1])
+        right = fold_condition(tree[2])
+        if left[0] == 'const':
+            # 참 야 오루페 … / 거짓 야 조깜베 … 는 오른쪽을 보지 않는다
+            if left[1] == (kind == 'or'):
+                return left
+            return right
+        if right[0] == 'const' and right[1] == (kind == 'and'):
+            # … 야 오루페 거짓 / … 야 조깜베 참 은 왼쪽과 같다
+            return left
+        if left is tree[1] and right is tree[2]:
+            return tree
+        return (kind, left, right)
+    if kind == 'cmp':
+        left = fold_expression(tree[2])
+        right = fold_expression(tree[3])
+        if left[0] == 'const' and right[0] == 'const':
+            try:
+                return ('const', bool(COMPARE_FUNCTIONS[tree[1]](left[1], right[1])))
+            except Exception:
+                pass
+        if left is tree[2] and right is tree[3]:
+            return tree
+        return ('cmp', tree[1], left, right)
+    value = fold_expression(tree[1])
+    if value[0] == 'const':
+        return ('const', bool(value[1]))
+    return tree if value is tree[1] else ('truth', value)
+
+
+def _fold_compiled(compiled, fold):
+    tree = fold(compiled.tree)
+    if tree is compiled.tree:
+        return compiled
+    return type(compiled)(compiled.source, tree)
+
+
+def _constant_truth(cond):
+    """조건이 상수면 그 참/거짓, 아니면 None"""
+    return cond.tree[1] if cond.tree[0] == 'const' else None
+
+
+def _fuse_increments(first, second):
+    """같은 변수에 대한 연속된 꿀꺽< 두 개를 합친 구문. 합칠 수 없으면 None"""
+    if type(second) is TypedIncrementStatement:
+        # 증감은 타입을 바꾸지 않으므로 바로 앞의 같은 변수 꿀꺽< 도 같은 타입으로 특수화되어 있다
+        if type(first) is TypedIncrementStatement and first.var_name == second.var_name:
+            return TypedIncrementStatement(first.source, first.var_name, first.var_type, first.deltas + second.deltas)
+        return None
+    if type(second) is not IncrementStatement or second.delta is None:
+        return None
+    if type(first) is IncrementStatement and first.delta is not None and first.var_name == second.var_name:
+        return FusedIncrementStatement(first.source, first.var_name, [first.delta, second.delta])
+    if type(first) is FusedIncrementStatement and first.var_name == second.var_name:
+        return FusedIncrementStatement(first.source, first.var_name, first.deltas + [second.delta])
+    return None
+
+
+def optimize_statement(stmt):
+    """구문의 표현식을 상수 계산해 둔 구문. 바뀐 것이 없으면 stmt 그대로입니다."""
+    kind = type(stmt)
+    if kind is ReturnStatement or kind is DebugStatement or kind is SleepStatement:
+        if stmt.expr is not None:
+            expr = _fold_compiled(stmt.expr, fold_expression)
+            if expr is not stmt.expr:
+                stmt = copy.copy(stmt)
+                stmt.expr = expr
+    elif kind is CallStatement or kind is DeferredCallStatement:
+        args = [_fold_compiled(arg, fold_expression) for arg in stmt.args]
+        if any(new is not old for new, old in zip(args, stmt.args)):
+            stmt = copy.copy(stmt)
+            stmt.args = args
+    return stmt
+
+
+def optimize_item(item):
+    """블록 항목 하나를 최적화합니다. 실행될 일이 없는 항목이면 None"""
+    kind = type(item)
+    if kind is IfChainNode:
+        node = IfChainNode(item.line)
+        node.end_line = item.end_line
+        for cond, body in item.branches:
+            cond = _fold_compiled(cond, fold_condition)
+            truth = _constant_truth(cond)
+            if truth is False:
+                continue
+            if truth is True:
+                # 항상 참인 분기 뒤의 분기는 실행될 수 없다
+                node.else_body = optimize_block(body)
+                break
+            node.branches.append((cond, optimize_block(body)))
+        else:
+            if item.else_body is not None:
+                node.else_body = optimize_block(item.else_body)
+        if not node.branches and (node.else_body is None or not node.else_body.items):
+            return None
+        return node
+    if kind is WhileNode:
+        cond = _fold_compiled(item.cond, fold_condition)
+        if _constant_truth(cond) is False:
+            return None
+        return WhileNode(cond, optimize_block(item.body), item.line, item.end_line)
+    if kind is ForNode:
+        # 조건이 거짓이어도 초기화 구문은 실행되므로 노드는 남긴다
+        return ForNode(optimize_statement(item.init), _fold_compiled(item.cond, fold_condition),
+                       optimize_statement(item.step), optimize_block(item.body), item.line, item.end_line)
+    if kind is FunctionNode:
+        return FunctionNode(item.name, item.params, optimize_block(item.body), item.line, item.end_line)
+    return optimize_statement(item)
+
+
+def optimize_block(block):
+    """최적화한 새 Block 을 돌려줍니다."""
+    optimized = Block()
+    items = optimized.items
+    for item, lineno in zip(block.items, block.lines):
+        item = optimize_item(item)
+        if item is None:
+            continue
+        fused = _fuse_increments(items[-1], item) if items else None
+        if fused is not None:
+            items[-1] = fused
+        else:
+            optimized.append(item, lineno)
+    return optimized
+
+
+def optimize_blocks(blocks):
+    """
+    최상위 블록들을 차례로 최적화합니다. 최상위의 연속된 꿀꺽< 도 합치기 위해 한 블록씩 늦게 내보냅니다.
+    해석 오류가 나면 그 앞의 블록을 먼저 내보낸 뒤 오류를 냅니다.
+    """
+    pending = None
+    try:
+        for block in blocks:
+            block = optimize_block(block)
+            if not block.items:
+                continue
+            if pending is not None:
+                fused = None
+                if len(pending.items) == 1 and len(block.items) == 1:
+                    fused = _fuse_increments(pending.items[0], block.items[0])
+                if fused is not None:
+                    pending.items[0] = fused
+                    continue
+                yield pending
+            pending = block
+    except Exception:
+        if pending is not None:
+            yield pending
+        raise
+    if pending is not None:
+        yield pending
+
+
+# ---- 고정소수점 ----
+# --fixed-point 로 켜는 수 표현입니다. float7 / float15 변수의 값을 10^7 / 10^15 배 한 정수(units)로 담아
+# 선언, 초기화, 꿀꺽< 증감을 정수 덧셈으로 정확하게 계산하고, 출력할 때도 실수 반올림 없이 자릿수를 씁니다.
+# 값은 float 의 하위 클래스이므로 표현식, 조건식, 스택, 함수 인자에서는 그대로 실수처럼 쓰입니다.
+# 입력, 포자, 다먹기, pop 처럼 실수로 들어온 값은 다음 꿀꺽< 때 자릿수에 맞춰 반올림해 정수로 바꿉니다.
+
+# 고정소수점으로 담는 변수 타입과 소수 자릿수
+FIXED_DIGITS = {'float7': 7, 'float15': 15}
+# 자릿수 -> 10^자릿수
+FIXED_SCALES = {digits: 10 ** digits for digits in FIXED_DIGITS.values()}
+
+RE_FIXED_FORMAT = re.compile(r'\.(\d+)f')
+
+
+def _round_div(n, d):
+    """n / d 를 가장 가까운 정수로 (가운데면 짝수 쪽으로) 반올림합니다. d 는 양수입니다."""
+    q, r = divmod(n, d)
+    if 2 * r > d or (2 * r == d and q % 2):
+        q += 1
+    return q
+
+
+def _rescale(units, digits, new_digits):
+    """digits 자리로 담은 units 를 new_digits 자리로 바꿉니다."""
+    if new_digits >= digits:
+        return units * 10 ** (new_digits - digits)
+    return _round_div(units, 10 ** (digits - new_digits))
+
+
+class FixedDecimal(float):
+    """
+    고정소수점 값. units / 10^digits 가 정확한 값이고, float 로서의 값은 그에 가장 가까운 double 입니다.
+    '.Nf' 형식으로 출력하면 units 에서 바로 자릿수를 만듭니다. 산술 연산의 결과는 보통 float 입니다.
+    """
+    __slots__ = ('units', 'digits')
+
+    def __new__(cls, units, digits):
+        value = float.__new__(cls, units / FIXED_SCALES[digits])
+        value.units = units
+        value.digits = digits
+        return value
+
+    def __format__(self, spec):
+        m = RE_FIXED_FORMAT.fullmatch(spec)
+        if m is None:
+            return float.__format__(self, spec)
+        places = int(m.group(1))
+        units = _rescale(self.units, self.digits, places)
+        whole, fraction = divmod(abs(units), 10 ** places)
+        # float 처럼 0 으로 반올림된 음수에도 부호를 붙인다
+        sign = '-' if self.units < 0 else ''
+        if not places:
+            return f"{sign}{whole}"
+        return f"{sign}{whole}.{fraction:0{places}d}"
+
+    def __reduce__(self):
+        return (FixedDecimal, (self.units, self.digits))
+
+
+DISPLAY_TYPE_NAMES[FixedDecimal] = 'float'
+
+
+def fixed_units(value, digits):
+    """변수 값을 digits 자리 고정소수점 정수로 바꿉니다."""
+    if type(value) is FixedDecimal:
+        return _rescale(value.units, value.digits, digits)
+    return round(value * 10 ** digits)
+
+
+class FixedIncrementStatement(VariableStatement):
+    """
+    --fixed-point 의 꿀꺽< (합친 것 포함). float 변수에는 자릿수별로 미리 정수로 바꿔 둔 증감량을 더합니다.
+    var_type 은 타입 분석으로 안 변수 타입이며, None 이면 실행할 때 타입을 봅니다. int 변수는 기존처럼 증감량을 차례로 적용합니다.
+    """
+    __slots__ = ('deltas', 'var_type', 'units')
+
+    def __init__(self, source, var_name, deltas, var_type=None):
+        super().__init__(source, var_name)
+        self.deltas = deltas
+        self.var_type = var_type
+        # 자릿수마다 증감량을 하나씩 반올림해 더한 정수 (따로 실행했을 때와 같도록)
+        self.units = {var: sum(fixed_units(delta, digits) for delta in deltas) for var, digits in FIXED_DIGITS.items()}
+
+    def execute(self, interp):
+        slot = self.slot
+        var_type = self.var_type or interp.slot_types[slot]
+        if var_type is None:
+            interp.fail(f"오류: 정의되지 않은 변수 '{self.var_name}'")
+        values = interp.slot_values
+        digits = FIXED_DIGITS.get(var_type)
+        if digits is not None:
+            value = values[slot]
+            if type(value) is FixedDecimal and value.digits == digits:
+                units = value.units
+            else:
+                units = fixed_units(value, digits)
+            values[slot] = FixedDecimal(units + self.units[var_type], digits)
+        elif var_type == 'int':
+            value = values[slot]
+            for delta in self.deltas:
+                value = int(value + delta)
+            values[slot] = value
+        else:
+            interp.fail(f"오류: '{self.var_name}' 변수에 대한 꿀꺽 연산은 지원되지 않습니다.")
+        return True
+
+
+class FixedResetStatement(ResetStatement):
+    """--fixed-point 의 간장먹고[변수]치기. float 변수는 고정소수점 30.7 로 되돌립니다."""
+    __slots__ = ()
+
+    def execute(self, interp):
+        digits = FIXED_DIGITS.get(interp.slot_types[self.slot])
+        if digits is None:
+            return super().execute(interp)
+        interp.slot_values[self.slot] = FixedDecimal(fixed_units(30.7, digits), digits)
+        return True
+
+
+def fixed_point_statement(stmt):
+    """float 변수를 다루는 구문을 고정소수점 구문으로 바꿉니다. 바꿀 것이 없으면 stmt 그대로입니다."""
+    kind = type(stmt)
+    if kind is DeclareStatement:
+        digits = FIXED_DIGITS.get(stmt.var_type)
+        if digits is not None:
+            stmt = copy.copy(stmt)
+            stmt.initial = FixedDecimal(fixed_units(stmt.initial, digits), digits)
+    elif kind is IncrementStatement:
+        if stmt.delta is not None:
+            return FixedIncrementStatement(stmt.source, stmt.var_name, [stmt.delta])
+    elif kind is FusedIncrementStatement:
+        return FixedIncrementStatement(stmt.source, stmt.var_name, stmt.deltas)
+    elif kind is TypedIncrementStatement:
+        if stmt.var_type in FIXED_DIGITS:
+            return FixedIncrementStatement(stmt.source, stmt.var_name, stmt.deltas, stmt.var_type)
+    elif kind is ResetStatement:
+        return FixedResetStatement(stmt.source, stmt.var_name)
+    return stmt
+
+
+def fixed_point_item(item):
+    kind = type(item)
+    if kind is IfChainNode:
+        node = IfChainNode(item.line)
+        node.end_line = item.end_line
+        node.branches = [(cond, fixed_point_block(body)) for cond, body in item.branches]
+        if item.else_body is not None:
+            node.else_body = fixed_point_block(item.else_body)
+        return node
+    if kind is WhileNode:
+        return WhileNode(item.cond, fixed_point_block(item.body), item.line, item.end_line)
+    if kind is ForNode:
+        return ForNode(fixed_point_statement(item.init), item.cond, fixed_point_statement(item.step),
+                       fixed_point_block(item.body), item.line, item.end_line)
+    if kind is FunctionNode:
+        return FunctionNode(item.name, item.params, fixed_point_block(item.body), item.line, item.end_line)
+    return fixed_point_statement(item)
+
+
+def fixed_point_block(block):
+    converted = Block()
+    converted.items = [fixed_point_item(item) for item in block.items]
+    converted.lines = block.lines
+    return converted
+
+
+def fixed_point_blocks(blocks):
+    """최상위 블록들을 차례로 고정소수점 구문으로 바꿔 내보냅니다."""
+    for block in blocks:
+        yield fixed_point_block(block)
+
+
+class CompiledProgram:
+    """
+    끝까지 미리 해석해 둔 프로그램. 최상위 항목 블록 목록과, 해석하다 난 오류(있으면)를 담습니다.
+    valid 는 첫 줄이 학범 으로 시작하는지, slots 는 구문들이 번호를 받은 SlotTable,
+    code 는 HaklangVM 이 붙여 두는 명령 목록입니다.
+    """
+    __slots__ = ('blocks', 'error', 'valid', 'slots', 'code', '_optimized', '_fixed_point')
+
+    def __init__(self, blocks, error=None, valid=True, slots=None):
+        self.blocks = blocks
+        self.error = error
+        self.valid = valid
+        self.slots = SlotTable() if slots is None else slots
+        self.code = None
+        self._optimized = None
+        self._fixed_point = None
+
+    def optimized(self):
+        """optimize_blocks 를 거친 프로그램. 처음 부를 때 만들어 두고 다시 씁니다."""
+        if self._optimized is None:
+            with self.slots.active():
+                blocks = list(optimize_blocks(self.blocks))
+            self._optimized = CompiledProgram(blocks, self.error, self.valid, self.slots)
+        return self._optimized
+
+    def fixed_point(self):
+        """fixed_point_blocks 를 거친 프로그램. 처음 부를 때 만들어 두고 다시 씁니다."""
+        if self._fixed_point is None:
+            with self.slots.active():
+                blocks = list(fixed_point_blocks(self.blocks))
+            self._fixed_point = CompiledProgram(blocks, self.error, self.valid, self.slots)
+        return self._fixed_point
+
+    def __reduce__(self):
+        # 명령 목록과 최적화/고정소수점으로 바꾼 프로그램은 저장하지 않는다 (처음 실행할 때 다시 만든다)
+        # 슬롯 표도 저장하지 않고, 불러올 때 새 표를 켜 두고 구문들이 번호를 다시 받는다 (_load_or_compile_program)
+        return (CompiledProgram, (self.blocks, self.error, self.valid))
+
+
+def compile_program(lines, compile_line=decode_line):
+    """(줄 번호, 줄) 목록을 타입별 구문까지 넣은 CompiledProgram 으로 해석합니다. 해석 오류는 실행할 때 그 자리에서 납니다."""
+    lines = iter(lines)
+    first = next(lines, None)
+    if first is None or not first[1].strip().startswith('학범'):
+        return CompiledProgram([], valid=False)
+    blocks = []
+    error = None
+    # 프로그램마다 새 슬롯 표에서 변수 번호를 받는다
+    slots = SlotTable()
+    with slots.active():
+        try:
+            for block in specialize_blocks(ProgramParser(itertools.chain([first], lines), compile_line).iter_program()):
+                blocks.append(block)
+        except Exception as e:
+            error = e
+    return CompiledProgram(blocks, error, slots=slots)
+
+
+_PROGRAM_CACHE = OrderedDict()
+
+
+def load_program(code, compile_line=decode_line):
+    """소스의 해시로 캐시된 CompiledProgram 을 돌려줍니다. 없으면 해석해서 캐시에 넣습니다 (LRU)."""
+    key = hashlib.sha256(code.encode('utf-8')).digest()
+    program = _PROGRAM_CACHE.get(key)
+    if program is not None:
+        _PROGRAM_CACHE.move_to_end(key)
+        return program
+    program = _PROGRAM_CACHE[key] = compile_program(source_lines(code), compile_line)
+    if len(_PROGRAM_CACHE) > PROGRAM_CACHE_SIZE:
+        _PROGRAM_CACHE.popitem(last=False)
+    return program
+
+
+# 디스크 캐시 (__pycache__ 와 비슷하게 해석한 .lhb 프로그램을 pickle 로 저장)
+PROGRAM_CACHE_DIRNAME = '__lhbcache__'
+
+_CACHE_TAG = []
+
+
+def program_cache_tag():
+    """캐시를 만든 인터프리터와 파이썬을 가리는 표식. interpreter.py 가 바뀌면 달라지므로 예전 캐시는 쓰지 않습니다."""
+    if not _CACHE_TAG:
+        with open(__file__, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:16]
+        _CACHE_TAG.append(f"{sys.implementation.cache_tag}-{digest}")
+    return _CACHE_TAG[0]
+
+
+def program_cache_path(filepath, cache_dir=None):
+    """filepath 의 캐시 파일 경로. cache_dir 가 없으면 소스 옆의 __lhbcache__ 디렉터리를 씁니다."""
+    filepath = os.path.abspath(filepath)
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(filepath), PROGRAM_CACHE_DIRNAME)
+    # 여러 디렉터리의 파일을 한 캐시 디렉터리에 모아도 겹치지 않도록 전체 경로의 해시를 붙인다
+    digest = hashlib.sha256(filepath.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{os.path.basename(filepath)}.{digest}.pickle")
+
+
+def load_cached_program(filepath, cache_dir=None, compile_line=decode_line):
+    """
+    filepath 를 해석한 CompiledProgram 을 돌려줍니다.
+    캐시의 표식, 파일 수정 시각, 크기가 모두 같으면 캐시를 읽고, 아니면 파일을 해석해서 캐시에 씁니다.
+    캐시를 읽거나 쓸 수 없으면 조용히 해석만 합니다.
+    """
+    # 큰 프로그램은 객체가 아주 많아서, 해석하거나 읽는 동안 순환 GC 가 거듭 돌며 시간이 몇 배로 늘어난다.
+    # 이 사이에 만드는 객체에는 순환 쓰레기가 없으므로 잠시 GC 를 멈춘다
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _load_or_compile_program(filepath, cache_dir, compile_line)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def _load_or_compile_program(filepath, cache_dir, compile_line):
+    stat = os.stat(filepath)
+    key = (program_cache_tag(), stat.st_mtime_ns, stat.st_size)
+    cache_path = program_cache_path(filepath, cache_dir)
+    try:
+        with open(cache_path, 'rb') as f:
+            # 키를 먼저 읽어서 맞지 않으면 프로그램은 읽지 않는다
+            if pickle.load(f) == key:
+                slots = SlotTable()
+                with slots.active():
+                    program = pickle.load(f)
+                program.slots = slots
+                return program
+    except Exception:
+        pass
+
+    with open(filepath, 'r', encoding='utf-8', newline='\n') as f:
+        program = compile_program(iter_source_lines(f), compile_line)
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(temp_path, 'wb') as f:
+            pickle.dump(key, f, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(program, f, pickle.HIGHEST_PROTOCOL)
+        # 다른 프로세스가 같은 캐시를 읽고 있어도 반쯤 쓴 파일을 보지 않도록 바꿔치기한다
+        os.replace(temp_path, cache_path)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+    return program
+
+
+class RunResult:
+    """run_source 의 결과. stdout 은 모은 출력, variables 는 끝났을 때의 최상위 변수, error 는 멈춘 오류(없으면 None)입니다."""
+    __slots__ = ('stdout', 'variables', 'error')
+
+    def __init__(self, stdout, variables, error=None):
+        self.stdout = stdout
+        self.variables = variables
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        return f"RunResult(ok={self.ok}, stdout={self.stdout!r}, error={self.error!r})"
+
+
+# execute_block 이 바깥 블록에 알리는 흐름 제어
+FLOW_BREAK = 'break'
+FLOW_RETURN = 'return'
+
+# 일반 구문이 아니라 execute_item 에서 따로 처리하는 블록 항목
+CONTROL_ITEM_TYPES = frozenset((IfChainNode, ForNode, WhileNode, FunctionNode, BreakStatement, ReturnStatement))
+
+
+# ---- 실행 훅 ----
+# add_hook 으로 콜백을 등록하면 해당 사건을 알리는 실행 경로로 바뀝니다.
+# 등록된 훅이 없으면 기본 경로를 그대로 쓰므로 훅 때문에 느려지지 않습니다.
+#   'line'   : callback(interp, lineno, item)        블록 항목을 실행하기 직전
+#   'call'   : callback(interp, func_name, args)     함수 본문을 실행하기 직전
+#   'return' : callback(interp, func_name, value)    함수가 끝난 직후 (value 는 반환값)
+#   'loop'   : callback(interp, lineno, iteration)   반복문 본문을 실행하기 직전 (iteration 은 1부터)
+#   'write'  : callback(interp, name, value)         변수에 값을 쓴 직후
+
+HOOK_EVENTS = ('line', 'call', 'return', 'loop', 'write')
+
+
+class WatchedSlots(list):
+    """'write' 훅이 있을 때 쓰는 변수 값 목록. 값을 쓸 때마다 변수 이름과 함께 훅을 부릅니다."""
+    __slots__ = ('interp',)
+
+    def __init__(self, interp, values=()):
+        super().__init__(values)
+        self.interp = interp
+
+    def __setitem__(self, slot, value):
+        list.__setitem__(self, slot, value)
+        for callback in self.interp.hooks['write']:
+            callback(self.interp, self.interp.slot_table.names[slot], value)
+
+
+# ---- 실행 한도 ----
+
+class HaklangError(Exception):
+    """학랭 프로그램 실행을 멈추는 오류. 메시지는 사용자에게 그대로 보여 줄 문장입니다."""
+
+
+class ExecutionLimitError(HaklangError):
+    """실행 한도(반복 횟수, 실행 단계, 실행 시간)를 넘었을 때 납니다."""
+
+
+class LoopLimitError(ExecutionLimitError):
+    pass
+
+
+class StepLimitError(ExecutionLimitError):
+    pass
+
+
+class DeadlineExceededError(ExecutionLimitError):
+    pass
+
+
+class Governor:
+    """
+    실행 한도를 관리합니다. None 인 한도는 검사하지 않습니다.
+
+    - max_loop_iterations: 반복문 하나가 한 번 실행될 때 돌 수 있는 최대 횟수
+    - max_steps: 프로그램 전체의 실행 단계 예산. 반복 한 바퀴는 본문의 항목 수 + 1, 함수 호출은 1 단계로 셉니다.
+    - timeout: 실행 시간 한도 (초). 시계는 GOVERNOR_CHECK_INTERVAL 단계마다 확인합니다.
+
+    실행기는 steps 를 더한 뒤 next_check 에 닿았을 때만 check() 를 부르므로, 한도가 없으면 비교 한 번으로 끝납니다.
+    """
+
+    def __init__(self, max_steps=None, timeout=None, max_loop_iterations=MAX_LOOP_ITERATIONS):
+        self.max_steps = max_steps
+        self.timeout = timeout
+        self.max_loop_iterations = max_loop_iterations
+        self.loop_limit = max_loop_iterations if max_loop_iterations is not None else float('inf')
+        self.steps = 0
+        self.deadline = None
+        self.next_check = float('inf')
+
+    def start(self):
+        """프로그램 실행을 시작할 때 단계 수와 마감 시각을 새로 잡습니다."""
+        self.steps = 0
+        self.deadline = time.monotonic() + self.timeout if self.timeout is not None else None
+        self.next_check = self._next_check()
+
+    def charge(self, steps):
+        self.steps += steps
+        if self.steps >= self.next_check:
+            self.check()
+
+    def check(self):
+        if self.max_steps is not None and self.steps >= self.max_steps:
+            raise StepLimitError(f"오류: 실행 단계 한도({self.max_steps})를 넘었습니다.")
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise DeadlineExceededError(f"오류: 실행 시간 한도({self.timeout}초)를 넘었습니다.")
+        self.next_check = self._next_check()
+
+    def sleep_time(self, seconds):
+        """
+        seconds 동안 자려 할 때 실제로 잘 시간과, 자고 나면 마감 시각에 걸리는지를 돌려줍니다.
+        실행 시간 한도를 넘겨 자지 않고 마감 시각에 깨어나 check() 로 멈추게 합니다.
+        """
+        if self.deadline is None:
+            return seconds, False
+        remaining = self.deadline - time.monotonic()
+        if seconds < remaining:
+            return seconds, False
+        return max(remaining, 0), True
+
+    def _next_check(self):
+        limit = self.steps + GOVERNOR_CHECK_INTERVAL if self.deadline is not None else float('inf')
+        if self.max_steps is not None:
+            limit = min(limit, self.max_steps)
+        return limit
+
+
+class OutputBuffer:
+    """
+    인터프리터가 쓰는 출력 버퍼입니다. 출력을 모아 두었다가 UTF-8 로 인코딩해 sys.stdout.buffer 에 한 번에 씁니다.
+
+    flush_policy:
+    - 'size': 모인 글자 수가 buffer_size 를 넘을 때 비웁니다.
+    - 'line': 줄바꿈이 들어올 때마다 비웁니다. (터미널에 출력할 때의 기본값)
+    - 'always': 출력할 때마다 바로 비웁니다.
+    입력을 받기 전과 프로그램이 끝날 때는 정책과 상관없이 비웁니다.
+    """
+
+    def __init__(self, stream=None, buffer_size=OUTPUT_BUFFER_SIZE, flush_policy=None):
+        if flush_policy is None:
+            target = stream if stream is not None else sys.stdout
+            isatty = getattr(target, 'isatty', None)
+            flush_policy = 'line' if isatty is not None and isatty() else 'size'
+        if flush_policy not in FLUSH_POLICIES:
+            raise ValueError(f"알 수 없는 출력 정책입니다: {flush_policy}")
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self.flush_policy = flush_policy
+        self.pending = []
+        self.pending_size = 0
+
+    def write(self, text):
+        self.pending.append(text)
+        self.pending_size += len(text)
+        policy = self.flush_policy
+        if policy == 'size':
+            if self.pending_size >= self.buffer_size:
+                self.flush()
+        elif policy == 'always' or '\n' in text:
+            self.flush()
+
+    def write_line(self, text=''):
+        self.write(f"{text}\n")
+
+    def flush(self):
+        if not self.pending:
+            return
+        text = ''.join(self.pending)
+        self.pending = []
+        self.pending_size = 0
+        # sys.stdout 이 나중에 바뀔 수 있으므로 비울 때마다 대상을 다시 찾는다
+        stream = self.stream if self.stream is not None else sys.stdout
+        raw = getattr(stream, 'buffer', None)
+        if raw is None:
+            stream.write(text)
+            stream.flush()
+            return
+        # print() 로 이미 쓴 내용이 있으면 순서가 바뀌지 않도록 먼저 내보낸다
+        stream.flush()
+        raw.write(text.encode('utf-8'))
+        raw.flush()
+
+
+class InputReader:
+    """
+    쿰척< 입력 구문이 쓰는 입력 읽기 도구입니다.
+
+    mode:
+    - 'line': 줄마다 input() 을 부릅니다. (터미널에서 입력할 때의 기본값)
+    - 'bulk': 표준 입력을 INPUT_CHUNK_SIZE 바이트씩 읽어 줄 단위로 나눠 두고 하나씩 돌려줍니다.
+      파이프나 파일로 입력을 넣을 때의 기본값입니다.
+    입력이 끝나면 두 방식 모두 input() 과 같은 EOFError 를 냅니다.
+    """
+
+    def __init__(self, stream=None, mode=None, chunk_size=INPUT_CHUNK_SIZE):
+        if mode is not None and mode not in INPUT_MODES:
+            raise ValueError(f"알 수 없는 입력 방식입니다: {mode}")
+        self.stream = stream
+        self.mode = mode
+        self.chunk_size = chunk_size
+        self.lines = deque()
+        self.partial = ''
+        self.decoder = None
+        self.eof = False
+
+    @property
+    def interactive(self):
+        return self.resolve_mode() == 'line'
+
+    def resolve_mode(self):
+        # sys.stdin 이 실행 중에 바뀔 수 있으므로 처음 읽을 때 방식을 정한다
+        if self.mode is None:
+            stream = self.stream if self.stream is not None else sys.stdin
+            isatty = getattr(stream, 'isatty', None)
+            self.mode = 'line' if isatty is not None and isatty() else 'bulk'
+        return self.mode
+
+    def readline(self):
+        if self.resolve_mode() == 'line':
+            if self.stream is None:
+                return input()
+            line = self.stream.readline()
+            if not line:
+                raise EOFError("EOF when reading a line")
+            return line[:-1] if line.endswith('\n') else line
+        lines = self.lines
+        while not lines:
+            if self.eof:
+                raise EOFError("EOF when reading a line")
+            self.fill()
+        return lines.popleft()
+
+    def fill(self):
+        stream = self.stream if self.stream is not None else sys.stdin
+        raw = getattr(stream, 'buffer', None)
+        if raw is not None:
+            if self.decoder is None:
+                self.decoder = codecs.getincrementaldecoder('utf-8')()
+            chunk = raw.read(self.chunk_size)
+            text = self.decoder.decode(chunk, final=not chunk)
+        else:
+            chunk = text = stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            # 마지막 줄에 줄바꿈이 없어도 한 줄로 돌려준다
+            if self.partial:
+                self.lines.append(self.partial.rstrip('\r'))
+                self.partial = ''
+            return
+        parts = (self.partial + text).split('\n')
+        self.partial = parts.pop()
+        # input() 처럼 줄 끝의 \r\n 도 떼어 낸다
+        self.lines.extend(line[:-1] if line.endswith('\r') else line for line in parts)
 
 
 class HaklangInterpreterGPT:
@@ -25,948 +3116,1494 @@ class HaklangInterpreterGPT:
     - 표현식에서 "… 남자 중의 남자 …": 두 숫자 중 큰 값을 반환합니다.
     """
 
-    def __init__(self):
-        # 기존 인터프리터와 동일한 상태 변수들
-        self.variables = {}
-        self.variable_types = {}
-        self.functions = {}
-        self.protected_vars = set()
-        self.in_block = False
-        self.block_buffer = []
-        self.block_type = None
-        self.block_context = {}
-        self.if_blocks = []
-        self.if_condition_met = False
-        self.break_flag = False
-        self.return_value = None
+    def __init__(self, buffer_size=OUTPUT_BUFFER_SIZE, flush_policy=None, input_mode=None,
+                 max_steps=None, timeout=None, max_loop_iterations=MAX_LOOP_ITERATIONS,
+                 program_cache=False, cache_dir=None, optimize=False, fixed_point=False):
+        # 실행하기 전에 블록 트리를 최적화할지 (optimize_blocks)
+        self.optimize = optimize
+        # float7 / float15 변수를 고정소수점 정수로 계산할지 (fixed_point_blocks)
+        self.fixed_point = fixed_point
+        # execute_file 이 해석한 프로그램을 디스크에 캐시할지와 캐시 디렉터리 (None 이면 소스 옆 __lhbcache__)
+        self.program_cache = program_cache
+        self.cache_dir = cache_dir
+
+        # 출력은 print() 대신 이 버퍼에 모아서 한 번에 쓴다
+        self.output = OutputBuffer(buffer_size=buffer_size, flush_policy=flush_policy)
+        # 입력은 파이프로 들어오면 큰 단위로 읽어 둔 뒤 한 줄씩 꺼낸다
+        self.input = InputReader(mode=input_mode)
+        # 반복 횟수, 실행 단계, 실행 시간 한도. 넘으면 ExecutionLimitError 가 난다
+        self.governor = Governor(max_steps=max_steps, timeout=timeout, max_loop_iterations=max_loop_iterations)
+        # 사건별 훅 콜백 목록 (add_hook / remove_hook 으로만 바꾼다)
+        self.hooks = {event: [] for event in HOOK_EVENTS}
+        self.reset()
+
+    def reset(self):
+        """
+        프로그램 상태(변수, 함수, 스택, 지연 호출)를 처음으로 되돌립니다.
+        설정과 훅은 그대로 두므로 인스턴스를 새로 만들지 않고 다음 프로그램을 실행할 수 있습니다.
+        변수 슬롯 표(와 표에 딸린 구문 캐시)는 새로 만들어 앞 프로그램의 변수 이름이 쌓이지 않게 합니다.
+        """
+        # 변수는 슬롯 번호 자리에 값과 타입을 나란히 둔다 (정의되지 않은 자리는 0 / None)
+        self.slot_table = SlotTable()
+        self.slot_values = []
+        self.slot_types = []
+        self.functions = {}
+        self.protected_vars = set()
+        self.break_flag = False
+        self.return_value = None
+        self.return_flag = False
+
+        # GPT 확장용 추가 상태
+        self.stack = []              # 아빠와 나 스택
+        self.deferred_calls = []     # 지연 함수 호출 리스트
+
+        # 'write' 훅이 있으면 새 변수 값 목록도 지켜본다
+        self.select_execution_path()
+
+    @property
+    def variables(self):
+        """지금 보이는 정의된 변수의 {이름: 값} 사본"""
+        names = self.slot_table.names
+        return {names[slot]: value for slot, (value, var_type) in enumerate(zip(self.slot_values, self.slot_types))
+                if var_type is not None}
+
+    @property
+    def variable_types(self):
+        """지금 보이는 정의된 변수의 {이름: 타입} 사본"""
+        names = self.slot_table.names
+        return {names[slot]: var_type for slot, var_type in enumerate(self.slot_types) if var_type is not None}
+
+    def ensure_slots(self):
+        """슬롯 표에 새로 들어온 변수 이름의 자리를 늘립니다. 새로 해석한 코드를 실행하기 전에 부릅니다."""
+        missing = len(self.slot_table.names) - len(self.slot_types)
+        if missing > 0:
+            self.slot_values.extend([0] * missing)
+            self.slot_types.extend([None] * missing)
+
+    def defined_slot(self, name):
+        """실행 중에 이름으로 변수를 찾을 때 씁니다. 정의된 변수의 슬롯 번호, 없으면 None"""
+        slot = self.slot_table.index.get(name)
+        if slot is None or slot >= len(self.slot_types) or self.slot_types[slot] is None:
+            return None
+        return slot
+
+    def use_slot_table(self, table):
+        """
+        table 의 슬롯 번호로 해석한 프로그램을 실행할 수 있게 값/타입 목록을 바꿉니다.
+        지금 정의된 변수는 이름으로 새 자리에 옮깁니다 (reset 한 뒤라면 옮길 것이 없습니다).
+        """
+        if table is self.slot_table:
+            return
+        names = self.slot_table.names
+        defined = [(names[slot], value, var_type)
+                   for slot, (value, var_type) in enumerate(zip(self.slot_values, self.slot_types)) if var_type is not None]
+        self.slot_table = table
+        self.slot_values = []
+        self.slot_types = []
+        slots = [table.slot_of(name) for name, _, _ in defined]
+        self.ensure_slots()
+        for slot, (_, value, var_type) in zip(slots, defined):
+            self.slot_values[slot] = value
+            self.slot_types[slot] = var_type
+        self.select_execution_path()
+
+    def value_of(self, name):
+        """이름으로 변수 값을 찾습니다. 정의되지 않았으면 0"""
+        slot = self.defined_slot(name)
+        return 0 if slot is None else self.slot_values[slot]
+
+    def execute_file(self, filepath, raise_errors=False):
+        """
+        파일을 실행합니다. 파일을 찾지 못하거나 인터프리터 자체에서 난 오류는 메시지를 출력하고 넘어가며,
+        raise_errors 가 참이면 메시지를 출력한 뒤 예외를 다시 냅니다 (일괄 실행이 상태를 가를 때 씀).
+        """
+        try:
+            if self.program_cache:
+                self.run_program(load_cached_program(filepath, self.cache_dir, self.compile_line))
+            else:
+                # 파일은 한 줄씩 읽으며 실행한다 (전체를 메모리에 올리지 않음)
+                with open(filepath, 'r', encoding='utf-8', newline='\n') as f:
+                    self.run_lines(iter_source_lines(f))
+        except FileNotFoundError:
+            self.output.write_line(f"오류: 파일을 찾을 수 없습니다: {filepath}")
+            if raise_errors:
+                raise
+        except HaklangError:
+            raise
+        except Exception as e:
+            self.output.write_line(f"오류 발생: {error_message(e)}")
+            if raise_errors:
+                raise
+        finally:
+            # 프로그램이 오류로 멈춰도 남은 출력을 내보낸다
+            self.output.flush()
+
+    def run(self, code):
+        self.run_lines(source_lines(code))
+
+    def run_source(self, code, stdin=None):
+        """
+        code 를 처음 상태에서 실행하고 RunResult 를 돌려줍니다.
+        출력은 화면에 쓰지 않고 모으며, 프로그램이 오류로 멈춰도 예외를 내지 않고 RunResult.error 에 담습니다.
+        stdin 은 문자열이나 파일 객체입니다. 해석한 프로그램은 load_program 의 캐시에서 다시 씁니다.
+        """
+        self.reset()
+        stdout = io.StringIO()
+        saved = (self.output, self.input)
+        self.output = OutputBuffer(stream=stdout, buffer_size=saved[0].buffer_size, flush_policy='size')
+        if stdin is None or isinstance(stdin, str):
+            stdin = io.StringIO(stdin or '')
+        self.input = InputReader(stream=stdin, mode='bulk')
+        error = None
+        try:
+            self.run_program(load_program(code, self.compile_line))
+        except HaklangError as e:
+            error = e
+            self.report_error(e)
+        except Exception as e:
+            # execute_file 과 같은 메시지를 남긴다
+            error = e
+            self.output.write_line(f"오류 발생: {error_message(e)}")
+        finally:
+            self.output.flush()
+            self.output, self.input = saved
+        return RunResult(stdout.getvalue(), self.variables, error)
+
+    def run_lines(self, lines):
+        """(줄 번호, 줄) 을 차례로 받아 프로그램을 실행합니다. lines 는 한 번만 훑으므로 파일을 그대로 넘겨도 됩니다."""
+        lines = iter(lines)
+        first = next(lines, None)
+
+        # 프로그램 시작 체크
+        if first is None or not first[1].strip().startswith('학범'):
+            self.output.write_line(HEADER_ERROR)
+            return
+        self.run_main(self.execute_lines, itertools.chain([first], lines))
+
+    def run_program(self, program):
+        """compile_program 으로 미리 해석해 둔 프로그램을 실행합니다. 결과는 run_lines 와 같습니다."""
+        if not program.valid:
+            self.output.write_line(HEADER_ERROR)
+            return
+        self.use_slot_table(program.slots)
+        if self.optimize:
+            program = program.optimized()
+        if self.fixed_point:
+            program = program.fixed_point()
+        self.run_main(self.execute_program, program)
+
+    def run_main(self, execute, source):
+        """execute(source) 로 본 프로그램을 실행하고, 이어서 지연 함수 호출을 실행합니다."""
+        self.governor.start()
+        try:
+            # 실행하면서 해석하는 구문과 명령 목록도 이 인터프리터의 슬롯 표로 번호를 받는다
+            with self.slot_table.active():
+                execute(source)
+
+                # 프로그램 종료 후 지연 함수 호출 실행
+                for func_name, args in self.deferred_calls:
+                    try:
+                        self.call_function(func_name, args)
+                    except HaklangError:
+                        raise
+                    except Exception as e:
+                        self.output.write_line(f"오류: 지연 함수 '{func_name}' 호출 중 오류: {error_message(e)}")
+        finally:
+            self.output.flush()
+
+    def execute_lines(self, lines):
+        """최상위 항목(구문 하나 또는 블록 하나)을 읽는 대로 블록 트리로 만들어 실행합니다. 열린 블록만 메모리에 둡니다."""
+        blocks = specialize_blocks(ProgramParser(lines, self.compile_line).iter_program())
+        if self.optimize:
+            blocks = optimize_blocks(blocks)
+        if self.fixed_point:
+            blocks = fixed_point_blocks(blocks)
+        for block in blocks:
+            # 방금 해석한 항목에 처음 나온 변수의 자리를 마련한다
+            self.ensure_slots()
+            self.execute_top_level(block)
+
+    def execute_program(self, program):
+        self.ensure_slots()
+        for block in program.blocks:
+            self.execute_top_level(block)
+        if program.error is not None:
+            # 줄을 읽으며 실행할 때처럼 해석 오류는 앞의 항목을 다 실행한 뒤에 낸다
+            raise program.error.with_traceback(None)
+
+    def execute_top_level(self, block):
+        try:
+            self.execute_block(block, top_level=True)
+        except HaklangError:
+            raise
+        except Exception as e:
+            self.fail(f"오류 (Line {block.lines[0]}): {error_message(e)}")
+
+    def process_line(self, line):
+        """
+        한 줄의 코드를 해석하고 실행합니다.
+        줄마다 해석 결과(구문 객체)를 캐시해 두므로 같은 줄은 한 번만 해석됩니다.
+        """
+        with self.slot_table.active():
+            stmt = self.compile_line(line)
+            self.ensure_slots()
+            return stmt.execute(self)
+
+    def compile_line(self, line):
+        # 구문에는 슬롯 번호가 들어 있으므로 지금 해석하는 프로그램의 슬롯 표에 캐시한다
+        cache = _ACTIVE_SLOTS.get().statements
+        stmt = cache.get(line)
+        if stmt is None:
+            if len(cache) >= COMPILE_CACHE_LIMIT:
+                cache.clear()
+            stmt = cache[line] = decode_line(line)
+        return stmt
+
+    def read_line(self):
+        # 사람이 입력하는 경우에는 안내 문구가 먼저 보이도록 출력 버퍼를 비운다
+        if self.input.interactive:
+            self.output.flush()
+        return self.input.readline()
+
+    def fail(self, message):
+        # 프로세스를 끝내지 않고 예외로 멈춘다. 메시지는 실행한 쪽이 report_error 로 출력 뒤에 이어 쓴다
+        raise HaklangError(message)
+
+    def report_error(self, error):
+        """멈춘 프로그램의 오류 메시지를 앞선 출력 뒤에 쓰고 버퍼를 비웁니다."""
+        self.output.write_line(str(error))
+        self.output.flush()
+
+    def assign_random_value(self, slot):
+        var_type = self.slot_types[slot]
+        if var_type == 'int':
+            self.slot_values[slot] = random.randint(-1000, 1000)
+        elif var_type == 'float7' or var_type == 'float15':
+            self.slot_values[slot] = random.uniform(-1000.0, 1000.0)
+        elif var_type == 'str':
+            words = ['학범', '비만', '하악', '귤', '쿰척', '쑤학']
+            self.slot_values[slot] = random.choice(words)
+        elif var_type.startswith('list_'):
+            size = random.randint(3, 5)
+            if var_type == 'list_int':
+                self.slot_values[slot] = make_list(var_type, [random.randint(-100, 100) for _ in range(size)])
+            elif var_type in ('list_float7', 'list_float15'):
+                self.slot_values[slot] = make_list(var_type, [random.uniform(-100.0, 100.0) for _ in range(size)])
+            elif var_type == 'list_str':
+                words = ['학범', '비만', '하악', '귤', '쿰척']
+                self.slot_values[slot] = [random.choice(words) for _ in range(size)]
+
+    def call_function(self, func_name, args):
+        if func_name not in self.functions:
+            self.fail(f"오류: 정의되지 않은 함수 '{func_name}'")
+        params, body, frame_slots = self.functions[func_name]
+        if len(args) != len(params):
+            self.fail(f"오류: 함수 '{func_name}'는 {len(params)}개의 매개변수가 필요하지만 {len(args)}개가 전달되었습니다.")
+        self.governor.charge(1)
+        # 새 호출 프레임에서 본문 실행
+        saved = self.enter_frame(frame_slots, params, args)
         self.return_flag = False
+        self.return_value = None
+        try:
+            self.execute_function_body(body)
+            result = self.return_value
+        finally:
+            self.leave_frame(saved)
+            self.return_flag = False
+            self.return_value = None
+        return result
 
-        # GPT 확장용 추가 상태
-        self.stack = []              # 아빠와 나 스택
-        self.deferred_calls = []     # 지연 함수 호출 리스트
-        self.double_exec_flag = False  # 다음 라인을 두 번 실행하는 플래그
+    def execute_function_body(self, body):
+        self.execute_block(body, in_function=True, top_level=True)
 
-    def execute_file(self, filepath):
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                code = f.read()
-            self.run(code)
-        except FileNotFoundError:
-            print(f"오류: 파일을 찾을 수 없습니다: {filepath}")
-        except Exception as e:
-            print(f"오류 발생: {e}")
+    def enter_frame(self, frame_slots, param_slots, args):
+        """
+        함수 호출 프레임을 만들고 매개변수를 넣습니다. leave_frame 에 넘길 이전 상태를 돌려줍니다.
+        값/타입 목록은 호출한 쪽과 같이 쓰므로 본문은 바깥 변수를 그대로 읽습니다. 본문이 쓸 수 있는 자리(frame_slots)의
+        이전 값만 저장해 두었다가 함수가 끝나면 되돌리므로, 본문에서 쓴 값은 기존처럼 버려집니다.
+        frame_slots 가 None 이면 모든 자리를 저장합니다.
+        """
+        values = self.slot_values
+        types = self.slot_types
+        if frame_slots is None:
+            frame_slots = range(len(types))
+        saved = [(slot, values[slot], types[slot]) for slot in frame_slots]
+        self.bind_parameters(param_slots, args)
+        return saved
 
-    def run(self, code):
-        lines = code.strip().split('\n')
-        if not lines:
+    def leave_frame(self, saved):
+        values = self.slot_values
+        types = self.slot_types
+        if type(values) is not list:
+            # 되돌리는 값은 프로그램이 쓴 값이 아니므로 'write' 훅을 부르지 않는다
+            store = list.__setitem__
+            for slot, value, var_type in saved:
+                store(values, slot, value)
+                types[slot] = var_type
             return
+        for slot, value, var_type in saved:
+            values[slot] = value
+            types[slot] = var_type
 
-        # 프로그램 시작 체크
-        if not lines[0].strip().startswith('학범'):
-            print("오류: 프로그램은 '학범'으로 시작해야 합니다.")
-            return
+    def bind_parameters(self, param_slots, args):
+        for slot, arg in zip(param_slots, args):
+            var_type = value_type(arg)
+            if var_type is not None:
+                self.slot_types[slot] = var_type
+                self.slot_values[slot] = arg
 
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-            if not line or line == '학범':
-                i += 1
-                continue
+    def execute_block(self, block, in_loop=False, in_function=False, top_level=False):
+        """
+        블록 트리를 실행합니다. 분기와 반복은 노드에 이미 나뉘어 있으므로 본문을 다시 훑지 않습니다.
+        반복문 안의 몸무게0.1톤 은 FLOW_BREAK, 함수 안의 꺼억 은 FLOW_RETURN 을 돌려주어 바깥 블록이 바로 빠져나갑니다.
+        top_level 은 함수 본문이나 프로그램의 가장 바깥 블록이라는 뜻입니다 (오류 메시지가 달라짐).
+        """
+        for item, lineno in zip(block.items, block.lines):
+            # 대부분의 항목은 일반 구문이므로 바로 실행하고, 나머지는 execute_item 에 맡긴다
+            if type(item) in CONTROL_ITEM_TYPES:
+                flow = self.execute_item(item, lineno, in_loop, in_function, top_level)
+                if flow is not None:
+                    return flow
+            elif not item.execute(self):
+                self.unknown_item(item, lineno, in_function, top_level)
+        return None
 
-            try:
-                # 블록 안에 있는지 확인
-                if self.in_block:
-                    # 블록 시작 구분자 처리
-                    if len(self.block_buffer) == 0 and line == '학':
-                        i += 1
-                        continue
-
-                    # 블록 종료 조건 확인
-                    is_block_end = False
-                    if self.block_type == 'while' and line == '귤한봉지':
-                        is_block_end = True
-                    elif self.block_type in ['for', 'function', 'if', 'elseif', 'else'] and line == '학':
-                        is_block_end = True
-                    elif line in ['}귤한봉지', '}그챼']:
-                        is_block_end = True
-
-                    if is_block_end:
-                        result = self.execute_block()
-                        self.in_block = False
-                        self.block_buffer = []
-                        self.block_type = None
-                        self.block_context = {}
-                    else:
-                        self.block_buffer.append(line)
-                    i += 1
-                    continue
+    def execute_item(self, item, lineno, in_loop, in_function, top_level):
+        """블록 항목 하나를 실행합니다. 흐름 제어가 필요하면 FLOW_BREAK / FLOW_RETURN 을 돌려줍니다."""
+        kind = type(item)
+        if kind is IfChainNode:
+            body = item.else_body
+            for cond, branch in item.branches:
+                if cond.evaluate(self):
+                    body = branch
+                    break
+            if body is not None:
+                return self.execute_block(body, in_loop, in_function)
+        elif kind is ForNode or kind is WhileNode:
+            return self.execute_loop(item, in_function)
+        elif kind is FunctionNode:
+            self.functions[item.name] = (item.param_slots, item.body, item.frame_slots)
+        elif kind is BreakStatement and in_loop:
+            return FLOW_BREAK
+        elif kind is ReturnStatement and in_function:
+            item.execute(self)
+            return FLOW_RETURN
+        elif not item.execute(self):
+            self.unknown_item(item, lineno, in_function, top_level)
+        return None
 
-                # 쿰쳑쿰쳑 구문: 다음 구문을 두 번 실행
-                if line.startswith('쿰쳑쿰쳑'):
-                    inner = line[len('쿰쳑쿰쳑'):].strip()
-                    if inner:
-                        # 한 줄 안에 구문을 바로 실행
-                        for _ in range(2):
-                            if not self.process_line(inner):
-                                print(f"오류: 알 수 없는 구문입니다: {inner}")
-                                sys.exit(1)
-                    else:
-                        # 별도의 라인을 두 번 실행할 플래그 설정
-                        self.double_exec_flag = True
-                    i += 1
-                    continue
+    def unknown_item(self, item, lineno, in_function, top_level):
+        if top_level and not in_function:
+            self.fail(f"오류 (Line {lineno}): 알 수 없는 구문입니다: {item.source}")
+        if top_level:
+            self.fail(f"오류: 함수 본문 오류: {item.source}")
+        self.fail(f"오류: 본문 오류: {item.source}")
 
-                # 주석: 저 쿰쳑 안먹었는데요 로 시작하는 줄 무시
-                if line.startswith('저 쿰쳑 안먹었는데요'):
-                    i += 1
-                    continue
+    def add_hook(self, event, callback):
+        """
+        실행 사건(HOOK_EVENTS)에 콜백을 등록하고 콜백을 그대로 돌려줍니다.
+        변수 쓰기('write')는 최상위 변수 사전을 바꿔 끼우는 방식이므로 실행 전에 등록하세요.
+        """
+        if event not in self.hooks:
+            raise ValueError(f"알 수 없는 훅 사건입니다: {event}")
+        self.hooks[event].append(callback)
+        self.select_execution_path()
+        return callback
 
-                # double_exec_flag 가 설정되어 있으면 해당 라인을 두 번 실행
-                if self.double_exec_flag:
-                    # 두 번 실행 후 플래그 해제
-                    for _ in range(2):
-                        if not self.process_line(line):
-                            print(f"오류: 알 수 없는 구문입니다: {line}")
-                            sys.exit(1)
-                    self.double_exec_flag = False
-                    i += 1
-                    continue
+    def remove_hook(self, event, callback):
+        if event not in self.hooks:
+            raise ValueError(f"알 수 없는 훅 사건입니다: {event}")
+        self.hooks[event].remove(callback)
+        self.select_execution_path()
 
-                # 일반적인 라인 처리
-                if not self.process_line(line):
-                    print(f"오류 (Line {i+1}): 알 수 없는 구문입니다: {line}")
-                    sys.exit(1)
-            except Exception as e:
-                print(f"오류 (Line {i+1}): {e}")
-                sys.exit(1)
+    def select_execution_path(self):
+        """
+        등록된 훅에 맞는 실행 경로를 고릅니다. 필요한 메서드만 인스턴스 속성으로 훅을 부르는 판으로 덮어쓰고,
+        훅이 빠지면 덮어쓴 것을 지워 클래스의 기본 메서드로 돌아갑니다.
+        """
+        hooks = self.hooks
+        traced_paths = (
+            ('execute_block', self.traced_execute_block, hooks['line']),
+            ('execute_loop', self.traced_execute_loop, hooks['loop']),
+            ('call_function', self.traced_call_function, hooks['call'] or hooks['return']),
+        )
+        for name, traced, enabled in traced_paths:
+            if enabled:
+                setattr(self, name, traced)
+            else:
+                self.__dict__.pop(name, None)
+        if hooks['write'] and type(self.slot_values) is list:
+            self.slot_values = WatchedSlots(self, self.slot_values)
+        elif not hooks['write'] and type(self.slot_values) is WatchedSlots:
+            self.slot_values = list(self.slot_values)
 
-            i += 1
+    def traced_execute_block(self, block, in_loop=False, in_function=False, top_level=False):
+        """execute_block 과 같지만 항목마다 'line' 훅을 부릅니다. 항목은 하위 클래스(프로파일러 등)의 execute_item 으로 실행합니다."""
+        line_hooks = self.hooks['line']
+        for item, lineno in zip(block.items, block.lines):
+            for callback in line_hooks:
+                callback(self, lineno, item)
+            flow = self.execute_item(item, lineno, in_loop, in_function, top_level)
+            if flow is not None:
+                return flow
+        return None
 
-        # 프로그램 종료 후 지연 함수 호출 실행
-        for func_name, args in self.deferred_calls:
-            try:
-                self.call_function(func_name, args)
-            except Exception as e:
-                print(f"오류: 지연 함수 '{func_name}' 호출 중 오류: {e}")
+    def traced_execute_loop(self, node, in_function):
+        """execute_loop 과 같지만 본문을 돌기 전마다 'loop' 훅을 부릅니다."""
+        if type(node) is ForNode:
+            if not node.init.execute(self):
+                self.fail(f"오류: for문 초기화 구문 오류: {node.init.source}")
+            step = node.step
+            message = "오류: for문이 너무 많이 반복되었습니다 (무한 루프?)"
+        else:
+            step = None
+            message = "오류: while문이 너무 많이 반복되었습니다 (무한 루프?)"
+        cond = node.cond.evaluate
+        body = node.body
+        loop_hooks = self.hooks['loop']
+        governor = self.governor
+        loop_limit = governor.loop_limit
+        cost = len(body.items) + 1
+        iterations = 0
+        while cond(self):
+            for callback in loop_hooks:
+                callback(self, node.line, iterations + 1)
+            flow = self.execute_block(body, True, in_function)
+            if flow is FLOW_BREAK:
+                break
+            if flow is FLOW_RETURN:
+                return flow
+            if step is not None and not step.execute(self):
+                self.fail(f"오류: for문 진행 구문 오류: {step.source}")
+            iterations += 1
+            if iterations >= loop_limit:
+                raise LoopLimitError(message)
+            governor.steps += cost
+            if governor.steps >= governor.next_check:
+                governor.check()
+        return None
 
-    def process_line(self, line):
-        """
-        한 줄의 코드를 해석하고 실행합니다.
-        기존 interpreter.py 에 정의된 모든 기능을 포함하면서 새로운 GPT 확장 문법을 추가합니다.
-        """
+    def traced_call_function(self, func_name, args):
+        for callback in self.hooks['call']:
+            callback(self, func_name, args)
+        # 하위 클래스(프로파일러 등)가 덮어쓴 call_function 도 그대로 거친다
+        value = type(self).call_function(self, func_name, args)
+        for callback in self.hooks['return']:
+            callback(self, func_name, value)
+        return value
 
-        # 0. break
-        if line == '몸무게0.1톤':
-            self.break_flag = True
-            return True
+    def execute_loop(self, node, in_function):
+        """for / while 노드를 실행합니다. 본문에서 함수가 끝나면 FLOW_RETURN 을 돌려줍니다."""
+        if type(node) is ForNode:
+            if not node.init.execute(self):
+                self.fail(f"오류: for문 초기화 구문 오류: {node.init.source}")
+            step = node.step
+            message = "오류: for문이 너무 많이 반복되었습니다 (무한 루프?)"
+        else:
+            step = None
+            message = "오류: while문이 너무 많이 반복되었습니다 (무한 루프?)"
+        cond = node.cond.evaluate
+        body = node.body
+        governor = self.governor
+        loop_limit = governor.loop_limit
+        cost = len(body.items) + 1
+        iterations = 0
+        while cond(self):
+            flow = self.execute_block(body, True, in_function)
+            if flow is FLOW_BREAK:
+                break
+            if flow is FLOW_RETURN:
+                return flow
+            if step is not None and not step.execute(self):
+                self.fail(f"오류: for문 진행 구문 오류: {step.source}")
+            iterations += 1
+            if iterations >= loop_limit:
+                raise LoopLimitError(message)
+            governor.steps += cost
+            if governor.steps >= governor.next_check:
+                governor.check()
+        return None
 
-        # 0b. return
-        if line.startswith('꺼억'):
-            self.return_flag = True
-            if len(line) > 2:
-                return_expr = line[2:].strip()
-                if return_expr:
-                    self.return_value = self.evaluate_expression(return_expr)
-            return True
+    def evaluate_condition(self, expr):
+        # 조건식도 소스 문자열마다 한 번만 해석되어 캐시된다
+        with self.slot_table.active():
+            compiled = compile_condition(expr)
+        self.ensure_slots()
+        return compiled.evaluate(self)
 
-        # 0c. Boolean literals (preserve 기존 동작)
-        if line == '야오루폐' or line == '야조깜베':
-            return True
+    def evaluate_expression(self, expr):
+        # 표현식은 소스 문자열마다 한 번만 해석되어 캐시된다
+        with self.slot_table.active():
+            compiled = compile_expression(expr)
+        self.ensure_slots()
+        return compiled.evaluate(self)
 
-        # 1. 변수 선언 (기존 구현 그대로)
-        match_int = re.match(r'\{BMI30\}\[(?:\((.+?)\)|(.+?))\](포자맨)?', line)
-        if match_int:
-            var_name = match_int.group(1) or match_int.group(2)
-            protected = match_int.group(3) is not None
-            self.variables[var_name] = 30
-            self.variable_types[var_name] = 'int'
-            if protected:
-                self.protected_vars.add(var_name)
-            return True
+    def handle_print(self, content_block, newline):
+        """출력 구문의 내용을 템플릿을 만들지 않고 바로 출력합니다. 여러 번 실행되는 출력 구문은 PrintTemplate 을 씁니다."""
+        parts = []
+        for piece in parse_print_content(content_block):
+            if piece[0] == 'text':
+                parts.append(piece[1])
+                continue
+            slot = self.defined_slot(piece[1])
+            if slot is None:
+                parts.append('undefined')
+                continue
+            var_type = self.slot_types[slot]
+            value = self.slot_values[slot]
+            if piece[0] == 'var':
+                # 리스트 변수는 출력하지 않는다
+                formatter = VALUE_FORMATTERS.get(var_type)
+                if formatter is not None:
+                    parts.append(formatter(value))
+            elif 0 <= piece[2] < len(value):
+                parts.append(ELEMENT_FORMATTERS.get(var_type, str)(value[piece[2]]))
+            else:
+                parts.append('undefined')
+        if newline:
+            parts.append('\n')
+        self.output.write(''.join(parts))
 
-        match_float7 = re.match(r'\{BMI30\.7\}\[(?:\((.+?)\)|(.+?))\](포자맨)?', line)
-        if match_float7:
-            var_name = match_float7.group(1) or match_float7.group(2)
-            protected = match_float7.group(3) is not None
-            self.variables[var_name] = 30.7
-            self.variable_types[var_name] = 'float7'
-            if protected:
-                self.protected_vars.add(var_name)
-            return True
 
-        match_float15 = re.match(r'\{BMI30\.7ㅋㅋ\}\[(?:\((.+?)\)|(.+?))\](포자맨)?', line)
-        if match_float15:
-            var_name = match_float15.group(1) or match_float15.group(2)
-            protected = match_float15.group(3) is not None
-            self.variables[var_name] = 30.7
-            self.variable_types[var_name] = 'float15'
-            if protected:
-                self.protected_vars.add(var_name)
-            return True
+# ---- 프로파일러 ----
+# --profile 로 실행하면 줄마다, 함수마다 실행 횟수와 누적 시간을 모아 끝날 때 보고합니다.
+# 일반 실행기는 그대로 두고 execute_block / call_function 만 바꾼 하위 클래스로 측정합니다.
 
-        match_str = re.match(r'\{BMI\}\[(?:\((.+?)\)|(.+?))\](포자맨)?', line)
-        if match_str:
-            var_name = match_str.group(1) or match_str.group(2)
-            protected = match_str.group(3) is not None
-            self.variables[var_name] = ""
-            self.variable_types[var_name] = 'str'
-            if protected:
-                self.protected_vars.add(var_name)
-            return True
+def describe_item(item):
+    """프로파일 보고서에 보여 줄 블록 항목의 설명"""
+    if isinstance(item, Statement):
+        return item.source
+    if isinstance(item, IfChainNode):
+        return f"비만인가 … ({len(item.branches)}개 조건{', 그외 있음' if item.else_body is not None else ''})"
+    if isinstance(item, ForNode):
+        return f"그챼({item.init.source}그챼{item.cond.source}그챼{item.step.source})그챼"
+    if isinstance(item, WhileNode):
+        return f"나살뺄거야({item.cond.source})"
+    return f"[{item.name}]미쉥물 연료[{','.join(item.params)}]전줴"
 
-        match_list = re.match(r'\{BMI\[(.+?)\]\}\[(?:\((.+?)\)|(.+?))\](포자맨)?', line)
-        if match_list:
-            list_type = match_list.group(1)
-            var_name = match_list.group(2) or match_list.group(3)
-            protected = match_list.group(4) is not None
-            if list_type == '30':
-                self.variable_types[var_name] = 'list_int'
-            elif list_type == '30.7':
-                self.variable_types[var_name] = 'list_float7'
-            elif list_type == '30.7ㅋㅋ':
-                self.variable_types[var_name] = 'list_float15'
-            else:
-                self.variable_types[var_name] = 'list_str'
-            self.variables[var_name] = []
-            if protected:
-                self.protected_vars.add(var_name)
-            return True
 
-        # 2. 문자열 할당
-        match_str_assign = re.match(r'\[(?:\((.+?)\)|(.+?))\]꿀꺽<\'(.+)\'', line)
-        if match_str_assign:
-            var_name = match_str_assign.group(1) or match_str_assign.group(2)
-            value_str = match_str_assign.group(3)
-            if var_name not in self.variables:
-                print(f"오류: 정의되지 않은 변수 '{var_name}'")
-                sys.exit(1)
-            if self.variable_types[var_name] == 'str':
-                self.variables[var_name] = value_str
-            else:
-                print(f"오류: '{var_name}'은(는) 문자열 변수가 아닙니다.")
-                sys.exit(1)
-            return True
+class Profile:
+    """줄 번호 -> [실행 횟수, 누적 시간, 설명], 함수 이름 -> [호출 횟수, 누적 시간] 통계"""
 
-        # 2b. 변수 증감 연산
-        match_increment = re.match(r'\[(?:\((.+?)\)|(.+?))\]꿀꺽<(.+)', line)
-        if match_increment:
-            var_name = match_increment.group(1) or match_increment.group(2)
-            operation = match_increment.group(3).strip()
-            if var_name not in self.variables:
-                print(f"오류: 정의되지 않은 변수 '{var_name}'")
-                sys.exit(1)
-            delta = 0
-            if operation == '밥':
-                delta = 1
-            elif operation == '빵':
-                delta = 0.1
-            elif operation.startswith('고기'):
-                count = operation.count('고기')
-                delta = 0.01 * (0.1 ** (count - 1))
-            elif operation == '야채':
-                delta = -1
-            elif operation == '설사약':
-                delta = -0.1
-            elif operation.startswith('포자빵'):
-                count = operation.count('포자빵')
-                delta = -0.01 * (0.1 ** (count - 1))
-            else:
-                print(f"오류: 알 수 없는 연산 '{operation}'")
-                sys.exit(1)
-            var_type = self.variable_types[var_name]
-            if var_type in ('int', 'float7', 'float15'):
-                self.variables[var_name] += delta
-                if var_type == 'int':
-                    self.variables[var_name] = int(self.variables[var_name])
-            else:
-                print(f"오류: '{var_name}' 변수에 대한 꿀꺽 연산은 지원되지 않습니다.")
-                sys.exit(1)
-            return True
+    def __init__(self):
+        self.lines = {}
+        self.functions = {}
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
 
-        # 2c. 리스트 할당
-        match_list_assign = re.match(r'\[(?:\((.+?)\)|(.+?))\]쿰척<"\[(.*)\]"', line)
-        if match_list_assign:
-            var_name = match_list_assign.group(1) or match_list_assign.group(2)
-            values_str = match_list_assign.group(3)
-            if var_name not in self.variable_types or (not self.variable_types[var_name].startswith('list')):
-                print(f"오류: 정의되지 않은 리스트 변수 '{var_name}'")
-                sys.exit(1)
-            parts = [p.strip() for p in values_str.split(',')] if values_str.strip() != '' else []
-            t = self.variable_types[var_name]
-            parsed = []
-            for p in parts:
-                try:
-                    if t == 'list_int':
-                        parsed.append(int(p))
-                    elif t in ('list_float7', 'list_float15'):
-                        parsed.append(float(p))
-                    else:
-                        parsed.append(p)
-                except ValueError:
-                    print(f"오류: '{p}'은(는) 리스트 '{var_name}'의 형식에 맞지 않습니다.")
-                    sys.exit(1)
-            self.variables[var_name] = parsed
-            return True
+    def add_line(self, lineno, item, seconds):
+        entry = self.lines.get(lineno)
+        if entry is None:
+            entry = self.lines[lineno] = [0, 0.0, describe_item(item)]
+        entry[0] += 1
+        entry[1] += seconds
 
-        # 2d. 리스트 정렬 (신규 문법)
-        match_sort_asc = re.match(r'미추홀구\[(.+?)\]', line)
-        if match_sort_asc:
-            list_name = match_sort_asc.group(1).strip()
-            if list_name not in self.variables or not self.variable_types[list_name].startswith('list'):
-                print(f"오류: 정의되지 않은 리스트 변수 '{list_name}'")
-                sys.exit(1)
-            try:
-                self.variables[list_name] = sorted(self.variables[list_name])
-            except Exception as e:
-                print(f"오류: 리스트 정렬 실패: {e}")
-                sys.exit(1)
-            return True
-        match_sort_desc = re.match(r'용현동\[(.+?)\]', line)
-        if match_sort_desc:
-            list_name = match_sort_desc.group(1).strip()
-            if list_name not in self.variables or not self.variable_types[list_name].startswith('list'):
-                print(f"오류: 정의되지 않은 리스트 변수 '{list_name}'")
-                sys.exit(1)
-            try:
-                self.variables[list_name] = sorted(self.variables[list_name], reverse=True)
-            except Exception as e:
-                print(f"오류: 리스트 정렬 실패: {e}")
-                sys.exit(1)
-            return True
+    def add_call(self, func_name, seconds):
+        entry = self.functions.get(func_name)
+        if entry is None:
+            entry = self.functions[func_name] = [0, 0.0]
+        entry[0] += 1
+        entry[1] += seconds
 
-        # 3. 출력
-        if line.endswith('쿰척<쿰척'):
-            content = line[:-5]
-            self.handle_print(content, newline=True)
-            return True
-        elif line.endswith('<쿰척'):
-            content = line[:-3]
-            self.handle_print(content, newline=False)
-            return True
+    def stop(self):
+        self.elapsed = time.perf_counter() - self.started
 
-        # 4. 단독 입력 (기존)
-        if line == '쿰척<()':
-            input()
-            return True
-        if line == '쿰척<쿰척()':
-            input()
-            print()
-            return True
+    def to_dict(self):
+        return {
+            'total_time': self.elapsed,
+            'lines': [{'line': lineno, 'hits': hits, 'time': seconds, 'source': source}
+                      for lineno, (hits, seconds, source) in sorted(self.lines.items(), key=lambda kv: -kv[1][1])],
+            'functions': [{'name': name, 'calls': calls, 'time': seconds}
+                          for name, (calls, seconds) in sorted(self.functions.items(), key=lambda kv: -kv[1][1])],
+        }
 
-        # 5. 변수 입력 (기존)
-        match_input_var = re.match(r'쿰척<\((.+?)\)', line)
-        if match_input_var:
-            var_name = match_input_var.group(1)
-            if var_name in self.variables:
-                val_str = input()
-                try:
-                    if self.variable_types[var_name] == 'int':
-                        self.variables[var_name] = int(val_str)
-                    elif self.variable_types[var_name] in ('float7', 'float15'):
-                        self.variables[var_name] = float(val_str)
-                    elif self.variable_types[var_name] == 'str':
-                        self.variables[var_name] = val_str
-                    else:
-                        print(f"오류: '{var_name}' 변수 타입은 입력을 지원하지 않습니다.")
-                        sys.exit(1)
-                except ValueError:
-                    print(f"오류: '{val_str}'은(는) 변수 '{var_name}'에 적합한 값이 아닙니다.")
-                    sys.exit(1)
-            else:
-                print(f"오류: 정의되지 않은 변수 '{var_name}'")
-                sys.exit(1)
-            return True
+    def format_report(self, limit=None):
+        """누적 시간이 긴 순서로 정렬한 보고서 문자열. 안쪽 블록과 호출한 함수의 시간도 누적 시간에 들어갑니다."""
+        data = self.to_dict()
+        rows = [f"=== 프로파일 (전체 {data['total_time']:.6f}초) ===",
+                f"{'줄':>6} {'실행 횟수':>12} {'누적 시간(초)':>14}  구문"]
+        for entry in data['lines'][:limit]:
+            rows.append(f"{entry['line']:>6} {entry['hits']:>12} {entry['time']:>14.6f}  {entry['source']}")
+        if data['functions']:
+            rows.append("")
+            rows.append(f"{'함수':<16} {'호출 횟수':>12} {'누적 시간(초)':>14}")
+            for entry in data['functions']:
+                rows.append(f"{entry['name']:<16} {entry['calls']:>12} {entry['time']:>14.6f}")
+        return '\n'.join(rows)
 
-        # 6. for 문 (기존)
-        match_for = re.match(r'그챼\((.+?)그챼(.+?)그챼(.+?)\)그챼', line)
-        if match_for:
-            init_stmt = match_for.group(1).strip()
-            cond_expr = match_for.group(2).strip()
-            step_stmt = match_for.group(3).strip()
-            self.in_block = True
-            self.block_type = 'for'
-            self.block_context = {'init': init_stmt, 'cond': cond_expr, 'step': step_stmt}
-            return True
 
-        # 7. if, elseif, else (기존)
-        match_if = re.match(r'비만인가\[(.+?)\]알아보자', line)
-        if match_if:
-            cond_expr = match_if.group(1).strip()
-            self.in_block = True
-            self.block_type = 'if'
-            self.block_context = {'cond': cond_expr}
-            self.if_condition_met = False
-            return True
+class ProfilingInterpreter(HaklangInterpreterGPT):
+    """블록 항목과 함수 호출마다 시간을 재는 트리 실행기. 결과는 self.profile 에 모입니다."""
 
-        match_elseif = re.match(r'학범이는비만일수도있음\[(.+?)\]', line)
-        if match_elseif:
-            cond_expr = match_elseif.group(1).strip()
-            self.in_block = True
-            self.block_type = 'elseif'
-            self.block_context = {'cond': cond_expr}
-            return True
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.profile = Profile()
 
-        if line == '학범이는비만이아님':
-            self.in_block = True
-            self.block_type = 'else'
-            self.block_context = {}
-            return True
+    def run_main(self, execute, source):
+        try:
+            super().run_main(execute, source)
+        finally:
+            self.profile.stop()
 
-        if line == '학범이는비만임':
-            return True
+    def execute_block(self, block, in_loop=False, in_function=False, top_level=False):
+        # 일반 구문도 빠짐없이 execute_item 을 거치게 해서 줄마다 시간을 잰다
+        for item, lineno in zip(block.items, block.lines):
+            flow = self.execute_item(item, lineno, in_loop, in_function, top_level)
+            if flow is not None:
+                return flow
+        return None
 
-        # 8. while (기존)
-        match_while = re.match(r'나살뺄거야\((.+?)\)', line)
-        if match_while:
-            cond_expr = match_while.group(1).strip()
-            self.in_block = True
-            self.block_type = 'while'
-            self.block_context = {'cond': cond_expr}
-            return True
+    def execute_item(self, item, lineno, in_loop, in_function, top_level):
+        # 'line' 훅이 execute_block 을 덮어써도 항목은 이 메서드를 거치므로 프로파일이 빠지지 않는다
+        start = time.perf_counter()
+        try:
+            return super().execute_item(item, lineno, in_loop, in_function, top_level)
+        finally:
+            self.profile.add_line(lineno, item, time.perf_counter() - start)
 
-        if line == '5분':
-            return True
+    def call_function(self, func_name, args):
+        start = time.perf_counter()
+        try:
+            return super().call_function(func_name, args)
+        finally:
+            self.profile.add_call(func_name, time.perf_counter() - start)
 
-        # 9. 함수 정의 (기존)
-        match_func_def = re.match(r'\[(.+?)\]미쉥물 ?연료\[(.*)\]전줴', line)
-        if match_func_def:
-            func_name = match_func_def.group(1).strip()
-            params_str = match_func_def.group(2).strip()
-            params = [p.strip() for p in params_str.split(',')] if params_str else []
-            self.in_block = True
-            self.block_type = 'function'
-            self.block_context = {'name': func_name, 'params': params}
-            return True
 
-        # 9b. 지연 함수 호출 (신규)
-        match_deferred = re.match(r'\[(.+?)\]미쉥물 ?연료 ?젼줴\((.*)\)', line)
-        if match_deferred:
-            func_name = match_deferred.group(1).strip()
-            args_str = match_deferred.group(2).strip()
-            args = []
-            if args_str:
-                arg_parts = [a.strip() for a in args_str.split(',')]
-                for arg in arg_parts:
-                    args.append(self.evaluate_expression(arg))
-            # 지연 호출 목록에 추가
-            self.deferred_calls.append((func_name, args))
-            return True
+# ---- asyncio 실행 ----
+# 이벤트 루프 하나에서 여러 프로그램을 함께 돌리기 위한 트리 실행기입니다.
+# 시간먹기 와 입력, 함수 호출, 반복문만 코루틴으로 실행하고 나머지 구문은 동기 실행기와 같은 execute 를 씁니다.
 
-        # 10. 변수/리스트 초기화 (기존)
-        match_reset = re.match(r'간장먹고\[(.+?)\]치기', line)
-        if match_reset:
-            var_name = match_reset.group(1).strip()
-            if var_name not in self.variables:
-                print(f"오류: 정의되지 않은 변수 '{var_name}'")
-                sys.exit(1)
-            var_type = self.variable_types[var_name]
-            if var_type == 'int':
-                self.variables[var_name] = 30
-            elif var_type == 'float7' or var_type == 'float15':
-                self.variables[var_name] = 30.7
-            elif var_type.startswith('list'):
-                self.variables[var_name] = []
-            elif var_type == 'str':
-                self.variables[var_name] = ""
-            return True
+# 이만큼의 실행 단계마다 이벤트 루프에 차례를 넘긴다
+ASYNC_YIELD_INTERVAL = 1000
 
-        # 10b. 랜덤 값 할당 (기존)
-        match_random_var = re.match(r'포자\[(.+?)\]', line)
-        if match_random_var:
-            var_name = match_random_var.group(1).strip()
-            if var_name not in self.variables:
-                print(f"오류: 정의되지 않은 변수 '{var_name}'")
-                sys.exit(1)
-            if var_name in self.protected_vars:
-                return True
-            self.assign_random_value(var_name)
-            return True
-        if line == '포자빵':
-            for var_name in self.variables.keys():
-                if var_name not in self.protected_vars:
-                    self.assign_random_value(var_name)
-            return True
+# execute_block_async 가 코루틴으로 처리하는 항목
+ASYNC_ITEM_TYPES = CONTROL_ITEM_TYPES | {CallStatement, SleepStatement, InputStatement, InputVarStatement}
 
-        # 11. 함수 호출 (기존)
-        match_func_call = re.match(r'\[(.+?)\]\((.*)\)', line)
-        if match_func_call:
-            func_name = match_func_call.group(1).strip()
-            args_str = match_func_call.group(2).strip()
-            if func_name in self.functions:
-                args = []
-                if args_str:
-                    arg_parts = args_str.split(',')
-                    for arg in arg_parts:
-                        args.append(self.evaluate_expression(arg.strip()))
-                self.call_function(func_name, args)
-                return True
 
-        # 12. 리스트 요소 출력 (기존)
-        match_list_print = re.match(r'\[(?:\((.+?)\)|(.+?))\]쿰척\[(\d+)\]', line)
-        if match_list_print:
-            var_name = match_list_print.group(1) or match_list_print.group(2)
-            idx = int(match_list_print.group(3)) - 1
-            if var_name not in self.variables:
-                print(f"오류: 정의되지 않은 리스트 변수 '{var_name}'")
-                sys.exit(1)
-            if not self.variable_types[var_name].startswith('list'):
-                print(f"오류: '{var_name}'은(는) 리스트가 아닙니다.")
-                sys.exit(1)
-            lst = self.variables[var_name]
-            if idx < 0 or idx >= len(lst):
-                print(f"오류: 인덱스 {idx+1} 는 리스트 범위를 벗어납니다.")
-                sys.exit(1)
-            elem = lst[idx]
-            t = self.variable_types[var_name]
-            if t == 'list_int':
-                print(elem)
-            elif t == 'list_float7':
-                print(f"{elem:.7f}")
-            elif t == 'list_float15':
-                print(f"{elem:.15f}")
-            else:
-                print(elem)
-            return True
+class AsyncInterpreter(HaklangInterpreterGPT):
+    """
+    asyncio 용 실행기. 시간먹기 는 asyncio.sleep 으로 기다리고, 입력은 reader 의 readline() 코루틴에서 읽으며,
+    긴 반복문과 재귀 호출 중에도 ASYNC_YIELD_INTERVAL 단계마다 다른 작업에 차례를 넘깁니다.
 
-        # 13. 스택 연산 (신규)
-        match_push = re.match(r'아빠와나\[(.+?)\]', line)
-        if match_push:
-            var_name = match_push.group(1).strip()
-            if var_name not in self.variables:
-                print(f"오류: 정의되지 않은 변수 '{var_name}'")
-                sys.exit(1)
-            self.stack.append(self.variables[var_name])
-            return True
-        match_pop = re.match(r'아빠와 나\[(.+?)\]', line)
-        if match_pop:
-            var_name = match_pop.group(1).strip()
-            if not self.stack:
-                print("오류: 스택이 비어있어 pop 할 수 없습니다.")
-                sys.exit(1)
-            value = self.stack.pop()
-            # 타입 추론하여 변수에 설정
-            if isinstance(value, int):
-                self.variables[var_name] = value
-                self.variable_types[var_name] = 'int'
-            elif isinstance(value, float):
-                self.variables[var_name] = value
-                self.variable_types[var_name] = 'float7'
-            elif isinstance(value, str):
-                self.variables[var_name] = value
-                self.variable_types[var_name] = 'str'
-            elif isinstance(value, list):
-                self.variables[var_name] = value
-                # 리스트 타입 추론은 간단히 list_int 로 지정
-                self.variable_types[var_name] = 'list_int'
-            return True
+    reader 는 asyncio.StreamReader 처럼 한 줄(str 또는 bytes, 끝이면 빈 값)을 돌려주는 readline() 코루틴이 있으면 됩니다.
+    없으면 self.input 에서 스레드 풀(run_in_executor)로 읽습니다. stdout 을 주면 출력을 그 스트림(write / flush)에 씁니다.
+    실행 훅과 바이트코드 VM 은 동기 실행에서만 씁니다.
+    """
 
-        # 14. 디버그 출력 (신규)
-        match_debug = re.match(r'데이비드\((.+)\)', line)
-        if match_debug:
-            expr = match_debug.group(1).strip()
-            val = self.evaluate_expression(expr)
-            # 디버그 출력은 표준 출력에 타입과 함께 출력한다
-            print(f"[디버그] {expr} = {val}")
-            return True
+    def __init__(self, reader=None, stdout=None, yield_interval=ASYNC_YIELD_INTERVAL, **kwargs):
+        super().__init__(**kwargs)
+        self.reader = reader
+        if stdout is not None:
+            self.output = OutputBuffer(stream=stdout, buffer_size=self.output.buffer_size,
+                                       flush_policy=kwargs.get('flush_policy'))
+        self.yield_interval = yield_interval
+        self.next_yield = yield_interval
+
+    async def run_async(self, code):
+        """code 를 실행합니다. 결과와 오류는 run() 과 같습니다 (오류로 멈추면 HaklangError)."""
+        program = load_program(code, self.compile_line)
+        if not program.valid:
+            self.output.write_line(HEADER_ERROR)
+            self.output.flush()
+            return
+        self.use_slot_table(program.slots)
+        if self.optimize:
+            program = program.optimized()
+        if self.fixed_point:
+            program = program.fixed_point()
+        self.governor.start()
+        self.next_yield = self.yield_interval
+        try:
+            # 켜 둔 슬롯 표는 이 태스크의 컨텍스트에만 보인다
+            with self.slot_table.active():
+                await self.execute_program_async(program)
+                for func_name, args in self.deferred_calls:
+                    try:
+                        await self.call_function_async(func_name, args)
+                    except HaklangError:
+                        raise
+                    except Exception as e:
+                        self.output.write_line(f"오류: 지연 함수 '{func_name}' 호출 중 오류: {error_message(e)}")
+        finally:
+            self.output.flush()
+
+    async def run_source_async(self, code, stdin=None):
+        """run_source 의 코루틴판. stdin 은 문자열이나 readline() 코루틴이 있는 reader 입니다."""
+        self.reset()
+        stdout = io.StringIO()
+        saved = (self.output, self.input, self.reader)
+        self.output = OutputBuffer(stream=stdout, buffer_size=saved[0].buffer_size, flush_policy='size')
+        if stdin is None or isinstance(stdin, str):
+            self.input = InputReader(stream=io.StringIO(stdin or ''), mode='bulk')
+            self.reader = None
+        else:
+            self.reader = stdin
+        error = None
+        try:
+            await self.run_async(code)
+        except HaklangError as e:
+            error = e
+            self.report_error(e)
+        except Exception as e:
+            error = e
+            self.output.write_line(f"오류 발생: {error_message(e)}")
+        finally:
+            self.output.flush()
+            self.output, self.input, self.reader = saved
+        return RunResult(stdout.getvalue(), self.variables, error)
 
-        # 15. 시간먹기 (신규)
-        match_sleep = re.match(r'시간먹기\((.+)\)', line)
-        if match_sleep:
-            expr = match_sleep.group(1).strip()
-            duration = self.evaluate_expression(expr)
+    async def execute_program_async(self, program):
+        self.ensure_slots()
+        for block in program.blocks:
             try:
-                t = float(duration)
-                if t < 0:
-                    print("오류: 시간은 음수일 수 없습니다.")
-                    sys.exit(1)
-                time.sleep(t)
-            except ValueError:
-                print(f"오류: 시간 '{duration}'을(를) 숫자로 변환할 수 없습니다.")
-                sys.exit(1)
-            return True
+                await self.execute_block_async(block, top_level=True)
+            except HaklangError:
+                raise
+            except Exception as e:
+                self.fail(f"오류 (Line {block.lines[0]}): {error_message(e)}")
+        if program.error is not None:
+            raise program.error.with_traceback(None)
 
-        return False
+    async def execute_block_async(self, block, in_loop=False, in_function=False, top_level=False):
+        for item, lineno in zip(block.items, block.lines):
+            if type(item) in ASYNC_ITEM_TYPES:
+                flow = await self.execute_item_async(item, lineno, in_loop, in_function, top_level)
+                if flow is not None:
+                    return flow
+            elif not item.execute(self):
+                self.unknown_item(item, lineno, in_function, top_level)
+        return None
 
-    def assign_random_value(self, var_name):
-        var_type = self.variable_types[var_name]
-        if var_type == 'int':
-            self.variables[var_name] = random.randint(-1000, 1000)
-        elif var_type == 'float7' or var_type == 'float15':
-            self.variables[var_name] = random.uniform(-1000.0, 1000.0)
-        elif var_type == 'str':
-            words = ['학범', '비만', '하악', '귤', '쿰척', '쑤학']
-            self.variables[var_name] = random.choice(words)
-        elif var_type.startswith('list_'):
-            size = random.randint(3, 5)
-            if var_type == 'list_int':
-                self.variables[var_name] = [random.randint(-100, 100) for _ in range(size)]
-            elif var_type in ('list_float7', 'list_float15'):
-                self.variables[var_name] = [random.uniform(-100.0, 100.0) for _ in range(size)]
-            elif var_type == 'list_str':
-                words = ['학범', '비만', '하악', '귤', '쿰척']
-                self.variables[var_name] = [random.choice(words) for _ in range(size)]
+    async def execute_item_async(self, item, lineno, in_loop, in_function, top_level):
+        kind = type(item)
+        if kind is IfChainNode:
+            body = item.else_body
+            for cond, branch in item.branches:
+                if cond.evaluate(self):
+                    body = branch
+                    break
+            if body is not None:
+                return await self.execute_block_async(body, in_loop, in_function)
+        elif kind is ForNode or kind is WhileNode:
+            return await self.execute_loop_async(item, in_function)
+        elif kind is CallStatement:
+            if item.func_name not in self.functions:
+                self.unknown_item(item, lineno, in_function, top_level)
+            await self.call_function_async(item.func_name, [arg.evaluate(self) for arg in item.args])
+        elif kind is SleepStatement:
+            t, expires = self.governor.sleep_time(item.seconds(self))
+            self.output.flush()
+            await asyncio.sleep(t)
+            if expires:
+                self.governor.check()
+        elif kind is InputStatement or kind is InputVarStatement:
+            item.prepare(self)
+            item.store(self, await self.read_line_async())
+        else:
+            return self.execute_item(item, lineno, in_loop, in_function, top_level)
+        return None
 
-    def call_function(self, func_name, args):
+    async def execute_loop_async(self, node, in_function):
+        """execute_loop 의 코루틴판. 실행 단계가 next_yield 에 닿으면 이벤트 루프에 차례를 넘깁니다."""
+        if type(node) is ForNode:
+            if not node.init.execute(self):
+                self.fail(f"오류: for문 초기화 구문 오류: {node.init.source}")
+            step = node.step
+            message = "오류: for문이 너무 많이 반복되었습니다 (무한 루프?)"
+        else:
+            step = None
+            message = "오류: while문이 너무 많이 반복되었습니다 (무한 루프?)"
+        cond = node.cond.evaluate
+        body = node.body
+        governor = self.governor
+        loop_limit = governor.loop_limit
+        cost = len(body.items) + 1
+        iterations = 0
+        while cond(self):
+            flow = await self.execute_block_async(body, True, in_function)
+            if flow is FLOW_BREAK:
+                break
+            if flow is FLOW_RETURN:
+                return flow
+            if step is not None and not step.execute(self):
+                self.fail(f"오류: for문 진행 구문 오류: {step.source}")
+            iterations += 1
+            if iterations >= loop_limit:
+                raise LoopLimitError(message)
+            governor.steps += cost
+            if governor.steps >= governor.next_check:
+                governor.check()
+            if governor.steps >= self.next_yield:
+                await self.pause()
+        return None
+
+    async def call_function_async(self, func_name, args):
         if func_name not in self.functions:
-            print(f"오류: 정의되지 않은 함수 '{func_name}'")
-            sys.exit(1)
-        params, body = self.functions[func_name]
+            self.fail(f"오류: 정의되지 않은 함수 '{func_name}'")
+        params, body, frame_slots = self.functions[func_name]
         if len(args) != len(params):
-            print(f"오류: 함수 '{func_name}'는 {len(params)}개의 매개변수가 필요하지만 {len(args)}개가 전달되었습니다.")
-            sys.exit(1)
-        # 현재 변수 상태 저장
-        saved_vars = self.variables.copy()
-        saved_types = self.variable_types.copy()
-        # 매개변수 설정
-        for param, arg in zip(params, args):
-            if isinstance(arg, int):
-                self.variables[param] = arg
-                self.variable_types[param] = 'int'
-            elif isinstance(arg, float):
-                self.variables[param] = arg
-                self.variable_types[param] = 'float7'
-            elif isinstance(arg, str):
-                self.variables[param] = arg
-                self.variable_types[param] = 'str'
-            elif isinstance(arg, list):
-                self.variables[param] = arg
-                self.variable_types[param] = 'list_int'
-        # 함수 본문 실행
-        self.return_flag = False
-        self.return_value = None
-        for body_line in body:
-            if not self.process_line(body_line):
-                print(f"오류: 함수 본문 오류: {body_line}")
-                sys.exit(1)
-            if self.return_flag:
-                break
-        result = self.return_value
-        # 변수 상태 복원
-        self.variables = saved_vars
-        self.variable_types = saved_types
+            self.fail(f"오류: 함수 '{func_name}'는 {len(params)}개의 매개변수가 필요하지만 {len(args)}개가 전달되었습니다.")
+        self.governor.charge(1)
+        if self.governor.steps >= self.next_yield:
+            await self.pause()
+        saved = self.enter_frame(frame_slots, params, args)
         self.return_flag = False
         self.return_value = None
+        try:
+            await self.execute_block_async(body, in_function=True, top_level=True)
+            result = self.return_value
+        finally:
+            self.leave_frame(saved)
+            self.return_flag = False
+            self.return_value = None
         return result
 
-    def execute_block(self):
-        # 기존 interpreter.py 의 execute_block 을 거의 그대로 사용
-        if self.block_type == 'function':
-            func_name = self.block_context['name']
-            params = self.block_context['params']
-            self.functions[func_name] = (params, self.block_buffer[:])
-            return
-        elif self.block_type == 'if':
-            cond_expr = self.block_context['cond']
-            if self.evaluate_condition(cond_expr):
-                self.if_condition_met = True
-                self.execute_nested_block(self.block_buffer)
-            return
-        elif self.block_type == 'elseif':
-            cond_expr = self.block_context['cond']
-            if not self.if_condition_met and self.evaluate_condition(cond_expr):
-                self.if_condition_met = True
-                self.execute_nested_block(self.block_buffer)
-            return
-        elif self.block_type == 'else':
-            if not self.if_condition_met:
-                self.execute_nested_block(self.block_buffer)
-            self.if_condition_met = False
-            return
-        elif self.block_type == 'for':
-            init_stmt = self.block_context['init']
-            cond_expr = self.block_context['cond']
-            step_stmt = self.block_context['step']
-            if not self.process_line(init_stmt):
-                print(f"오류: for문 초기화 구문 오류: {init_stmt}")
-                sys.exit(1)
-            max_iterations = 100000
-            iterations = 0
-            while iterations < max_iterations:
-                if not self.evaluate_condition(cond_expr):
-                    break
-                self.break_flag = False
-                self.execute_nested_block(self.block_buffer)
-                if self.break_flag:
-                    self.break_flag = False
-                    break
-                if not self.process_line(step_stmt):
-                    print(f"오류: for문 진행 구문 오류: {step_stmt}")
-                    sys.exit(1)
-                iterations += 1
-            if iterations >= max_iterations:
-                print("오류: for문이 너무 많이 반복되었습니다 (무한 루프?)")
-                sys.exit(1)
-        elif self.block_type == 'while':
-            cond_expr = self.block_context['cond']
-            max_iterations = 100000
-            iterations = 0
-            while iterations < max_iterations:
-                if not self.evaluate_condition(cond_expr):
-                    break
-                self.break_flag = False
-                self.execute_nested_block(self.block_buffer)
-                if self.break_flag:
-                    self.break_flag = False
-                    break
-                iterations += 1
-            if iterations >= max_iterations:
-                print("오류: while문이 너무 많이 반복되었습니다 (무한 루프?)")
-                sys.exit(1)
-
-    def execute_nested_block(self, lines):
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-            # 중첩 if/elseif/else 블록 처리
-            if re.match(r'비만인가\[.+?\]알아보자', line):
-                nested_lines = []
-                i += 1
-                if i < len(lines) and lines[i] == '학범이는비만임':
-                    i += 1
-                depth = 1
-                while i < len(lines) and depth > 0:
-                    if lines[i] == '학':
-                        depth -= 1
-                        if depth == 0:
-                            break
-                    elif re.match(r'비만인가\[.+?\]알아보자', lines[i]):
-                        depth += 1
-                    if depth > 0:
-                        nested_lines.append(lines[i])
-                    i += 1
-                match = re.match(r'비만인가\[(.+?)\]알아보자', line)
-                cond_expr = match.group(1).strip()
-                if self.evaluate_condition(cond_expr):
-                    self.if_condition_met = True
-                    self.execute_nested_block(nested_lines)
-                else:
-                    self.if_condition_met = False
-            elif re.match(r'학범이는비만일수도있음\[.+?\]', line):
-                nested_lines = []
-                i += 1
-                if i < len(lines) and lines[i] == '학':
-                    i += 1
-                depth = 1
-                while i < len(lines) and depth > 0:
-                    if lines[i] == '학':
-                        depth -= 1
-                        if depth == 0:
-                            break
-                    elif re.match(r'비만인가\[.+?\]알아보자', lines[i]):
-                        depth += 1
-                    if depth > 0:
-                        nested_lines.append(lines[i])
-                    i += 1
-                match = re.match(r'학범이는비만일수도있음\[(.+?)\]', line)
-                cond_expr = match.group(1).strip()
-                if not self.if_condition_met and self.evaluate_condition(cond_expr):
-                    self.if_condition_met = True
-                    self.execute_nested_block(nested_lines)
-            elif line == '학범이는비만이아님':
-                nested_lines = []
-                i += 1
-                if i < len(lines) and lines[i] == '학':
-                    i += 1
-                depth = 1
-                while i < len(lines) and depth > 0:
-                    if lines[i] == '학':
-                        depth -= 1
-                        if depth == 0:
-                            break
-                    elif re.match(r'비만인가\[.+?\]알아보자', lines[i]):
-                        depth += 1
-                    if depth > 0:
-                        nested_lines.append(lines[i])
-                    i += 1
-                if not self.if_condition_met:
-                    self.execute_nested_block(nested_lines)
-                self.if_condition_met = False
-            else:
-                if not self.process_line(line):
-                    print(f"오류: 본문 오류: {line}")
-                    sys.exit(1)
-                if self.break_flag or self.return_flag:
-                    break
-            i += 1
+    async def pause(self):
+        self.next_yield = self.governor.steps + self.yield_interval
+        await asyncio.sleep(0)
 
-    def evaluate_condition(self, expr):
-        expr = expr.strip()
-        # 참/거짓 리터럴
-        if expr == '야오루폐':
-            return True
-        if expr == '야조깜베':
-            return False
-        # 논리 OR 신문법: "... 야 오루페 ..."
-        if '야 오루페' in expr:
-            parts = expr.split('야 오루페', 1)
-            left = self.evaluate_condition(parts[0].strip())
-            right = self.evaluate_condition(parts[1].strip())
-            return left or right
-        # 논리 AND 신문법: "... 야 조깜베 ..."
-        if '야 조깜베' in expr:
-            parts = expr.split('야 조깜베', 1)
-            left = self.evaluate_condition(parts[0].strip())
-            right = self.evaluate_condition(parts[1].strip())
-            return left and right
-        # 비교 연산자 (기존)
-        korean_ops = [
-            ('비만정상', '<='),
-            ('홀쭉정상', '>='),
-            ('정상정상', '=='),
-            ('정상', '=='),
-            ('비만', '<'),
-            ('홀쭉', '>'),
-        ]
-        for korean_op, symbol_op in korean_ops:
-            if korean_op in expr:
-                parts = expr.split(korean_op, 1)
-                if len(parts) == 2:
-                    left = self.evaluate_expression(parts[0].strip())
-                    right = self.evaluate_expression(parts[1].strip())
-                    if symbol_op == '<':
-                        return left < right
-                    elif symbol_op == '>':
-                        return left > right
-                    elif symbol_op == '<=':
-                        return left <= right
-                    elif symbol_op == '>=':
-                        return left >= right
-                    elif symbol_op == '==':
-                        return left == right
-        # 나머지는 표현식 평가 후 진리값
-        val = self.evaluate_expression(expr)
-        return bool(val)
+    async def read_line_async(self):
+        # 입력을 기다리는 동안 안내 문구가 보이도록 출력을 먼저 비운다
+        self.output.flush()
+        if self.reader is None:
+            # self.input 은 막히는 파일 객체이므로 이벤트 루프를 멈추지 않도록 스레드에서 읽는다
+            return await asyncio.get_running_loop().run_in_executor(None, self.read_line)
+        line = await self.reader.readline()
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        if not line:
+            raise EOFError("EOF when reading a line")
+        # input() 처럼 줄 끝의 \n, \r\n 을 떼어 낸다
+        if line.endswith('\n'):
+            line = line[:-1]
+        return line[:-1] if line.endswith('\r') else line
 
-    def evaluate_expression(self, expr):
-        expr = expr.strip()
-        # unary operator: 이학범<expr>
-        if expr.startswith('이학범'):
-            inner = expr[len('이학범'):].strip()
-            val = self.evaluate_expression(inner)
-            if isinstance(val, (int, float)):
-                return -val
-            elif isinstance(val, str):
-                return val[::-1]
-            elif isinstance(val, list):
-                return list(reversed(val))
-            elif isinstance(val, bool):
-                return not val
-            else:
-                return val
-        # binary operators with longest match first
-        operators = [
-            ('루피 함 안아보자', 'concat'),   # concat
-            ('남자 중의 남자', 'max'),        # max
-            ('비이만하악범', '^'),
-            ('학범비만', '*'),
-            ('비만학범', '/'),
-            ('하악범', '+'),
-            ('하악버엄', '-'),
-        ]
-        for korean_op, op_id in operators:
-            if korean_op in expr:
-                parts = expr.split(korean_op, 1)
-                if len(parts) == 2:
-                    left = self.evaluate_expression(parts[0].strip())
-                    right = self.evaluate_expression(parts[1].strip())
-                    if op_id == 'concat':
-                        # 문자열 또는 리스트 연결
-                        if isinstance(left, list) and isinstance(right, list):
-                            return left + right
-                        return str(left) + str(right)
-                    elif op_id == 'max':
-                        try:
-                            return left if left >= right else right
-                        except Exception:
-                            return left
-                    elif op_id == '+':
-                        return left + right
-                    elif op_id == '-':
-                        return left - right
-                    elif op_id == '*':
-                        return left * right
-                    elif op_id == '/':
-                        return left / right if right != 0 else 0
-                    elif op_id == '^':
-                        return left ** right
-        # 변수 참조: 'varname'
-        if expr.startswith("'") and expr.endswith("'"):
-            var_name = expr[1:-1]
-            if var_name in self.variables:
-                return self.variables[var_name]
-            else:
-                return 0
-        # 숫자
-        try:
-            if '.' in expr:
-                return float(expr)
+
+async def run_source_async(code, stdin=None, interpreter=None):
+    """run_source 의 코루틴판. interpreter 를 주면 그 AsyncInterpreter 를 reset() 해서 다시 씁니다."""
+    if interpreter is None:
+        interpreter = AsyncInterpreter()
+    return await interpreter.run_source_async(code, stdin)
+
+
+# ---- 바이트코드 VM ----
+# 블록 트리를 (opcode, a, b) 명령 목록으로 바꾸고 하나의 dispatch 루프에서 실행합니다.
+# 표현식과 조건식은 값 스택 위에서 계산합니다.
+
+OP_LOAD_CONST = 0
+OP_LOAD_VAR = 1
+OP_BINARY = 2
+OP_UNARY = 3
+OP_COMPARE = 4
+OP_JUMP = 5
+OP_JUMP_IF_FALSE = 6
+OP_JUMP_IF_TRUE_OR_POP = 7
+OP_JUMP_IF_FALSE_OR_POP = 8
+OP_INC = 9
+OP_EXEC = 10
+OP_CALL = 11
+OP_RETURN = 12
+OP_DEFINE = 13
+OP_LOOP_ENTER = 14
+OP_LOOP_BACK = 15
+OP_FAIL = 16
+OP_JUMP_UNLESS_VAR_CONST = 17
+OP_JUMP_UNLESS_VAR_VAR = 18
+OP_ADD_CONST = 19
+
+VM_BINARY_FUNCTIONS = dict(BINARY_FUNCTIONS, **{
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '^': operator.pow,
+})
+
+VM_COMPARE_FUNCTIONS = COMPARE_FUNCTIONS
+
+
+class CodeObject:
+    """컴파일된 명령 목록. lines 는 명령마다 오류를 보고할 최상위 줄 번호"""
+    __slots__ = ('ops', 'lines', 'loop_count', 'is_main')
+
+    def __init__(self, ops, lines, loop_count, is_main):
+        self.ops = ops
+        self.lines = lines
+        self.loop_count = loop_count
+        self.is_main = is_main
+
+
+class BytecodeCompiler:
+    def __init__(self, in_function=False):
+        self.in_function = in_function
+        self.ops = []
+        self.lines = []
+        self.loop_count = 0
+        self.break_jumps = []   # 반복문마다 몸무게0.1톤 이 뛰어갈 명령 위치 목록
+        self.line = 0
+        self.depth = 0
+
+    def emit(self, op, a=None, b=None):
+        self.ops.append((op, a, b))
+        self.lines.append(self.line)
+        return len(self.ops) - 1
+
+    def patch(self, index, target=None):
+        op, _, b = self.ops[index]
+        self.ops[index] = (op, len(self.ops) if target is None else target, b)
+
+    def compile_program(self, block):
+        self.compile_block(block, top_level=True)
+        self.thread_jumps()
+        return CodeObject(self.ops, self.lines, self.loop_count, not self.in_function)
+
+    def thread_jumps(self):
+        """JUMP 이 다른 JUMP 나 LOOP_BACK 으로 뛰면 그 명령으로 바로 바꿉니다."""
+        ops = self.ops
+        for i, (op, a, b) in enumerate(ops):
+            if op != OP_JUMP:
+                continue
+            seen = set()
+            while a < len(ops) and ops[a][0] == OP_JUMP and a not in seen:
+                seen.add(a)
+                a = ops[a][1]
+            if a < len(ops) and ops[a][0] == OP_LOOP_BACK:
+                ops[i] = ops[a]
             else:
-                return int(expr)
-        except ValueError:
-            pass
-        # 문자열 리터럴
-        if expr.startswith('"') and expr.endswith('"'):
-            return expr[1:-1]
-        print(f"오류: 표현식을 평가할 수 없습니다: {expr}")
-        sys.exit(1)
+                ops[i] = (OP_JUMP, a, b)
 
-    def handle_print(self, content_block, newline):
-        # 기존 handle_print 함수와 동일
-        if content_block.startswith('(') and content_block.endswith(')'):
-            inner = content_block[1:-1]
+    def compile_block(self, block, top_level=False):
+        for item, lineno in zip(block.items, block.lines):
+            if top_level:
+                self.line = lineno
+            if isinstance(item, Statement):
+                self.compile_statement(item, top_level)
+            elif isinstance(item, IfChainNode):
+                self.compile_if_chain(item)
+            elif isinstance(item, ForNode):
+                self.compile_for(item)
+            elif isinstance(item, WhileNode):
+                self.compile_while(item)
+            elif isinstance(item, FunctionNode):
+                compiler = BytecodeCompiler(in_function=True)
+                code = compiler.compile_program(item.body)
+                self.emit(OP_DEFINE, item.name, (item.param_slots, code, item.frame_slots))
+
+    def unknown_message(self, stmt, top_level):
+        if top_level and not self.in_function:
+            return f"오류 (Line {self.line}): 알 수 없는 구문입니다: {stmt.source}"
+        if top_level:
+            return f"오류: 함수 본문 오류: {stmt.source}"
+        return f"오류: 본문 오류: {stmt.source}"
+
+    def compile_statement(self, stmt, top_level):
+        kind = type(stmt)
+        if kind is IncrementStatement and stmt.delta is not None:
+            self.emit(OP_INC, stmt.slot, stmt)
+        elif kind is TypedIncrementStatement and stmt.amount is not None:
+            self.emit(OP_ADD_CONST, stmt.slot, stmt.amount)
+        elif kind is CallStatement:
+            for arg in stmt.args:
+                self.compile_expression(arg.tree)
+            self.emit(OP_CALL, stmt, self.unknown_message(stmt, top_level))
+        elif kind is BreakStatement and self.break_jumps:
+            self.break_jumps[-1].append(self.emit(OP_JUMP))
+        elif kind is ReturnStatement and self.in_function:
+            if stmt.expr is not None:
+                self.compile_expression(stmt.expr.tree)
+            self.emit(OP_RETURN, stmt.expr is not None)
         else:
-            inner = content_block
-        tokens = re.findall(r'("[^"]*"|\'[^\']*\'|\[[^\]]+\]\[\d+\])', inner)
-        output_str = ""
-        for token in tokens:
-            if token.startswith('"') and token.endswith('"'):
-                output_str += token[1:-1]
-            elif token.startswith("'") and token.endswith("'"):
-                var_name = token[1:-1]
-                if var_name in self.variables:
-                    val = self.variables[var_name]
-                    v_type = self.variable_types[var_name]
-                    if v_type == 'int':
-                        output_str += str(val)
-                    elif v_type == 'float7':
-                        output_str += f"{val:.7f}"
-                    elif v_type == 'float15':
-                        output_str += f"{val:.15f}"
-                    elif v_type == 'str':
-                        output_str += str(val)
-                else:
-                    output_str += 'undefined'
-            elif token.startswith('[') and re.match(r'\[[^\]]+\]\[\d+\]', token):
-                m = re.match(r'\[([^\]]+)\]\[(\d+)\]', token)
-                if m:
-                    list_name = m.group(1)
-                    idx = int(m.group(2)) - 1
-                    if list_name in self.variables:
-                        lst = self.variables[list_name]
-                        if 0 <= idx < len(lst):
-                            t = self.variable_types[list_name]
-                            elem = lst[idx]
-                            if t == 'list_int':
-                                output_str += str(elem)
-                            elif t == 'list_float7':
-                                output_str += f"{elem:.7f}"
-                            elif t == 'list_float15':
-                                output_str += f"{elem:.15f}"
-                            else:
-                                output_str += str(elem)
-                        else:
-                            output_str += 'undefined'
+            self.emit(OP_EXEC, stmt, self.unknown_message(stmt, top_level))
+
+    def compile_expression(self, tree):
+        kind = tree[0]
+        if kind == 'const':
+            self.emit(OP_LOAD_CONST, tree[1])
+        elif kind == 'var':
+            self.emit(OP_LOAD_VAR, slot_of(tree[1]))
+        elif kind == 'error':
+            self.emit(OP_FAIL, f"오류: 표현식을 평가할 수 없습니다: {tree[1]}")
+        elif kind == 'neg':
+            self.compile_expression(tree[1])
+            self.emit(OP_UNARY, _negate)
+        else:
+            self.compile_expression(tree[1])
+            self.compile_expression(tree[2])
+            self.emit(OP_BINARY, VM_BINARY_FUNCTIONS[kind])
+
+    def compile_condition(self, tree):
+        kind = tree[0]
+        if kind == 'const':
+            self.emit(OP_LOAD_CONST, tree[1])
+        elif kind in ('or', 'and'):
+            self.compile_condition(tree[1])
+            jump = self.emit(OP_JUMP_IF_TRUE_OR_POP if kind == 'or' else OP_JUMP_IF_FALSE_OR_POP)
+            self.compile_condition(tree[2])
+            self.patch(jump)
+        elif kind == 'cmp':
+            self.compile_expression(tree[2])
+            self.compile_expression(tree[3])
+            self.emit(OP_COMPARE, VM_COMPARE_FUNCTIONS[tree[1]])
+        else:
+            self.compile_expression(tree[1])
+            self.emit(OP_UNARY, bool)
+
+    def compile_jump_unless(self, tree):
+        """조건이 거짓이면 뛰는 명령을 내보내고 그 위치를 돌려줍니다. 단순 비교는 명령 하나로 합칩니다."""
+        if tree[0] == 'cmp' and tree[2][0] == 'var':
+            func = VM_COMPARE_FUNCTIONS[tree[1]]
+            if tree[3][0] == 'const':
+                return self.emit(OP_JUMP_UNLESS_VAR_CONST, None, (slot_of(tree[2][1]), func, tree[3][1]))
+            if tree[3][0] == 'var':
+                return self.emit(OP_JUMP_UNLESS_VAR_VAR, None, (slot_of(tree[2][1]), func, slot_of(tree[3][1])))
+        self.compile_condition(tree)
+        return self.emit(OP_JUMP_IF_FALSE)
+
+    def compile_if_chain(self, node):
+        end_jumps = []
+        for cond, body in node.branches:
+            skip = self.compile_jump_unless(cond.tree)
+            self.compile_block(body)
+            end_jumps.append(self.emit(OP_JUMP))
+            self.patch(skip)
+        if node.else_body is not None:
+            self.compile_block(node.else_body)
+        for jump in end_jumps:
+            self.patch(jump)
+
+    def compile_loop(self, cond, body, step, message):
+        slot = self.loop_count
+        self.loop_count += 1
+        self.emit(OP_LOOP_ENTER, slot)
+        top = len(self.ops)
+        exit_jump = self.compile_jump_unless(cond.tree)
+        self.break_jumps.append([])
+        self.compile_block(body)
+        if step is not None:
+            self.emit(OP_EXEC, step, f"오류: for문 진행 구문 오류: {step.source}")
+        # 반복 횟수 검사는 되돌아갈 때 한다 (기존처럼 한도에 닿으면 조건을 다시 보지 않고 오류)
+        self.emit(OP_LOOP_BACK, slot, (top, message, len(body.items) + 1))
+        self.patch(exit_jump)
+        for jump in self.break_jumps.pop():
+            self.patch(jump)
+
+    def compile_for(self, node):
+        self.emit(OP_EXEC, node.init, f"오류: for문 초기화 구문 오류: {node.init.source}")
+        self.compile_loop(node.cond, node.body, node.step, "오류: for문이 너무 많이 반복되었습니다 (무한 루프?)")
+
+    def compile_while(self, node):
+        self.compile_loop(node.cond, node.body, None, "오류: while문이 너무 많이 반복되었습니다 (무한 루프?)")
+
+
+class HaklangVM(HaklangInterpreterGPT):
+    """
+    HaklangInterpreterGPT 와 같은 상태(변수, 스택, 지연 호출)를 쓰는 바이트코드 실행기입니다.
+    최상위 항목을 하나씩 블록 트리로 읽어 명령 목록으로 컴파일하고 run_code 의 dispatch 루프에서 실행합니다.
+    """
+
+    def execute_top_level(self, block):
+        # 줄 / 반복 훅은 명령 목록에서 알릴 수 없으므로 훅이 있으면 트리 실행기로 돌린다
+        if self.hooks['line'] or self.hooks['loop']:
+            return HaklangInterpreterGPT.execute_top_level(self, block)
+        # 최상위 항목(구문 하나 또는 블록 하나)을 읽는 대로 컴파일해 실행한다
+        self.run_code(BytecodeCompiler().compile_program(block))
+
+    def execute_program(self, program):
+        if self.hooks['line'] or self.hooks['loop']:
+            return HaklangInterpreterGPT.execute_program(self, program)
+        self.ensure_slots()
+        # 컴파일한 명령 목록도 프로그램에 붙여 두고 다시 쓴다 (처음 실행할 때 도달한 항목까지만 컴파일)
+        if program.code is None:
+            program.code = []
+        codes = program.code
+        for i, block in enumerate(program.blocks):
+            if i == len(codes):
+                codes.append(BytecodeCompiler().compile_program(block))
+            self.run_code(codes[i])
+        if program.error is not None:
+            raise program.error.with_traceback(None)
+
+    def execute_function_body(self, code):
+        if type(code) is Block:
+            return HaklangInterpreterGPT.execute_function_body(self, code)
+        self.run_code(code)
+
+    def run_code(self, code):
+        ops = code.ops
+        n = len(ops)
+        counters = [0] * code.loop_count
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        values = self.slot_values
+        types = self.slot_types
+        governor = self.governor
+        loop_limit = governor.loop_limit
+        pc = 0
+        try:
+            # 자주 나오는 명령부터 검사한다
+            while pc < n:
+                op, a, b = ops[pc]
+                pc += 1
+                if op == OP_INC:
+                    var_type = types[a]
+                    if var_type == 'int':
+                        values[a] = int(values[a] + b.delta)
+                    elif var_type == 'float7' or var_type == 'float15':
+                        values[a] += b.delta
                     else:
-                        output_str += 'undefined'
-        if newline:
-            print(output_str)
+                        b.execute(self)
+                elif op == OP_ADD_CONST:
+                    values[a] += b
+                elif op == OP_JUMP_UNLESS_VAR_CONST:
+                    slot, func, value = b
+                    if not func(values[slot], value):
+                        pc = a
+                elif op == OP_EXEC:
+                    if not a.execute(self):
+                        self.fail(b)
+                elif op == OP_LOOP_BACK:
+                    count = counters[a] + 1
+                    if count >= loop_limit:
+                        raise LoopLimitError(b[1])
+                    counters[a] = count
+                    governor.steps += b[2]
+                    if governor.steps >= governor.next_check:
+                        governor.check()
+                    pc = b[0]
+                elif op == OP_JUMP:
+                    pc = a
+                elif op == OP_JUMP_UNLESS_VAR_VAR:
+                    slot, func, other = b
+                    if not func(values[slot], values[other]):
+                        pc = a
+                elif op == OP_LOAD_VAR:
+                    push(values[a])
+                elif op == OP_LOAD_CONST:
+                    push(a)
+                elif op == OP_COMPARE or op == OP_BINARY:
+                    right = pop()
+                    stack[-1] = a(stack[-1], right)
+                elif op == OP_JUMP_IF_FALSE:
+                    if not pop():
+                        pc = a
+                elif op == OP_UNARY:
+                    stack[-1] = a(stack[-1])
+                elif op == OP_JUMP_IF_TRUE_OR_POP:
+                    if stack[-1]:
+                        pc = a
+                    else:
+                        pop()
+                elif op == OP_JUMP_IF_FALSE_OR_POP:
+                    if not stack[-1]:
+                        pc = a
+                    else:
+                        pop()
+                elif op == OP_LOOP_ENTER:
+                    counters[a] = 0
+                elif op == OP_CALL:
+                    if a.func_name not in self.functions:
+                        self.fail(b)
+                    argc = len(a.args)
+                    args = stack[len(stack) - argc:]
+                    del stack[len(stack) - argc:]
+                    self.call_function(a.func_name, args)
+                elif op == OP_RETURN:
+                    self.return_flag = True
+                    if a:
+                        self.return_value = pop()
+                    return
+                elif op == OP_DEFINE:
+                    self.functions[a] = b
+                elif op == OP_FAIL:
+                    self.fail(a)
+        except HaklangError:
+            raise
+        except Exception as e:
+            if not code.is_main:
+                raise
+            self.fail(f"오류 (Line {code.lines[pc - 1]}): {error_message(e)}")
+
+
+def run_source(code, stdin=None, interpreter=None):
+    """
+    학랭 소스를 실행하고 RunResult 를 돌려줍니다. 화면에 쓰거나 프로세스를 끝내지 않습니다.
+    interpreter 를 주면 그 인스턴스를 reset() 해서 다시 쓰고, 없으면 새 HaklangInterpreterGPT 를 만듭니다.
+    """
+    if interpreter is None:
+        interpreter = HaklangInterpreterGPT()
+    return interpreter.run_source(code, stdin)
+
+
+def write_profile(profile, json_path=None):
+    if json_path is None:
+        print(profile.format_report(), file=sys.stderr)
+        return
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(profile.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+# ---- 일괄 실행 ----
+# 여러 프로그램을 프로세스 풀에서 실행합니다. 프로그램마다 새 인터프리터를 만들고,
+# 출력과 종료 상태, 걸린 시간을 모아 하나의 보고서로 씁니다.
+
+BATCH_REPORT_FIELDS = ('program', 'stdin', 'status', 'exit_code', 'time', 'stdout', 'error')
+
+# 일괄 실행에서 timeout 을 주지 않았을 때 프로그램 하나의 실행 시간 한도 (초)
+BATCH_TIMEOUT = 60.0
+# 인터프리터가 한도에서 스스로 멈추지 못하면 (파이썬 연산 하나가 끝나지 않는 경우 등) 이만큼 더 기다린 뒤 작업자를 끝낸다
+BATCH_KILL_GRACE = 5.0
+# 작업자가 한도를 넘겼는지 살펴보는 간격 (초)
+BATCH_POLL_INTERVAL = 0.1
+
+
+def load_batch_jobs(path):
+    """
+    일괄 실행할 (프로그램, 입력 파일) 목록을 만듭니다.
+    path 가 디렉터리면 안의 .lhb 파일을 이름 순으로 모으고, 같은 이름의 .in 파일이 있으면 입력으로 씁니다.
+    파일이면 한 줄에 '프로그램 [입력 파일]' 을 적은 목록으로 읽습니다. 경로는 목록 파일 기준이고 # 뒤는 주석입니다.
+    """
+    jobs = []
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.endswith('.lhb'):
+                program = os.path.join(path, name)
+                stdin = os.path.splitext(program)[0] + '.in'
+                jobs.append((program, stdin if os.path.isfile(stdin) else None))
+        return jobs
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            fields = line.split('#', 1)[0].split()
+            if not fields:
+                continue
+            stdin = os.path.join(base, fields[1]) if len(fields) > 1 else None
+            jobs.append((os.path.join(base, fields[0]), stdin))
+    return jobs
+
+
+def run_batch_job(program, stdin=None, vm=False, **options):
+    """
+    프로그램 하나를 새 인터프리터로 실행하고 보고서의 한 줄(dict)을 돌려줍니다. 프로세스 풀의 작업 함수입니다.
+    options 는 인터프리터 생성자에 그대로 넘깁니다 (실행 한도, 디스크 캐시 설정).
+    """
+    engine = HaklangVM if vm else HaklangInterpreterGPT
+    interpreter = engine(**options)
+    stdout = io.StringIO()
+    interpreter.output = OutputBuffer(stream=stdout, flush_policy='size')
+    status, exit_code, error = 'ok', 0, None
+    start = time.perf_counter()
+    try:
+        with open(stdin, encoding='utf-8') if stdin is not None else io.StringIO() as source:
+            interpreter.input = InputReader(stream=source, mode='bulk')
+            interpreter.execute_file(program, raise_errors=True)
+    except HaklangError as e:
+        status = 'timeout' if isinstance(e, DeadlineExceededError) else 'error'
+        exit_code, error = 1, str(e)
+        interpreter.report_error(e)
+    except (OSError, UnicodeDecodeError) as e:
+        # 프로그램이나 입력 파일이 없거나 읽을 수 없으면 제출물의 오류로 본다
+        if isinstance(e, FileNotFoundError):
+            error = f"오류: 파일을 찾을 수 없습니다: {e.filename}"
         else:
-            print(output_str, end='')
+            error = f"오류: 파일을 읽을 수 없습니다: {e}"
+        status, exit_code = 'error', 1
+        interpreter.output.flush()
+    except Exception as e:
+        # 인터프리터 자체의 오류도 작업자를 멈추지 않고 보고서에 남긴다
+        status, exit_code, error = 'crash', 1, f"{type(e).__name__}: {e}"
+        interpreter.output.flush()
+    return {
+        'program': program,
+        'stdin': stdin,
+        'status': status,
+        'exit_code': exit_code,
+        'time': time.perf_counter() - start,
+        'stdout': stdout.getvalue(),
+        'error': error,
+    }
 
 
-if __name__ == '__main__':
-    if len(sys.argv) < 2:
-        print("사용법: python interpreter_gpt.py <파일.lhb>")
+# 작업자 프로세스가 작업을 시작할 때 (작업 번호, pid, 시작 시각) 을 알리는 큐.
+# 작업자가 GIL 을 쥔 채 오래 계산해도 알림이 늦지 않도록 put 이 바로 쓰는 SimpleQueue 를 쓴다
+_batch_started = None
+
+
+def _init_batch_worker(started):
+    global _batch_started
+    _batch_started = started
+
+
+def _run_batch_entry(index, program, stdin, vm, options):
+    _batch_started.put((index, os.getpid(), time.monotonic()))
+    return run_batch_job(program, stdin, vm, **options)
+
+
+def run_batch(jobs, workers=None, vm=False, **options):
+    """
+    jobs 를 프로세스 풀에서 실행하고 jobs 순서대로 결과 목록을 돌려줍니다.
+    프로그램마다 실행 시간 한도(timeout, 주지 않으면 BATCH_TIMEOUT)를 두고, 한도에 BATCH_KILL_GRACE 초가 지나도
+    끝나지 않는 작업자는 강제로 끝내 'timeout' 으로 기록합니다. 그때 함께 멈춘 작업은 새 풀에서 다시 실행합니다.
+    작업자가 스스로 죽어 풀이 깨지면 그때 돌던 작업을 하나씩 따로 다시 실행해, 작업자를 죽인 작업만 'crash' 로 기록합니다.
+    """
+    if options.get('timeout') is None:
+        options['timeout'] = BATCH_TIMEOUT
+    kill_after = options['timeout'] + BATCH_KILL_GRACE
+    results = [None] * len(jobs)
+    pending = list(range(len(jobs)))
+    while pending:
+        pending, suspects = _run_batch_pool(jobs, pending, results, workers, vm, kill_after, options)
+        for index in suspects:
+            # 작업 하나만 돌리는 풀이 깨지면 그 작업이 원인이므로 여기서 결과가 정해진다
+            _run_batch_pool(jobs, [index], results, 1, vm, kill_after, options)
+    return results
+
+
+def _batch_failure(job, status, time, error):
+    program, stdin = job
+    return {'program': program, 'stdin': stdin, 'status': status, 'exit_code': 1,
+            'time': time, 'stdout': '', 'error': error}
+
+
+def _run_batch_pool(jobs, indices, results, workers, vm, kill_after, options):
+    """
+    indices 의 작업을 새 프로세스 풀에서 실행해 results 에 채웁니다.
+    (다시 실행할 작업 번호, 따로 실행해 볼 작업 번호) 를 돌려줍니다. 앞쪽은 풀이 멈춰 시작하지 못했거나
+    작업자를 끝내느라 함께 멈춘 작업이고, 뒤쪽은 작업자가 죽었을 때 돌고 있어 원인일 수 있는 작업입니다.
+    """
+    started = multiprocessing.SimpleQueue()
+    running = {}
+    killed = broken = False
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker, initargs=(started,)) as pool:
+        futures = {pool.submit(_run_batch_entry, index, *jobs[index], vm, options): index for index in indices}
+        waiting = set(futures)
+        while waiting and not killed and not broken:
+            done, waiting = wait(waiting, timeout=BATCH_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except BrokenProcessPool:
+                    # 작업자 하나가 죽으면 풀의 모든 작업이 이 예외로 끝나므로 누구 탓인지는 아래에서 가린다
+                    broken = True
+                except Exception as e:
+                    # 결과를 돌려받지 못한 경우 (결과를 pickle 하지 못함 등)
+                    results[index] = _batch_failure(jobs[index], 'crash', None, f"{type(e).__name__}: {e}")
+            while not started.empty():
+                index, pid, start = started.get()
+                running[index] = (pid, start)
+            now = time.monotonic()
+            for future, index in futures.items():
+                if killed or broken or index not in running or future.done():
+                    continue
+                pid, start = running[index]
+                if now - start > kill_after:
+                    # 풀이 깨지면 남은 작업자도 멈추므로 끝나지 않은 작업은 다음 풀에서 다시 실행한다
+                    os.kill(pid, signal.SIGTERM)
+                    results[index] = _batch_failure(
+                        jobs[index], 'timeout', now - start,
+                        f"오류: 실행 시간 한도({options['timeout']}초)를 넘겨 작업자를 멈췄습니다.")
+                    killed = True
+    unfinished = [index for index in indices if results[index] is None]
+    if killed or not broken:
+        return unfinished, []
+    # 작업자가 죽을 때 돌고 있던 작업 가운데 하나가 원인이다. 하나뿐이면 그 작업이고, 여럿이면 따로 실행해 본다
+    suspects = unfinished if len(indices) == 1 else [index for index in unfinished if index in running]
+    if len(suspects) == 1:
+        index = suspects[0]
+        results[index] = _batch_failure(jobs[index], 'crash', time.monotonic() - running[index][1],
+                                        "오류: 작업자 프로세스가 비정상적으로 끝났습니다.")
+        suspects = []
+    return [index for index in unfinished if results[index] is None and index not in suspects], suspects
+
+
+def write_batch_report(results, path=None):
+    """결과를 path 에 씁니다. 확장자가 .csv 면 CSV, 아니면 JSON 이고 path 가 없으면 표준 출력에 JSON 으로 씁니다."""
+    if path is not None and path.endswith('.csv'):
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=BATCH_REPORT_FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+        return
+    text = json.dumps(results, ensure_ascii=False, indent=2)
+    if path is None:
+        print(text)
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text + '\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='interpreter.py', description='학랭(.lhb) 인터프리터')
+    parser.add_argument('file', nargs='?', help='실행할 .lhb 파일')
+    parser.add_argument('--vm', action='store_true', help='바이트코드 VM 으로 실행합니다')
+    parser.add_argument('--buffer-size', type=int, default=OUTPUT_BUFFER_SIZE,
+                        help='출력 버퍼에 모아 둘 최대 글자 수')
+    parser.add_argument('--flush', choices=FLUSH_POLICIES, default=None,
+                        help='출력 버퍼를 비우는 정책 (기본: 터미널이면 line, 아니면 size)')
+    parser.add_argument('--input', choices=INPUT_MODES, default=None, dest='input_mode',
+                        help='입력을 읽는 방식 (기본: 터미널이면 line, 아니면 bulk)')
+    parser.add_argument('--max-steps', type=int, default=None,
+                        help='프로그램 전체의 실행 단계 한도 (기본: 제한 없음)')
+    parser.add_argument('--timeout', type=float, default=None,
+                        help=f'실행 시간 한도 (초, 기본: 제한 없음, --batch 에서는 {BATCH_TIMEOUT:g})')
+    parser.add_argument('--max-loop', type=int, default=MAX_LOOP_ITERATIONS,
+                        help=f'반복문 하나의 최대 반복 횟수, 0 이면 제한 없음 (기본: {MAX_LOOP_ITERATIONS})')
+    parser.add_argument('--profile', action='store_true',
+                        help='줄/함수별 실행 횟수와 누적 시간을 재서 끝날 때 표준 오류로 보고합니다')
+    parser.add_argument('--profile-json', metavar='PATH', default=None,
+                        help='프로파일 결과를 JSON 파일로 씁니다 (--profile 포함)')
+    parser.add_argument('--cache', action='store_true',
+                        help='해석한 프로그램을 소스 옆 __lhbcache__ 에 저장해 두고 다음 실행에 다시 씁니다')
+    parser.add_argument('--cache-dir', metavar='DIR', default=None,
+                        help='해석한 프로그램을 저장할 디렉터리 (--cache 포함)')
+    parser.add_argument('--batch', metavar='PATH', default=None,
+                        help='디렉터리 또는 목록 파일의 프로그램들을 한꺼번에 실행하고 보고서를 씁니다')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='일괄 실행에 쓸 프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--report', metavar='PATH', default=None,
+                        help='일괄 실행 보고서 파일 (.csv 면 CSV, 아니면 JSON. 기본: 표준 출력에 JSON)')
+    parser.add_argument('-O', '--optimize', action='store_true',
+                        help='실행 전에 연속된 꿀꺽< 합치기, 상수 계산, 실행될 수 없는 분기 제거를 합니다')
+    parser.add_argument('--fixed-point', action='store_true',
+                        help='float7 / float15 변수를 10^7 / 10^15 배 한 정수로 담아 증감과 출력을 정확하게 계산합니다')
+    options = parser.parse_args(argv)
+    program_cache = options.cache or options.cache_dir is not None
+    if options.batch is not None:
+        jobs = load_batch_jobs(options.batch)
+        results = run_batch(jobs, options.jobs, options.vm, max_steps=options.max_steps, timeout=options.timeout,
+                            max_loop_iterations=options.max_loop or None,
+                            program_cache=program_cache, cache_dir=options.cache_dir, optimize=options.optimize,
+                            fixed_point=options.fixed_point)
+        write_batch_report(results, options.report)
+        counts = Counter(result['status'] for result in results)
+        print(f"일괄 실행: {len(results)}개 중 " + ', '.join(f"{status} {n}" for status, n in sorted(counts.items())),
+              file=sys.stderr)
+        return
+    if options.file is None:
+        print("사용법: python interpreter.py [--vm] <파일.lhb>")
+        return
+    profiling = options.profile or options.profile_json is not None
+    if profiling and options.vm:
+        parser.error('--profile 은 --vm 과 함께 쓸 수 없습니다')
+    if profiling:
+        engine = ProfilingInterpreter
     else:
-        interpreter = HaklangInterpreterGPT()
-        interpreter.execute_file(sys.argv[1])
\ No newline at end of file
+        engine = HaklangVM if options.vm else HaklangInterpreterGPT
+    interpreter = engine(buffer_size=options.buffer_size, flush_policy=options.flush,
+                         input_mode=options.input_mode, max_steps=options.max_steps, timeout=options.timeout,
+                         max_loop_iterations=options.max_loop or None,
+                         program_cache=program_cache, cache_dir=options.cache_dir, optimize=options.optimize,
+                         fixed_point=options.fixed_point)
+    try:
+        interpreter.execute_file(options.file)
+    except HaklangError as e:
+        interpreter.report_error(e)
+        sys.exit(1)
+    finally:
+        # 오류로 끝나도 그때까지의 프로파일을 남긴다
+        if profiling:
+            write_profile(interpreter.profile, options.profile_json)
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+AsyncInterpreter 가 동기 실행과 같은 결과를 내면서 이벤트 루프를 막지 않는지 확인합니다.
+
+    python -m pytest -q tests/test_async.py
+"""
+import asyncio
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from interpreter import AsyncInterpreter, DeadlineExceededError, LoopLimitError, run_source, run_source_async  # noqa: E402
+
+PROGRAM = '\n'.join([
+    '학범',
+    '{BMI30}[i]',
+    '[두배]미쉥물 연료[n]전줴',
+    '학',
+    "꺼억'n'학범비만2",
+    '학',
+    "나살뺄거야('i'비만33)",
+    '5분',
+    '("i="쿰척\'i\')쿰척<쿰척',
+    '[i]꿀꺽<밥',
+    '귤한봉지',
+    "[두배]('i')",
+    '("끝")쿰척<쿰척',
+]) + '\n'
+ECHO = '학범\n{BMI30}[x]\n{BMI}[s]\n쿰척<(x)\n쿰척<(s)\n(\'x\'쿰척\'s\')쿰척<쿰척\n'
+NAP = '학범\n시간먹기(0.3)\n("깸")쿰척<쿰척\n'
+ENDLESS = '학범\n{BMI30}[i]\n나살뺄거야(1정상1)\n5분\n[i]꿀꺽<밥\n귤한봉지\n'
+
+
+class LineReader:
+    """asyncio.StreamReader 처럼 한 줄씩 bytes 를 돌려주는 reader"""
+
+    def __init__(self, lines):
+        self.lines = list(lines)
+
+    async def readline(self):
+        await asyncio.sleep(0)
+        return self.lines.pop(0) if self.lines else b''
+
+
+def test_matches_sync_run():
+    result = asyncio.run(run_source_async(PROGRAM))
+    assert result.ok
+    assert result.stdout == run_source(PROGRAM).stdout == 'i=30\ni=31\ni=32\n끝\n'
+    assert result.variables == {'i': 33}
+
+
+def test_errors_match_sync_run():
+    result = asyncio.run(AsyncInterpreter(max_loop_iterations=10).run_source_async(ENDLESS))
+    assert isinstance(result.error, LoopLimitError)
+    assert result.stdout == run_source(ENDLESS, interpreter=AsyncInterpreter(max_loop_iterations=10)).stdout
+
+
+def test_sleeps_run_concurrently():
+    async def run_all():
+        return await asyncio.gather(*[run_source_async(NAP) for _ in range(4)])
+    started = time.monotonic()
+    results = asyncio.run(run_all())
+    assert [result.stdout for result in results] == ['깸\n'] * 4
+    assert time.monotonic() - started < 1.0
+
+
+def test_long_loop_yields_to_other_tasks():
+    ticks = []
+
+    async def ticker(done):
+        while not done.is_set():
+            ticks.append(1)
+            await asyncio.sleep(0)
+
+    async def main():
+        done = asyncio.Event()
+        task = asyncio.create_task(ticker(done))
+        interp = AsyncInterpreter(yield_interval=100, max_loop_iterations=20000)
+        result = await interp.run_source_async(ENDLESS)
+        done.set()
+        await task
+        return result
+    result = asyncio.run(main())
+    assert isinstance(result.error, LoopLimitError)
+    # 2만 바퀴 × 2 단계를 100 단계마다 넘기므로 다른 작업도 수백 번 돈다
+    assert len(ticks) > 100
+
+
+def test_deadline_interrupts_sleep():
+    started = time.monotonic()
+    result = asyncio.run(AsyncInterpreter(timeout=0.1).run_source_async('학범\n시간먹기(10)\n'))
+    assert isinstance(result.error, DeadlineExceededError)
+    assert time.monotonic() - started < 2
+
+
+def test_reader_input():
+    reader = LineReader([b'41\r\n', '떡볶이\n'.encode('utf-8')])
+    result = asyncio.run(run_source_async(ECHO, reader))
+    assert result.stdout == '41떡볶이\n'
+
+
+def test_input_without_reader_uses_executor():
+    assert asyncio.run(run_source_async(ECHO, '7\n김밥\n')).stdout == '7김밥\n'
+
+
+def test_run_async_writes_to_stdout_stream():
+    stream = io.StringIO()
+    asyncio.run(AsyncInterpreter(stdout=stream).run_async(PROGRAM))
+    assert stream.getvalue() == 'i=30\ni=31\ni=32\n끝\n'
@@ -0,0 +1,122 @@
+"""
+일괄 실행(run_batch_job / run_batch)이 프로그램마다 알맞은 상태를 기록하는지 확인합니다.
+
+    python -m pytest -q tests/test_batch.py
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import interpreter  # noqa: E402
+from interpreter import run_batch, run_batch_job  # noqa: E402
+
+HELLO = '학범\n("하나")쿰척<쿰척\n'
+UNDEFINED = '학범\n[x]꿀꺽<밥\n'
+ECHO = '학범\n{BMI30}[x]\n쿰척<(x)\n(\'x\')쿰척<쿰척\n'
+ENDLESS = '학범\n{BMI30}[i]\n나살뺄거야(1정상1)\n5분\n[i]꿀꺽<밥\n귤한봉지\n'
+# 한도 검사에 닿지 않는 파이썬 연산 하나로 오래 멈추는 프로그램
+STUCK = '학범\n데이비드(9비이만하악범999999999)\n'
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_ok(tmp_path):
+    result = run_batch_job(write(tmp_path, 'a.lhb', HELLO))
+    assert (result['status'], result['exit_code'], result['stdout'], result['error']) == ('ok', 0, '하나\n', None)
+
+
+def test_stdin_file(tmp_path):
+    result = run_batch_job(write(tmp_path, 'echo.lhb', ECHO), write(tmp_path, 'echo.in', '41\n'))
+    assert result['status'] == 'ok'
+    assert result['stdout'] == '41\n'
+
+
+def test_program_error(tmp_path):
+    result = run_batch_job(write(tmp_path, 'bad.lhb', UNDEFINED))
+    assert (result['status'], result['exit_code']) == ('error', 1)
+    assert "정의되지 않은 변수 'x'" in result['error']
+
+
+def test_missing_program_is_error(tmp_path):
+    missing = str(tmp_path / 'missing.lhb')
+    result = run_batch_job(missing)
+    assert (result['status'], result['exit_code']) == ('error', 1)
+    assert result['error'] == f"오류: 파일을 찾을 수 없습니다: {missing}"
+
+
+def test_missing_stdin_is_error(tmp_path):
+    result = run_batch_job(write(tmp_path, 'a.lhb', HELLO), str(tmp_path / 'missing.in'))
+    assert (result['status'], result['exit_code']) == ('error', 1)
+
+
+def test_unreadable_program_is_error(tmp_path):
+    path = tmp_path / 'binary.lhb'
+    path.write_bytes(b'\xff\xfe\n')
+    result = run_batch_job(str(path))
+    assert (result['status'], result['exit_code']) == ('error', 1)
+    assert result['error'].startswith('오류: 파일을 읽을 수 없습니다')
+
+
+def test_internal_error_is_crash(tmp_path, monkeypatch):
+    def broken(lines):
+        raise RuntimeError('고장')
+    monkeypatch.setattr(interpreter, 'iter_source_lines', broken)
+    result = run_batch_job(write(tmp_path, 'a.lhb', HELLO))
+    assert (result['status'], result['exit_code']) == ('crash', 1)
+    assert result['error'] == 'RuntimeError: 고장'
+
+
+def test_deadline_is_timeout(tmp_path):
+    result = run_batch_job(write(tmp_path, 'loop.lhb', ENDLESS), timeout=0.2, max_loop_iterations=None)
+    assert (result['status'], result['exit_code']) == ('timeout', 1)
+
+
+def test_run_batch_keeps_job_order(tmp_path):
+    jobs = [(write(tmp_path, f'{n}.lhb', HELLO if n % 2 else UNDEFINED), None) for n in range(6)]
+    results = run_batch(jobs, 2)
+    assert [r['program'] for r in results] == [program for program, _ in jobs]
+    assert [r['status'] for r in results] == ['error', 'ok'] * 3
+
+
+def test_run_batch_default_timeout(tmp_path, monkeypatch):
+    monkeypatch.setattr(interpreter, 'BATCH_TIMEOUT', 0.2)
+    results = run_batch([(write(tmp_path, 'loop.lhb', ENDLESS), None)], 1, max_loop_iterations=None)
+    assert results[0]['status'] == 'timeout'
+
+
+def test_run_batch_kills_stuck_worker(tmp_path, monkeypatch):
+    monkeypatch.setattr(interpreter, 'BATCH_KILL_GRACE', 0.3)
+    jobs = [(write(tmp_path, 'a.lhb', HELLO), None), (write(tmp_path, 'stuck.lhb', STUCK), None),
+            (write(tmp_path, 'b.lhb', HELLO), None), (write(tmp_path, 'c.lhb', HELLO), None)]
+    results = run_batch(jobs, 2, timeout=0.3)
+    assert [r['status'] for r in results] == ['ok', 'timeout', 'ok', 'ok']
+    assert results[1]['error'] == '오류: 실행 시간 한도(0.3초)를 넘겨 작업자를 멈췄습니다.'
+    assert all(r['stdout'] == '하나\n' for r in results if r['status'] == 'ok')
+
+
+@pytest.mark.skipif(interpreter.multiprocessing.get_start_method() != 'fork',
+                    reason='작업자가 바꿔 둔 run_batch_job 을 물려받아야 함')
+def test_run_batch_crash_only_blames_dead_worker(tmp_path, monkeypatch):
+    real = run_batch_job
+
+    def job(program, stdin=None, vm=False, **options):
+        # dies.lhb 를 맡은 작업자만 죽고, 나머지는 그동안 돌고 있도록 조금 기다렸다 실행한다
+        if program.endswith('dies.lhb'):
+            interpreter.time.sleep(0.2)
+            os._exit(1)
+        interpreter.time.sleep(0.4)
+        return real(program, stdin, vm, **options)
+    monkeypatch.setattr(interpreter, 'run_batch_job', job)
+    names = ['a', 'b', 'dies', 'c', 'd', 'e']
+    jobs = [(write(tmp_path, f'{name}.lhb', HELLO), None) for name in names]
+    results = run_batch(jobs, 3)
+    assert [r['status'] for r in results] == ['ok', 'ok', 'crash', 'ok', 'ok', 'ok']
+    assert results[2]['error'] == '오류: 작업자 프로세스가 비정상적으로 끝났습니다.'
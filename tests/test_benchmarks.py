@@ -0,0 +1,55 @@
+"""
+벤치마크 실행기(benchmarks/run.py)가 작업량을 고르고, 구문 수를 일정하게 세고, 기준 결과를 저장하고 비교하는지 확인합니다.
+
+    python -m pytest -q tests/test_benchmarks.py
+"""
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.join(ROOT, 'benchmarks')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+import run as bench  # noqa: E402
+
+
+def test_find_workloads():
+    workloads = bench.find_workloads()
+    assert list(workloads) == sorted(workloads)
+    assert 'loops' in workloads
+    assert bench.find_workloads(['loops']) == {'loops': workloads['loops']}
+    with pytest.raises(SystemExit, match='알 수 없는 작업량: 없음'):
+        bench.find_workloads(['없음'])
+
+
+def test_statement_counts_are_deterministic():
+    # 구문 수는 기준 결과와 비교할 수 있도록 엔진이나 실행 횟수와 상관없이 같아야 한다
+    for path in bench.find_workloads().values():
+        counts = {bench.run_once(path, vm, count_statements=True)[1] for vm in (False, True, False)}
+        assert len(counts) == 1 and counts.pop() > 0, path
+
+
+def test_compare():
+    assert bench.compare({'wall': 1.0}, {'wall': 2.0}) == '2.00x 빠름'
+    assert bench.compare({'wall': 2.0}, {'wall': 1.0}) == '2.00x 느림'
+    assert bench.compare({'wall': 1.0}, None) == '-'
+    assert bench.compare({'wall': 0.0}, {'wall': 1.0}) == '-'
+
+
+def test_save_keeps_other_results(tmp_path, capsys):
+    baseline = tmp_path / 'baseline.json'
+    baseline.write_text(json.dumps({'vm': {'loops': {'wall': 1.0}}, 'tree': {'stack': {'wall': 1.0}}}),
+                        encoding='utf-8')
+    out = tmp_path / 'out.json'
+    bench.main(['lists', '--repeat', '1', '--baseline', str(baseline), '--save', '--json', str(out)])
+    saved = json.loads(baseline.read_text(encoding='utf-8'))
+    assert saved['vm'] == {'loops': {'wall': 1.0}}
+    assert set(saved['tree']) == {'stack', 'lists'}
+    result = saved['tree']['lists']
+    assert set(result) == {'statements', 'wall', 'statements_per_sec', 'peak_kb'}
+    assert json.loads(out.read_text(encoding='utf-8')) == {'tree': {'lists': result}}
+    assert 'lists' in capsys.readouterr().out
@@ -0,0 +1,128 @@
+"""
+리스트 원소별 연산(골고루)과 리스트 줄이기(다먹기)의 결과를 확인하고,
+NumPy 로 계산할 때와 파이썬으로 계산할 때 결과가 같은지 비교합니다.
+
+    python -m pytest -q tests/test_elementwise.py
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import interpreter  # noqa: E402
+from interpreter import HaklangInterpreterGPT, run_source  # noqa: E402
+
+DECLARATIONS = '\n'.join([
+    '학범',
+    '{BMI[30]}[a]',
+    '{BMI[30]}[b]',
+    '{BMI[30.7]}[f]',
+    '{BMI[30]}[c]',
+    '{BMI[30.7]}[g]',
+    '{BMI[문자]}[s]',
+    '{BMI[문자]}[t]',
+    '{BMI30}[k]',
+    '[a]쿰척<"[1,2,3,4]"',
+    '[b]쿰척<"[10,20,30,40]"',
+    '[f]쿰척<"[0.5,1.5,-2.5,4]"',
+    '[s]쿰척<"[가,나,다,라]"',
+]) + '\n'
+
+# (결과 리스트, 식, 기대 결과)
+CASES = [
+    ('c', "'a'하악범'b'", [11, 22, 33, 44]),
+    ('c', "'a'학범비만'b'하악범'k'", [40, 100, 180, 280]),
+    ('g', "'a'비만학범'k'", [1 / 30, 2 / 30, 3 / 30, 4 / 30]),
+    ('g', "'f'학범비만'a'하악버엄1", [0.0, 1.5, -5.0, 12.0]),
+    ('c', "'a'비만'f'하악범2", [1, 1, 0, 1]),
+    ('c', "'a'홀쭉2 야 조깜베 'b'비만40", [0, 0, 1, 0]),
+    ('c', "'a'정상3 야 오루페 'a'정상1", [1, 0, 1, 0]),
+    ('c', "이학범'a'", [-1, -2, -3, -4]),
+    ('g', "'a'남자 중의 남자'f'", [1.0, 2.0, 3.0, 4.0]),
+    ('c', "'a'비이만하악범2", [1, 4, 9, 16]),
+    ('g', "'a'비만학범0", [0.0, 0.0, 0.0, 0.0]),
+    ('c', "'a'하악범'없는변수'", [1, 2, 3, 4]),
+    ('t', "'s'루피 함 안아보자'a'", ['가1', '나2', '다3', '라4']),
+]
+
+
+def list_value(interp, name):
+    return list(interp.variables[name])
+
+
+def run_case(target, expr):
+    interp = HaklangInterpreterGPT()
+    result = interp.run_source(DECLARATIONS + f"[{target}]골고루<{expr}\n")
+    assert result.ok, result.error
+    return list_value(interp, target)
+
+
+@pytest.mark.parametrize('target, expr, expected', CASES)
+def test_elementwise(target, expr, expected):
+    values = run_case(target, expr)
+    if target == 'g':
+        assert values == pytest.approx(expected)
+    else:
+        assert values == expected
+
+
+@pytest.mark.parametrize('target, expr, expected', CASES)
+def test_numpy_matches_python(target, expr, expected, monkeypatch):
+    pytest.importorskip('numpy')
+    with_numpy = run_case(target, expr)
+    monkeypatch.setattr(interpreter, 'numpy', None)
+    assert with_numpy == run_case(target, expr)
+
+
+def test_numpy_negates_comparisons_like_python():
+    numpy = pytest.importorskip('numpy')
+    interp = HaklangInterpreterGPT()
+    interp.run(DECLARATIONS)
+    a = interp.slot_table.slot_of('a')
+    # 참/거짓 배열에 부호를 바꾸거나 더해도 파이썬처럼 정수로 계산한다
+    trees = [
+        ('neg', ('cmp', '<', ('slot', a), ('const', 3))),
+        ('+', ('cmp', '<', ('slot', a), ('const', 3)), ('cmp', '<', ('slot', a), ('const', 3))),
+        ('neg', ('and', ('cmp', '>', ('slot', a), ('const', 1)), ('cmp', '<', ('slot', a), ('const', 4)))),
+    ]
+    for tree in trees:
+        values = interpreter._elementwise_numpy(tree, interp)[0]
+        assert isinstance(values, numpy.ndarray)
+        assert values.tolist() == [int(v) for v in interpreter._elementwise_python(tree, interp)]
+
+
+def test_elementwise_resolves_slots_when_compiled():
+    statement = interpreter.decode_line("[c]골고루<'a'하악범'b'")
+    a, b = interpreter.slot_of('a'), interpreter.slot_of('b')
+    assert statement.slot_tree == ('truth', ('+', ('slot', a), ('slot', b)))
+
+
+def test_length_mismatch():
+    result = run_source(DECLARATIONS + '{BMI[30]}[짧]\n[짧]쿰척<"[1,2]"\n[c]골고루<\'a\'하악범\'짧\'\n')
+    assert not result.ok
+    assert str(result.error) == '오류: 원소별 연산의 리스트 길이가 다릅니다 (4, 2)'
+
+
+def test_scalars_only_is_error():
+    result = run_source(DECLARATIONS + "[c]골고루<'k'하악범1\n")
+    assert not result.ok
+    assert '리스트가 하나 이상 필요합니다' in str(result.error)
+
+
+def test_reductions():
+    program = DECLARATIONS + '\n'.join([
+        '{BMI30}[합]', '{BMI30.7}[작]', '{BMI}[큰]',
+        '[합]다먹기<합계[b]', "('합')쿰척<쿰척",
+        '[작]다먹기<최소[f]', "('작')쿰척<쿰척",
+        '[큰]다먹기<최대[s]', "('큰')쿰척<쿰척",
+    ]) + '\n'
+    assert run_source(program).stdout == '100\n-2.5000000\n라\n'
+
+
+def test_reduce_empty_list():
+    result = run_source('학범\n{BMI[30]}[빈]\n{BMI30}[x]\n[x]다먹기<최소[빈]\n')
+    assert not result.ok
+    assert "빈 리스트 '빈'의 최소값" in str(result.error)
@@ -0,0 +1,89 @@
+"""
+실행 방식이 달라도 결과가 같은지 확인합니다.
+
+benchmarks/ 의 작업량을 트리 인터프리터, --vm, -O, --cache-dir, --fixed-point 로 각각 실행해 출력을 비교하고,
+서로 다른 출력 구문이 많은 프로그램을 흘려 실행해도 메모리가 프로그램 길이만큼 늘지 않는지 봅니다.
+
+    python -m pytest -q tests
+"""
+import os
+import sys
+import subprocess
+import tracemalloc
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.join(ROOT, 'benchmarks')
+sys.path.insert(0, ROOT)
+
+from interpreter import HaklangInterpreterGPT, OutputBuffer, clear_compile_caches  # noqa: E402
+
+WORKLOADS = sorted(f for f in os.listdir(BENCH_DIR) if f.endswith('.lhb'))
+MODES = {
+    'vm': ['--vm'],
+    'optimize': ['-O'],
+    'vm-optimize': ['--vm', '-O'],
+    'fixed-point': ['--fixed-point'],
+}
+
+# 흘려 실행하는 프로그램의 출력 구문 수와 허용하는 최대 메모리.
+# 출력 구문마다 템플릿을 만들어 쌓아 두면 이 길이에서 수십 MB 가 되므로 한참 넘는다
+STREAM_LINES = 50000
+STREAM_PEAK_LIMIT = 8 * 1024 * 1024
+
+
+def run_cli(*args):
+    result = subprocess.run([sys.executable, os.path.join(ROOT, 'interpreter.py'), *args],
+                            capture_output=True, text=True, encoding='utf-8', timeout=300)
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+@pytest.fixture(scope='module')
+def tree_outputs():
+    """트리 인터프리터로 실행한 작업량별 출력 (비교 기준)."""
+    return {}
+
+
+def expected(tree_outputs, workload):
+    if workload not in tree_outputs:
+        tree_outputs[workload] = run_cli(os.path.join(BENCH_DIR, workload))
+    return tree_outputs[workload]
+
+
+@pytest.mark.parametrize('workload', WORKLOADS)
+@pytest.mark.parametrize('mode', list(MODES))
+def test_modes_match_tree(tree_outputs, workload, mode):
+    output = run_cli(*MODES[mode], os.path.join(BENCH_DIR, workload))
+    assert output == expected(tree_outputs, workload)
+
+
+@pytest.mark.parametrize('workload', WORKLOADS)
+def test_cache_matches_tree(tree_outputs, workload, tmp_path):
+    path = os.path.join(BENCH_DIR, workload)
+    cache_dir = str(tmp_path / 'cache')
+    # 처음에는 해석해서 캐시에 쓰고, 두 번째는 캐시에서 읽는다
+    cold = run_cli('--cache-dir', cache_dir, path)
+    assert os.listdir(cache_dir)
+    warm = run_cli('--cache-dir', cache_dir, path)
+    assert cold == warm == expected(tree_outputs, workload)
+
+
+def test_streaming_prints_bounded_memory(tmp_path):
+    path = tmp_path / 'stream.lhb'
+    lines = ['학범', '{BMI30}[i]', '{BMI30.7}[f]']
+    lines += [f"(\"줄 {n}: \"쿰척'i'쿰척\" / \"쿰척'f')쿰척<쿰척" for n in range(STREAM_LINES)]
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+    clear_compile_caches()
+    interp = HaklangInterpreterGPT()
+    with open(os.devnull, 'w', encoding='utf-8') as sink:
+        interp.output = OutputBuffer(stream=sink, flush_policy='size')
+        tracemalloc.start()
+        try:
+            interp.execute_file(str(path))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    assert peak < STREAM_PEAK_LIMIT, f"최대 메모리 {peak // 1024}KB"
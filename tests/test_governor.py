@@ -0,0 +1,95 @@
+"""
+실행 한도(반복 횟수, 실행 단계, 실행 시간)를 넘으면 트리 인터프리터와 바이트코드 VM 이 같은 오류로 멈추는지 확인합니다.
+
+    python -m pytest -q tests/test_governor.py
+"""
+import os
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from interpreter import (  # noqa: E402
+    MAX_LOOP_ITERATIONS, DeadlineExceededError, HaklangInterpreterGPT, HaklangVM, LoopLimitError, StepLimitError,
+)
+
+ENGINES = [HaklangInterpreterGPT, HaklangVM]
+
+ENDLESS = '학범\n{BMI30}[i]\n나살뺄거야(1정상1)\n5분\n[i]꿀꺽<밥\n귤한봉지\n'
+RECURSE = '학범\n[또]미쉥물 연료[n]전줴\n학\n[또](\'n\')\n학\n[또](1)\n'
+# 40 번 도는 반복문을 두 번 실행한다
+TWICE = '\n'.join([
+    '학범',
+    '{BMI30}[i]',
+    '{BMI30}[j]',
+    "나살뺄거야('i'비만70)",
+    '5분',
+    '[i]꿀꺽<밥',
+    '귤한봉지',
+    "나살뺄거야('j'비만70)",
+    '5분',
+    '[j]꿀꺽<밥',
+    '귤한봉지',
+    "('i'쿰척'j')쿰척<쿰척",
+]) + '\n'
+
+WHILE_MESSAGE = '오류: while문이 너무 많이 반복되었습니다 (무한 루프?)'
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_default_loop_limit(engine):
+    interp = engine()
+    result = interp.run_source(ENDLESS)
+    assert isinstance(result.error, LoopLimitError)
+    assert str(result.error) == WHILE_MESSAGE
+    assert result.stdout == WHILE_MESSAGE + '\n'
+    assert interp.variables['i'] == 30 + MAX_LOOP_ITERATIONS
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_loop_limit_is_per_loop(engine):
+    assert engine(max_loop_iterations=50).run_source(TWICE).stdout == '7070\n'
+    result = engine(max_loop_iterations=30).run_source(TWICE)
+    assert isinstance(result.error, LoopLimitError)
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_step_limit(engine):
+    interp = engine(max_steps=100)
+    result = interp.run_source(ENDLESS)
+    assert isinstance(result.error, StepLimitError)
+    assert str(result.error) == '오류: 실행 단계 한도(100)를 넘었습니다.'
+    # 반복 한 바퀴는 본문 항목 1개 + 1 = 2 단계
+    assert interp.variables['i'] == 30 + 50
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_step_limit_counts_calls(engine):
+    result = engine(max_steps=100).run_source(RECURSE)
+    assert isinstance(result.error, StepLimitError)
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_deadline_without_loop_limit(engine):
+    started = time.monotonic()
+    result = engine(timeout=0.2, max_loop_iterations=None).run_source(ENDLESS)
+    assert isinstance(result.error, DeadlineExceededError)
+    assert str(result.error) == '오류: 실행 시간 한도(0.2초)를 넘었습니다.'
+    assert time.monotonic() - started < 2
+
+
+def test_sleep_wakes_at_deadline():
+    started = time.monotonic()
+    result = HaklangInterpreterGPT(timeout=0.2).run_source('학범\n시간먹기(10)\n("안 나옴")쿰척<쿰척\n')
+    assert isinstance(result.error, DeadlineExceededError)
+    assert '안 나옴' not in result.stdout
+    assert time.monotonic() - started < 2
+
+
+def test_limits_restart_each_run():
+    interp = HaklangInterpreterGPT(max_steps=200)
+    for _ in range(3):
+        assert interp.run_source(TWICE).stdout == '7070\n'
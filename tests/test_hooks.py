@@ -0,0 +1,105 @@
+"""
+실행 훅(add_hook / remove_hook)과 프로파일러가 사건을 빠짐없이 받는지, 함께 써도 서로를 가리지 않는지 확인합니다.
+
+    python -m pytest -q tests/test_hooks.py
+"""
+import io
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from interpreter import (  # noqa: E402
+    HaklangInterpreterGPT, HaklangVM, OutputBuffer, ProfilingInterpreter, run_source,
+)
+
+PROGRAM = '\n'.join([
+    '학범',
+    '{BMI30}[i]',
+    '[두배]미쉥물 연료[n]전줴',
+    '학',
+    "꺼억'n'",
+    '학',
+    "나살뺄거야('i'비만33)",
+    '5분',
+    '[i]꿀꺽<밥',
+    '귤한봉지',
+    "[두배]('i')",
+    '("끝")쿰척<쿰척',
+]) + '\n'
+
+
+def quiet(interp):
+    interp.output = OutputBuffer(stream=io.StringIO(), flush_policy='size')
+    return interp
+
+
+def record(interp, *events):
+    seen = []
+    for event in events:
+        interp.add_hook(event, lambda it, *args, event=event: seen.append((event, *args)))
+    return seen
+
+
+def test_line_hook_sees_every_item():
+    interp = quiet(HaklangInterpreterGPT())
+    seen = record(interp, 'line')
+    interp.run(PROGRAM)
+    # 반복문 본문은 세 바퀴, 함수 본문은 호출할 때 한 번
+    assert [lineno for _, lineno, _ in seen] == [2, 3, 7, 9, 9, 9, 11, 5, 12]
+
+
+def test_call_return_loop_and_write_hooks():
+    interp = quiet(HaklangInterpreterGPT())
+    seen = record(interp, 'call', 'return', 'loop', 'write')
+    interp.run(PROGRAM)
+    assert [event for event in seen if event[0] == 'loop'] == [('loop', 7, 1), ('loop', 7, 2), ('loop', 7, 3)]
+    assert ('call', '두배', [33]) in seen
+    assert ('return', '두배', 33) in seen
+    assert ('write', 'n', 33) in seen
+    assert seen.index(('call', '두배', [33])) < seen.index(('write', 'n', 33)) < seen.index(('return', '두배', 33))
+
+
+def test_remove_hook_restores_class_methods():
+    interp = HaklangInterpreterGPT()
+    callbacks = {event: interp.add_hook(event, lambda *args: None) for event in ('line', 'loop', 'call')}
+    assert {'execute_block', 'execute_loop', 'call_function'} <= set(vars(interp))
+    for event, callback in callbacks.items():
+        interp.remove_hook(event, callback)
+    assert not {'execute_block', 'execute_loop', 'call_function'} & set(vars(interp))
+
+
+def test_vm_with_line_hook_matches_tree():
+    tree = quiet(HaklangInterpreterGPT())
+    vm = quiet(HaklangVM())
+    expected, got = record(tree, 'line'), record(vm, 'line')
+    tree.run(PROGRAM)
+    vm.run(PROGRAM)
+    assert [lineno for _, lineno, _ in got] == [lineno for _, lineno, _ in expected]
+
+
+def test_hooks_do_not_change_output():
+    plain = run_source(PROGRAM)
+    interp = HaklangInterpreterGPT()
+    record(interp, 'line', 'call', 'return', 'loop', 'write')
+    assert interp.run_source(PROGRAM).stdout == plain.stdout == '끝\n'
+
+
+def test_profiler_with_line_hook():
+    interp = quiet(ProfilingInterpreter())
+    seen = record(interp, 'line', 'call')
+    interp.run(PROGRAM)
+    hits = {lineno: entry[0] for lineno, entry in interp.profile.lines.items()}
+    # 훅이 execute_block 을 덮어써도 프로파일러는 줄마다 실행 횟수를 센다
+    assert sum(hits.values()) == len([event for event in seen if event[0] == 'line'])
+    assert hits[9] == 3
+    assert interp.profile.functions['두배'][0] == 1
+    assert [event for event in seen if event[0] == 'call'] == [('call', '두배', [33])]
+
+
+def test_profiler_counts_without_hooks():
+    interp = quiet(ProfilingInterpreter())
+    interp.run(PROGRAM)
+    hits = {lineno: entry[0] for lineno, entry in interp.profile.lines.items()}
+    assert hits == {2: 1, 3: 1, 7: 1, 9: 3, 11: 1, 5: 1, 12: 1}
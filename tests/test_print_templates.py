@@ -0,0 +1,96 @@
+"""
+출력 템플릿이 해석할 때만 정해지고, 캐시된 프로그램을 여러 인터프리터가 실행해도 구문 객체가 바뀌지 않는지 확인합니다.
+
+    python -m pytest -q tests/test_print_templates.py
+"""
+import asyncio
+import os
+import pickle
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from interpreter import (  # noqa: E402
+    AsyncInterpreter, ForNode, FunctionNode, HaklangInterpreterGPT, HaklangVM, IfChainNode, PrintStatement,
+    WhileNode, load_program,
+)
+
+PROGRAM = '\n'.join([
+    '학범',
+    '{BMI30}[i]',
+    '("시작 "쿰척\'i\')쿰척<쿰척',
+    '[보여줘]미쉥물 연료[n]전줴',
+    '학',
+    '("n="쿰척\'n\')쿰척<쿰척',
+    '학',
+    "나살뺄거야('i'비만33)",
+    '5분',
+    '("i="쿰척\'i\')쿰척<쿰척',
+    '[i]꿀꺽<밥',
+    '귤한봉지',
+    "[보여줘]('i')",
+    '("끝")쿰척<쿰척',
+]) + '\n'
+
+EXPECTED = '시작 30\ni=30\ni=31\ni=32\nn=33\n끝\n'
+
+
+def print_statements(block, repeated=False):
+    """블록 트리의 (출력 구문, 반복문/함수 본문 안인지) 목록"""
+    found = []
+    for item in block.items:
+        if type(item) is PrintStatement:
+            found.append((item, repeated))
+        elif type(item) is IfChainNode:
+            for _, body in item.branches:
+                found += print_statements(body, repeated)
+            if item.else_body is not None:
+                found += print_statements(item.else_body, repeated)
+        elif type(item) in (ForNode, WhileNode, FunctionNode):
+            found += print_statements(item.body, True)
+    return found
+
+
+def program_prints(program):
+    return [entry for block in program.blocks for entry in print_statements(block)]
+
+
+def snapshot(program):
+    """출력 구문마다 모든 속성의 (이름, 값) 목록"""
+    return [[(name, getattr(stmt, name, None)) for cls in type(stmt).__mro__ for name in getattr(cls, '__slots__', ())]
+            for stmt, _ in program_prints(program)]
+
+
+def test_templates_only_where_prints_repeat():
+    prints = program_prints(load_program(PROGRAM))
+    assert len(prints) == 4
+    for stmt, repeated in prints:
+        assert (stmt.template is not None) == repeated, stmt.source
+
+
+def test_cached_program_is_not_changed_by_runs():
+    program = load_program(PROGRAM)
+    before = snapshot(program)
+    for engine in (HaklangInterpreterGPT, HaklangVM, HaklangInterpreterGPT):
+        assert engine().run_source(PROGRAM).stdout == EXPECTED
+    assert load_program(PROGRAM) is program
+    assert snapshot(program) == before
+
+
+def test_concurrent_async_runs_share_program():
+    async def run_all():
+        return await asyncio.gather(*[AsyncInterpreter().run_source_async(PROGRAM) for _ in range(4)])
+    program = load_program(PROGRAM)
+    before = snapshot(program)
+    assert [result.stdout for result in asyncio.run(run_all())] == [EXPECTED] * 4
+    assert snapshot(program) == before
+
+
+def test_pickle_keeps_template_choice():
+    program = load_program(PROGRAM)
+    with program.slots.active():
+        for stmt, repeated in program_prints(program):
+            loaded = pickle.loads(pickle.dumps(stmt))
+            assert (loaded.template is not None) == repeated
+            assert loaded.var_types == stmt.var_types
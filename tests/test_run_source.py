@@ -0,0 +1,81 @@
+"""
+run_source 가 출력을 모아 RunResult 로 돌려주고, 해석한 프로그램을 load_program 의 LRU 캐시에서 다시 쓰는지 확인합니다.
+
+    python -m pytest -q tests/test_run_source.py
+"""
+import io
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import interpreter  # noqa: E402
+from interpreter import HEADER_ERROR, HaklangError, HaklangInterpreterGPT, HaklangVM, load_program, run_source  # noqa: E402
+
+COUNT = '학범\n{BMI30}[x]\n[x]꿀꺽<밥\n("x="쿰척\'x\')쿰척<쿰척\n'
+ECHO = '학범\n{BMI30}[x]\n쿰척<(x)\n(\'x\')쿰척<쿰척\n'
+UNDEFINED = '학범\n("앞")쿰척<쿰척\n[y]꿀꺽<밥\n("뒤")쿰척<쿰척\n'
+
+
+def test_collects_output_and_variables(capsys):
+    result = run_source(COUNT)
+    assert result.ok
+    assert (result.stdout, result.variables, result.error) == ('x=31\n', {'x': 31}, None)
+    assert capsys.readouterr().out == ''
+
+
+def test_error_is_returned_not_raised():
+    result = run_source(UNDEFINED)
+    assert not result.ok
+    assert isinstance(result.error, HaklangError)
+    assert result.stdout == "앞\n오류: 정의되지 않은 변수 'y'\n"
+
+
+def test_missing_header():
+    result = run_source('("x")쿰척<쿰척\n')
+    assert result.stdout == HEADER_ERROR + '\n'
+
+
+def test_stdin_string_and_file():
+    assert run_source(ECHO, '41\n').stdout == '41\n'
+    assert run_source(ECHO, io.StringIO('42\n')).stdout == '42\n'
+
+
+def test_reused_interpreter_starts_fresh():
+    for engine in (HaklangInterpreterGPT, HaklangVM):
+        interp = engine()
+        assert interp.run_source(COUNT).variables == {'x': 31}
+        assert run_source(COUNT, interpreter=interp).variables == {'x': 31}
+        assert interp.run_source('학범\n{BMI30}[y]\n').variables == {'y': 30}
+
+
+def test_restores_interpreter_streams():
+    interp = HaklangInterpreterGPT()
+    saved = (interp.output, interp.input)
+    interp.run_source(UNDEFINED)
+    assert (interp.output, interp.input) == saved
+
+
+def test_load_program_reuses_same_source():
+    program = load_program(COUNT)
+    assert load_program(COUNT) is program
+    assert load_program(COUNT.replace('x=', 'x =')) is not program
+
+
+def test_program_cache_is_lru(monkeypatch):
+    monkeypatch.setattr(interpreter, 'PROGRAM_CACHE_SIZE', 2)
+    monkeypatch.setattr(interpreter, '_PROGRAM_CACHE', interpreter.OrderedDict())
+    sources = [f'학범\n("{n}")쿰척<쿰척\n' for n in range(3)]
+    first, second = load_program(sources[0]), load_program(sources[1])
+    # 최근에 쓴 프로그램은 남고, 가장 오래 안 쓴 프로그램이 빠진다
+    assert load_program(sources[0]) is first
+    load_program(sources[2])
+    assert len(interpreter._PROGRAM_CACHE) == 2
+    assert load_program(sources[0]) is first
+    assert load_program(sources[1]) is not second
+
+
+def test_cached_program_gives_same_result():
+    results = [run_source(UNDEFINED) for _ in range(3)]
+    assert len({(result.stdout, str(result.error)) for result in results}) == 1